@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+/api/alerts benchmark - response size and latency with a large alert history
+
+Loads N alerts (100k by default) into a published snapshot and compares a
+full dump against cursor pages, field projection, gzip and conditional
+(If-None-Match) polling.
+"""
+
+import sys
+from pathlib import Path
+import argparse
+import http.client
+import json
+import logging
+import statistics
+import threading
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from realtime_siem.alerts.alert_manager import AlertManager
+from realtime_siem.dashboard import DashboardServer, DashboardHandler, SnapshotPublisher
+from realtime_siem.utils.helpers import StubConfig
+
+
+def request(port, path, headers=None):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    start = time.perf_counter()
+    connection.request('GET', path, headers=headers or {})
+    response = connection.getresponse()
+    body = response.read()
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return response, body, elapsed
+
+
+def run_case(port, path, headers, repeat):
+    response, body, first = request(port, path, headers)
+    timings = [request(port, path, headers)[2] for _ in range(repeat)]
+    return {
+        'status': response.status,
+        'bytes': len(body),
+        'first_ms': round(first * 1000, 2),
+        'median_ms': round(statistics.median(timings) * 1000, 2),
+        'etag': response.getheader('ETag'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the paginated /api/alerts endpoint')
+    parser.add_argument('--alerts', type=int, default=100000, help='Alerts in the snapshot')
+    parser.add_argument('--repeat', type=int, default=20, help='Requests per case after the first')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    alert_manager = AlertManager()
+    for n in range(args.alerts):
+        alert_manager.create_alert(
+            {'type': 'brute_force', 'severity': 'high', 'description': f'Failed logins from 203.0.113.{n % 256}'},
+            {'source_ip': f'203.0.113.{n % 256}', 'user': f'user{n % 50}', 'hostname': 'web-01',
+             'message': f'Failed password for user{n % 50} from 203.0.113.{n % 256} port 22 ssh2'})
+    publisher = SnapshotPublisher(alert_manager, lambda: {'is_running': True})
+    started = time.perf_counter()
+    publisher.publish()
+    publish_ms = (time.perf_counter() - started) * 1000
+
+    # A server that allows a single page of everything stands in for the old full dump
+    config = StubConfig({'dashboard.api.max_limit': args.alerts})
+    server = DashboardServer(('127.0.0.1', 0), DashboardHandler, publisher, config)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    tail = max(args.alerts - 10, 0)
+    gzip_header = {'Accept-Encoding': 'gzip'}
+
+    cases = [
+        ('full dump', f'/api/alerts?limit={args.alerts}', {}),
+        ('full dump, gzip', f'/api/alerts?limit={args.alerts}', gzip_header),
+        ('page of 100', '/api/alerts?limit=100', {}),
+        ('page of 100, gzip', '/api/alerts?limit=100', gzip_header),
+        ('page of 100, 3 fields, gzip', '/api/alerts?limit=100&fields=seq,severity,threat', gzip_header),
+        ('poll: 10 new since cursor', f'/api/alerts?since={tail}', gzip_header),
+    ]
+    results = []
+    for name, path, headers in cases:
+        row = run_case(port, path, headers, args.repeat)
+        row['case'] = name
+        results.append(row)
+
+    unchanged = dict(gzip_header, **{'If-None-Match': results[-1]['etag']})
+    row = run_case(port, f'/api/alerts?since={tail}', unchanged, args.repeat)
+    row['case'] = 'poll: unchanged (304)'
+    results.append(row)
+
+    server.close()
+
+    if args.json:
+        print(json.dumps({'alerts': args.alerts, 'publish_ms': round(publish_ms, 1), 'cases': results}, indent=2))
+        return
+
+    print(f"{args.alerts} alerts, first snapshot published in {publish_ms:.0f} ms\n")
+    print(f"{'case':<30} {'status':>6} {'bytes':>12} {'first ms':>9} {'median ms':>10}")
+    for row in results:
+        print(f"{row['case']:<30} {row['status']:>6} {row['bytes']:>12} {row['first_ms']:>9} {row['median_ms']:>10}")
+
+
+if __name__ == '__main__':
+    main()
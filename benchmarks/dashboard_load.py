@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Dashboard load test - throughput and latency with many concurrent clients
+
+Serves the dashboard API from a published snapshot and drives it with N
+concurrent clients from a separate process. A few "slow" clients open a
+connection and stall mid-request, which blocks a single-threaded server
+entirely; run with --server single to compare against plain HTTPServer.
+"""
+
+import sys
+from pathlib import Path
+import argparse
+import http.client
+import json
+import logging
+import multiprocessing
+import socket
+import socketserver
+import threading
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from realtime_siem.alerts.alert_manager import AlertManager
+from realtime_siem.dashboard import DashboardServer, DashboardHandler, SnapshotPublisher
+
+PATHS = ['/api/stats', '/api/alerts', '/api/stats', '/api/stats']
+
+
+class SingleThreadedServer(DashboardServer):
+    """Handles one request at a time like the previous HTTPServer, for comparison"""
+
+    def process_request(self, request, client_address):
+        socketserver.BaseServer.process_request(self, request, client_address)
+
+
+def client(port, deadline, results, lock, index):
+    latencies = []
+    errors = 0
+    n = index
+    while time.time() < deadline:
+        path = PATHS[n % len(PATHS)]
+        n += 1
+        start = time.perf_counter()
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+            connection.close()
+            if response.status != 200:
+                errors += 1
+                continue
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+    with lock:
+        results['latencies'].extend(latencies)
+        results['errors'] += errors
+
+
+def stalled_client(port, deadline):
+    """Send half a request line and then wait"""
+    try:
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(b'GET /api/alerts HTT')
+        time.sleep(max(0.0, deadline - time.time()))
+        sock.close()
+    except OSError:
+        pass
+
+
+def run_clients(port, clients, slow_clients, duration, queue):
+    deadline = time.time() + duration
+    results = {'latencies': [], 'errors': 0}
+    lock = threading.Lock()
+    threads = [threading.Thread(target=stalled_client, args=(port, deadline)) for _ in range(slow_clients)]
+    threads += [threading.Thread(target=client, args=(port, deadline, results, lock, i)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    queue.put(results)
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def measure(server_kind, clients, slow_clients, alerts, duration):
+    alert_manager = AlertManager()
+    for n in range(alerts):
+        alert_manager.create_alert({'type': 'benchmark', 'severity': 'high', 'description': f'alert {n}'},
+                                   {'source_ip': f'203.0.113.{n % 256}', 'user': f'user{n % 50}'})
+    publisher = SnapshotPublisher(alert_manager, lambda: {'is_running': True})
+    publisher.start()
+
+    server_class = DashboardServer if server_kind == 'threaded' else SingleThreadedServer
+    server = server_class(('127.0.0.1', 0), DashboardHandler, publisher)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=run_clients,
+                                      args=(server.server_address[1], clients, slow_clients, duration, queue))
+    process.start()
+    results = queue.get()
+    process.join()
+
+    server.shutdown()
+    server.server_close()
+    publisher.stop()
+
+    latencies = results['latencies']
+    return {
+        'server': server_kind,
+        'clients': clients,
+        'slow_clients': slow_clients,
+        'requests_per_second': round(len(latencies) / duration, 1),
+        'latency_p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'latency_p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'errors': results['errors'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the dashboard server')
+    parser.add_argument('--server', choices=['threaded', 'single', 'both'], default='both')
+    parser.add_argument('--clients', default='1,10,50', help='Comma separated concurrent client counts')
+    parser.add_argument('--slow-clients', type=int, default=2, help='Clients that stall mid-request')
+    parser.add_argument('--alerts', type=int, default=1000, help='Alerts in the snapshot')
+    parser.add_argument('--duration', type=float, default=5, help='Seconds per measurement')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    kinds = ['threaded', 'single'] if args.server == 'both' else [args.server]
+    rows = [measure(kind, int(count), args.slow_clients, args.alerts, args.duration)
+            for kind in kinds for count in args.clients.split(',')]
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{args.alerts} alerts in snapshot, {args.slow_clients} stalled client(s), {args.duration:g}s per run\n")
+    print(f"{'server':>9} {'clients':>8} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>9} {'errors':>7}")
+    for row in rows:
+        print(f"{row['server']:>9} {row['clients']:>8} {row['requests_per_second']:>9} "
+              f"{row['latency_p50_ms']:>8} {row['latency_p99_ms']:>9} {row['errors']:>7}")
+
+
+if __name__ == '__main__':
+    main()
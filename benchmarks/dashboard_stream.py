@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Dashboard stream benchmark - server CPU per connected viewer and push latency
+
+Runs the dashboard server with a snapshot publisher, creates alerts at a
+fixed rate and connects N Server-Sent Events viewers from a separate
+process, so the server's CPU time can be measured on its own.
+"""
+
+import sys
+from pathlib import Path
+import argparse
+import json
+import logging
+import multiprocessing
+import socket
+import threading
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from realtime_siem.alerts.alert_manager import AlertManager
+from realtime_siem.dashboard import DashboardServer, DashboardHandler, SnapshotPublisher
+
+
+def viewer(port, duration, latencies, lock):
+    """Read the stream and record how long each alert took to arrive"""
+    sock = socket.create_connection(('127.0.0.1', port))
+    sock.sendall(b'GET /api/stream HTTP/1.1\r\nHost: localhost\r\n\r\n')
+    sock.settimeout(0.5)
+    buffer = b''
+    deadline = time.time() + duration
+    local = []
+    while time.time() < deadline:
+        try:
+            data = sock.recv(65536)
+        except socket.timeout:
+            continue
+        if not data:
+            break
+        received = time.time()
+        buffer += data
+        while b'\n\n' in buffer:
+            message, buffer = buffer.split(b'\n\n', 1)
+            if b'event: alerts' not in message:
+                continue
+            payload = message.split(b'data: ', 1)[1]
+            for alert in json.loads(payload):
+                local.append(received - float(alert['description']))
+    sock.close()
+    with lock:
+        latencies.extend(local)
+
+
+def run_viewers(port, count, duration, results):
+    latencies = []
+    lock = threading.Lock()
+    threads = [threading.Thread(target=viewer, args=(port, duration, latencies, lock)) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put(latencies)
+
+
+def produce(alert_manager, rate, duration):
+    interval = 1.0 / rate
+    next_at = time.time()
+    end = next_at + duration
+    while next_at < end:
+        alert_manager.create_alert({'type': 'benchmark', 'severity': 'high', 'description': repr(time.time())},
+                                   {'source_ip': '203.0.113.7', 'user': 'bench'})
+        next_at += interval
+        time.sleep(max(0.0, next_at - time.time()))
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def measure(viewers, rate, duration):
+    alert_manager = AlertManager()
+    publisher = SnapshotPublisher(alert_manager, lambda: {'is_running': True})
+    publisher.start()
+    server = DashboardServer(('127.0.0.1', 0), DashboardHandler, publisher)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    results = multiprocessing.Queue()
+    process = None
+    if viewers:
+        process = multiprocessing.Process(target=run_viewers, args=(port, viewers, duration + 1.5, results))
+        process.start()
+        deadline = time.time() + 10
+        while server.stream.viewers < viewers and time.time() < deadline:
+            time.sleep(0.05)
+
+    cpu_start = time.process_time()
+    wall_start = time.time()
+    produce(alert_manager, rate, duration)
+    cpu = time.process_time() - cpu_start
+    wall = time.time() - wall_start
+
+    latencies = []
+    if process:
+        latencies = results.get()
+        process.join()
+    server.close()
+    publisher.stop()
+
+    return {
+        'viewers': viewers,
+        'alerts': alert_manager.alert_counter,
+        'server_cpu_percent': round(cpu / wall * 100, 2),
+        'latency_p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'latency_p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'deliveries': len(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dashboard Server-Sent Events streaming')
+    parser.add_argument('--viewers', default='1,10,50', help='Comma separated viewer counts')
+    parser.add_argument('--rate', type=float, default=20, help='Alerts created per second')
+    parser.add_argument('--duration', type=float, default=5, help='Seconds per measurement')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+    # Every alert is logged at WARNING; keep the report readable
+    logging.disable(logging.WARNING)
+
+    baseline = measure(0, args.rate, args.duration)
+    rows = [baseline]
+    for count in [int(v) for v in args.viewers.split(',')]:
+        row = measure(count, args.rate, args.duration)
+        row['cpu_percent_per_viewer'] = round((row['server_cpu_percent'] - baseline['server_cpu_percent']) / count, 3)
+        rows.append(row)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+
+    print(f"{args.rate:g} alerts/s for {args.duration:g}s per run (0 viewers = alert creation only)\n")
+    print(f"{'viewers':>8} {'server CPU %':>13} {'CPU % / viewer':>15} {'p50 ms':>8} {'p99 ms':>8} {'delivered':>10}")
+    for row in rows:
+        print(f"{row['viewers']:>8} {row['server_cpu_percent']:>13} {row.get('cpu_percent_per_viewer', '-'):>15} "
+              f"{row['latency_p50_ms']:>8} {row['latency_p99_ms']:>8} {row['deliveries']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+HTTP ingest benchmark - MB/s and events/s into POST /ingest
+
+Starts an HTTPIngestServer on loopback and posts pre-built NDJSON bodies
+(plain and gzip) from one or more client threads, resending from
+resume_from_line after a 429. By default the pipeline only counts lines,
+which measures decoding and batching; --engine feeds a real SIEMCore.
+
+    python benchmarks/http_ingest.py --events 200000
+    python benchmarks/http_ingest.py --engine --events 20000 --queue 4
+"""
+
+import sys
+from pathlib import Path
+import argparse
+import gzip
+import http.client
+import json
+import logging
+import threading
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from realtime_siem.ingest import IngestPipeline, HTTPIngestServer
+from realtime_siem.utils.corpus import CorpusGenerator
+from realtime_siem.utils.helpers import StubConfig
+
+
+def encode(lines, compress):
+    body = ('\n'.join(lines) + '\n').encode()
+    return gzip.compress(body, compresslevel=1) if compress else body
+
+
+def build_requests(args, compress):
+    """(lines, body) per request; bodies are built before the clock starts"""
+    generator = CorpusGenerator(seed=args.seed, formats=['json'])
+    lines = [line for line, _ in generator.lines(args.events)]
+    chunks = [lines[i:i + args.per_request] for i in range(0, len(lines), args.per_request)]
+    return [(chunk, encode(chunk, compress)) for chunk in chunks]
+
+
+def post(address, lines, body, compress, stats):
+    """Send one request, resending the remainder after a 429"""
+    connection = http.client.HTTPConnection(*address, timeout=60)
+    headers = {'Content-Type': 'application/x-ndjson'}
+    if compress:
+        headers['Content-Encoding'] = 'gzip'
+    while lines:
+        body = body or encode(lines, compress)
+        connection.request('POST', '/ingest', body=body, headers=headers)
+        response = connection.getresponse()
+        result = json.loads(response.read())
+        stats['wire_bytes'] += len(body)
+        stats['requests'] += 1
+        if response.status == 429:
+            stats['throttled'] += 1
+            lines, body = lines[result['resume_from_line']:], None
+            connection.close()
+            time.sleep(0.01)
+            connection = http.client.HTTPConnection(*address, timeout=60)
+            continue
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}: {result}")
+        lines = []
+    connection.close()
+
+
+def run(compress, args):
+    config = StubConfig({'ingest.batch_size': args.batch, 'ingest.queue_batches': args.queue,
+                         'ingest.http.put_timeout_seconds': 0.2})
+    if args.engine:
+        from realtime_siem.core.siem_engine import SIEMCore
+        pipeline = SIEMCore(config).ingest
+    else:
+        pipeline = IngestPipeline(lambda line, log_type: None, config)
+    server = HTTPIngestServer(pipeline, config, host='127.0.0.1', port=0)
+    pipeline.start()
+    server.start()
+
+    stats = {'wire_bytes': 0, 'requests': 0, 'throttled': 0}
+    lock = threading.Lock()
+    pending = build_requests(args, compress)
+
+    def client():
+        local = {'wire_bytes': 0, 'requests': 0, 'throttled': 0}
+        while True:
+            with lock:
+                if not pending:
+                    break
+                lines, body = pending.pop()
+            post(server.address, lines, body, compress, local)
+        with lock:
+            for key, value in local.items():
+                stats[key] += value
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    while pipeline.processed < args.events:
+        time.sleep(0.002)
+    elapsed = time.perf_counter() - started
+    server_stats = server.get_stats()
+    server.stop()
+    pipeline.stop()
+
+    return {
+        'events': pipeline.processed,
+        'seconds': round(elapsed, 3),
+        'events_per_second': round(pipeline.processed / elapsed, 1),
+        'wire_mb_per_second': round(stats['wire_bytes'] / elapsed / 1e6, 2),
+        'decoded_mb_per_second': round(server_stats['bytes_decoded'] / elapsed / 1e6, 2),
+        'requests': stats['requests'],
+        'throttled': stats['throttled'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the HTTP NDJSON ingest endpoint')
+    parser.add_argument('--events', type=int, default=100000, help='Events per run')
+    parser.add_argument('--per-request', type=int, default=5000, help='Events per POST body')
+    parser.add_argument('--clients', type=int, default=2, help='Concurrent client threads')
+    parser.add_argument('--batch', type=int, default=500, help='ingest.batch_size')
+    parser.add_argument('--queue', type=int, default=200, help='ingest.queue_batches')
+    parser.add_argument('--engine', action='store_true', help='Process events with SIEMCore instead of counting them')
+    parser.add_argument('--seed', type=int, default=42, help='Corpus seed')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = {'plain': run(False, args), 'gzip': run(True, args)}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'body':<7} {'events/s':>10} {'wire MB/s':>10} {'NDJSON MB/s':>12} {'requests':>9} {'429s':>6}")
+    for name, row in results.items():
+        print(f"{name:<7} {row['events_per_second']:>10} {row['wire_mb_per_second']:>10} "
+              f"{row['decoded_mb_per_second']:>12} {row['requests']:>9} {row['throttled']:>6}")
+
+
+if __name__ == '__main__':
+    main()
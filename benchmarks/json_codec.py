@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+JSON codec benchmark - decode and encode throughput, memory per stored event
+
+Decodes JSON log lines through JSONParser, encodes processed events the
+way the bulk indexer does (serialize_event), and measures the memory
+held by a list of decoded events with tracemalloc. Each installed
+backend is measured, plus the previous behaviour (stdlib json.loads with
+no key sharing) as the baseline.
+
+    python benchmarks/json_codec.py
+    python benchmarks/json_codec.py --events 200000 --json
+"""
+
+import sys
+from pathlib import Path
+import argparse
+import json
+import logging
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from realtime_siem.core.bulk_indexer import serialize_event
+from realtime_siem.core.event_processor import EventProcessor
+from realtime_siem.parsers.log_parser import JSONParser
+from realtime_siem.utils import json_codec
+from realtime_siem.utils.corpus import CorpusGenerator
+
+
+def unshared_loads(data):
+    return json.loads(data)
+
+
+def unshared_dumps(obj):
+    return json.dumps(obj, default=str)
+
+
+def select(case):
+    """Point json_codec at a backend, or at the baseline functions"""
+    if case == 'baseline':
+        json_codec.use_backend('json')
+        json_codec.loads, json_codec.dumps = unshared_loads, unshared_dumps
+    else:
+        json_codec.use_backend(case)
+
+
+def measure(lines, events, repeat):
+    parser = JSONParser()
+    decode = min(_timed(lambda: [parser.parse(line) for line in lines]) for _ in range(repeat))
+    encode = min(_timed(lambda: [serialize_event(event) for event in events]) for _ in range(repeat))
+
+    json_codec._shared_keys.clear()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    stored = [parser.parse(line) for line in lines]
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del stored
+
+    return {
+        'decode_per_second': round(len(lines) / decode, 1),
+        'encode_per_second': round(len(events) / encode, 1),
+        'bytes_per_event': round(held / len(lines), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON decode/encode backends')
+    parser.add_argument('--events', type=int, default=100000, help='JSON lines to decode and events to encode')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case; the best is reported')
+    parser.add_argument('--seed', type=int, default=42, help='Corpus seed')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    generator = CorpusGenerator(seed=args.seed, formats=['json']).lines()
+    lines = [next(generator)[0] for _ in range(args.events)]
+    processor = EventProcessor()
+    events = [processor.process(json.loads(line)) for line in lines]
+
+    results = {}
+    for case in ['baseline'] + list(json_codec.BACKENDS):
+        select(case)
+        results[case] = measure(lines, events, args.repeat)
+    json_codec.use_backend('auto')
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.events} events, backends: {', '.join(json_codec.BACKENDS)}\n")
+    print(f"{'case':<10} {'decode/s':>12} {'encode/s':>12} {'bytes/event':>12}")
+    for case, row in results.items():
+        print(f"{case:<10} {row['decode_per_second']:>12} {row['encode_per_second']:>12} {row['bytes_per_event']:>12}")
+
+
+def _timed(work):
+    started = time.perf_counter()
+    work()
+    return time.perf_counter() - started
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Parser dispatch benchmark - format detection and parsing of mixed streams
+
+Compares the previous caller-side approach (guess json/syslog/default with
+startswith, then let SyslogParser try the RFC 5424 pattern before the
+RFC 3164 one, and JSONParser import json per call) with ParserRouter, with and without a per-source format
+cache. Each source in the stream sends one format, as real senders do.
+
+    python benchmarks/parser_dispatch.py
+    python benchmarks/parser_dispatch.py --formats rfc3164 --events 200000
+"""
+
+import sys
+from pathlib import Path
+import argparse
+import json
+import logging
+import random
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from realtime_siem.parsers import ParserRouter
+from realtime_siem.parsers.log_parser import LogParser, SyslogParser, JSONParser
+from realtime_siem.utils.corpus import CorpusGenerator, FORMATS
+
+
+class DoubleRegexSyslogParser(SyslogParser):
+    """SyslogParser.parse as it was: RFC 5424 first, then RFC 3164"""
+
+    def parse(self, log_line):
+        log_line = log_line.strip()
+        match = self.rfc5424_pattern.match(log_line)
+        if match:
+            return self._parse_rfc5424(match, log_line)
+        match = self.rfc3164_pattern.match(log_line)
+        if match:
+            return self._parse_rfc3164(match, log_line)
+        return self._unknown_format(log_line)
+
+
+class ImportingJSONParser(JSONParser):
+    """JSONParser.parse as it was: json imported on every call"""
+
+    def parse(self, log_line):
+        import json
+        return super().parse(log_line)
+
+
+def build_stream(args):
+    """(line, source) pairs from args.sources senders, each with a fixed format"""
+    generators = {fmt: CorpusGenerator(seed=args.seed, formats=[fmt]).lines() for fmt in args.formats}
+    rng = random.Random(args.seed)
+    sources = [(f'source-{n}', args.formats[n % len(args.formats)]) for n in range(args.sources)]
+    stream = []
+    for _ in range(args.events):
+        source, fmt = rng.choice(sources)
+        stream.append((next(generators[fmt])[0], source))
+    return stream
+
+
+def run_startswith(stream):
+    parsers = {'syslog': DoubleRegexSyslogParser(), 'json': ImportingJSONParser(), 'default': LogParser()}
+    for line, source in stream:
+        log_type = 'json' if line.startswith('{') else 'syslog' if line.startswith('<') else 'default'
+        parsers[log_type].parse(line)
+
+
+def run_router(stream):
+    router = ParserRouter()
+    for line, source in stream:
+        router.parse(line)
+
+
+def run_router_cached(stream):
+    router = ParserRouter()
+    for line, source in stream:
+        router.parse(line, source)
+
+
+CASES = {
+    'startswith_double_regex': run_startswith,
+    'router': run_router,
+    'router_source_cache': run_router_cached,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark parser format detection and dispatch')
+    parser.add_argument('--events', type=int, default=100000, help='Lines in the stream')
+    parser.add_argument('--formats', default=','.join(FORMATS), help='Comma separated formats in the stream')
+    parser.add_argument('--sources', type=int, default=200, help='Distinct senders')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per case; the best is reported')
+    parser.add_argument('--seed', type=int, default=42, help='Corpus seed')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+    args.formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    logging.disable(logging.WARNING)
+
+    stream = build_stream(args)
+    results = {}
+    for name, case in CASES.items():
+        best = min(_timed(case, stream) for _ in range(args.repeat))
+        results[name] = {'seconds': round(best, 3), 'lines_per_second': round(len(stream) / best, 1)}
+    baseline = results['startswith_double_regex']['lines_per_second']
+    for row in results.values():
+        row['speedup'] = round(row['lines_per_second'] / baseline, 2)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{len(stream)} lines, formats {','.join(args.formats)}, {args.sources} sources\n")
+    print(f"{'case':<26} {'lines/s':>12} {'speedup':>8}")
+    for name, row in results.items():
+        print(f"{name:<26} {row['lines_per_second']:>12} {row['speedup']:>7}x")
+
+
+def _timed(case, stream):
+    started = time.perf_counter()
+    case(stream)
+    return time.perf_counter() - started
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Ingest pipeline benchmark - throughput, latency and memory per component
+
+Generates a deterministic corpus (RFC3164/RFC5424 syslog, JSON and generic
+lines with a tunable attack mix) and runs it through SIEMCore end to end and
+through RulesEngine, AnomalyDetector, CorrelationEngine and the ML detector
+on their own. Every case runs in a fresh process so peak RSS is per case.
+Results can be saved as JSON and compared against an earlier run:
+
+    python benchmarks/pipeline.py --output before.json
+    python benchmarks/pipeline.py --compare before.json
+"""
+
+import sys
+from pathlib import Path
+import argparse
+import json
+import logging
+import multiprocessing
+import platform
+import subprocess
+import time
+from datetime import datetime
+from queue import Empty
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from realtime_siem.utils.corpus import CorpusGenerator, DEFAULT_MIX, FORMATS, parse_mix
+from realtime_siem.utils.helpers import StubConfig
+
+CASES = ['siem_core', 'rules_engine', 'anomaly_detector', 'correlation_engine', 'ml_detector']
+# SIEMCore stages timed into the siem_stage_seconds histograms
+STAGES = ['parse', 'enrich', 'rules', 'anomaly', 'alert', 'index']
+# Metric -> True when larger is better
+COMPARED = {'events_per_second': True, 'latency_p99_ms': False, 'peak_rss_mb': False}
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def summarize(latencies, elapsed, events):
+    return {
+        'events': events,
+        'seconds': round(elapsed, 3),
+        'events_per_second': round(events / elapsed, 1) if elapsed else 0.0,
+        'latency_p50_ms': round(percentile(latencies, 0.50) * 1000, 4),
+        'latency_p90_ms': round(percentile(latencies, 0.90) * 1000, 4),
+        'latency_p99_ms': round(percentile(latencies, 0.99) * 1000, 4),
+        'latency_max_ms': round(max(latencies) * 1000, 4) if latencies else 0.0,
+    }
+
+
+def timed(function, items):
+    latencies = []
+    clock = time.perf_counter
+    started = clock()
+    for item in items:
+        start = clock()
+        function(item)
+        latencies.append(clock() - start)
+    return latencies, clock() - started
+
+
+def parsed_events(siem, corpus):
+    """Parse and enrich the corpus once, for the detector-only cases"""
+    return [siem.event_processor.process(siem.parsers[log_type].parse(line)) for line, log_type in corpus]
+
+
+def run_siem_core(siem, corpus, args):
+    latencies, elapsed = timed(lambda item: siem.process_log(*item), corpus)
+    result = summarize(latencies, elapsed, len(corpus))
+    result['alerts'] = len(siem.alert_manager.alerts)
+    result['stages'] = {}
+    for stage in STAGES:
+        cumulative, total = siem.metrics.histogram('siem_stage_seconds', stage=stage).snapshot()
+        count = cumulative[-1]
+        result['stages'][stage] = {
+            'events_per_second': round(count / total, 1) if total else 0.0,
+            'mean_us': round(total / count * 1e6, 2) if count else 0.0,
+        }
+    return result
+
+
+def run_rules_engine(siem, corpus, args):
+    events = parsed_events(siem, corpus)
+    rules = siem.threat_detector.rules_engine
+    latencies, elapsed = timed(rules.check_rules, events)
+    return summarize(latencies, elapsed, len(events))
+
+
+def run_anomaly_detector(siem, corpus, args):
+    events = parsed_events(siem, corpus)
+    latencies, elapsed = timed(siem.threat_detector.anomaly_detector.detect_anomalies, events)
+    return summarize(latencies, elapsed, len(events))
+
+
+def run_correlation_engine(siem, corpus, args):
+    events = parsed_events(siem, corpus)
+    batches = [events[i:i + args.batch] for i in range(0, len(events), args.batch)]
+    latencies, elapsed = timed(siem.correlation_engine.correlate, batches)
+    result = summarize(latencies, elapsed, len(events))
+    result['batch_size'] = args.batch
+    return result
+
+
+def run_ml_detector(siem, corpus, args):
+    sys.path.insert(0, str(Path(__file__).parent.parent / 'scripts'))
+    try:
+        from ml_anomaly_detector import MLAnomalyDetector
+    except ImportError as e:
+        return {'skipped': f'ML detector unavailable: {e}'}
+    events = parsed_events(siem, corpus)
+    detector = MLAnomalyDetector()
+    train, score = events[:args.ml_train], events[args.ml_train:]
+    started = time.perf_counter()
+    detector.train(train)
+    training_seconds = time.perf_counter() - started
+    latencies, elapsed = timed(detector.detect_anomaly, score)
+    result = summarize(latencies, elapsed, len(score))
+    result['training_events'] = len(train)
+    result['training_seconds'] = round(training_seconds, 3)
+    return result
+
+
+def run_case(case, args, queue):
+    logging.disable(logging.WARNING)
+    from realtime_siem.core.siem_engine import SIEMCore
+
+    generator = CorpusGenerator(seed=args.seed, formats=args.formats, mix=args.mix,
+                                users=args.users, hosts=args.hosts, sources=args.sources)
+    corpus = generator.corpus(args.events)
+    siem = SIEMCore(StubConfig({}))
+    baseline_rss = peak_rss_mb()
+    result = globals()[f'run_{case}'](siem, corpus, args)
+    rss = peak_rss_mb()
+    if rss is not None and 'skipped' not in result:
+        result['peak_rss_mb'] = rss
+        result['rss_growth_mb'] = round(rss - baseline_rss, 1)
+    queue.put(result)
+
+
+def measure(case, args):
+    # A fresh interpreter per case keeps peak RSS and detector state independent
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=run_case, args=(case, args, queue))
+    process.start()
+    # A case that crashes never reports back, so keep checking that it is still running
+    deadline = time.monotonic() + args.case_timeout
+    while True:
+        try:
+            result = queue.get(timeout=1)
+            break
+        except Empty:
+            if not process.is_alive():
+                # It may have reported just before exiting
+                try:
+                    result = queue.get(timeout=1)
+                    break
+                except Empty:
+                    pass
+                process.join()
+                return {'failed': f'exited with code {process.exitcode} without a result'}
+            if time.monotonic() > deadline:
+                process.terminate()
+                process.join()
+                return {'failed': f'no result after {args.case_timeout}s'}
+    process.join()
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_results(report):
+    meta = report['meta']
+    print(f"{meta['events']} events, seed {meta['seed']}, formats {','.join(meta['formats'])}, "
+          f"Python {meta['python']}, revision {meta['revision'] or 'unknown'}\n")
+    print(f"{'case':<20} {'events/s':>10} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'max ms':>9} {'peak MB':>8}")
+    for case, row in report['results'].items():
+        if 'skipped' in row:
+            print(f"{case:<20} skipped: {row['skipped']}")
+            continue
+        if 'failed' in row:
+            print(f"{case:<20} FAILED: {row['failed']}")
+            continue
+        print(f"{case:<20} {row['events_per_second']:>10} {row['latency_p50_ms']:>9.3f} {row['latency_p90_ms']:>9.3f} "
+              f"{row['latency_p99_ms']:>9.3f} {row['latency_max_ms']:>9.3f} {row.get('peak_rss_mb') or '-':>8}"
+              + (f"  (latency per batch of {row['batch_size']})" if 'batch_size' in row else ''))
+    stages = report['results'].get('siem_core', {}).get('stages')
+    if stages:
+        print(f"\n{'SIEMCore stage':<20} {'events/s':>10} {'mean us':>9}")
+        for stage, row in stages.items():
+            print(f"{stage:<20} {row['events_per_second']:>10} {row['mean_us']:>9}")
+
+
+def compare(previous, current, threshold):
+    """Print changes against an earlier report; returns the number of regressions"""
+    regressions = 0
+    print(f"\nCompared with {previous['meta'].get('revision') or 'previous run'} "
+          f"({previous['meta'].get('generated_at', '?')}):")
+    differing = [key for key in ('events', 'seed', 'formats', 'mix', 'entities')
+                 if previous['meta'].get(key) != current['meta'].get(key)]
+    if differing:
+        print(f"Warning: the runs used different corpus settings ({', '.join(differing)})")
+    print(f"{'case':<20} {'metric':<18} {'before':>10} {'after':>10} {'change':>8}")
+    for case, row in current['results'].items():
+        before = previous['results'].get(case, {})
+        for metric, higher_is_better in COMPARED.items():
+            if metric not in row or not before.get(metric):
+                continue
+            change = (row[metric] - before[metric]) / before[metric] * 100
+            worse = -change if higher_is_better else change
+            flag = ' !' if worse > threshold else ''
+            regressions += bool(flag)
+            print(f"{case:<20} {metric:<18} {before[metric]:>10} {row[metric]:>10} {change:>+7.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the SIEM ingest pipeline')
+    parser.add_argument('--events', type=int, default=10000, help='Corpus size')
+    parser.add_argument('--seed', type=int, default=42, help='Corpus seed')
+    parser.add_argument('--formats', default=','.join(FORMATS), help='Comma separated corpus formats')
+    parser.add_argument('--mix', type=parse_mix, help="Scenario shares, e.g. 'normal=0.7,brute_force=0.3'")
+    parser.add_argument('--users', type=int, default=50, help='Distinct users in the corpus')
+    parser.add_argument('--hosts', type=int, default=10, help='Distinct hosts in the corpus')
+    parser.add_argument('--sources', type=int, default=500, help='Distinct source addresses in the corpus')
+    parser.add_argument('--cases', default=','.join(CASES), help='Comma separated cases to run')
+    parser.add_argument('--batch', type=int, default=100, help='Events per CorrelationEngine.correlate call')
+    parser.add_argument('--ml-train', type=int, default=1000, help='Events used to train the ML detector')
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Compare against a JSON file from an earlier run')
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help='Percent change that counts as a regression in --compare (exit status 1)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--case-timeout', type=float, default=1800,
+                        help='Seconds to wait for one case before reporting it as failed')
+    args = parser.parse_args()
+    args.formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    cases = [c.strip() for c in args.cases.split(',') if c.strip()]
+    unknown = [c for c in cases if c not in CASES] + [f for f in args.formats if f not in FORMATS]
+    if unknown:
+        parser.error(f"unknown case or format: {', '.join(unknown)}")
+
+    report = {
+        'meta': {
+            'generated_at': datetime.utcnow().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': multiprocessing.cpu_count(),
+            'events': args.events,
+            'seed': args.seed,
+            'formats': args.formats,
+            'mix': args.mix or DEFAULT_MIX,
+            'entities': {'users': args.users, 'hosts': args.hosts, 'sources': args.sources},
+        },
+        'results': {case: measure(case, args) for case in cases},
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_results(report)
+
+    failed = any('failed' in row for row in report['results'].values())
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        if compare(previous, report, args.threshold):
+            sys.exit(1)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
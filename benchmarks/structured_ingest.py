@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Structured ingest benchmark - process_event vs a JSON round trip
+
+In-process producers used to json.dumps each event for SIEMCore to parse
+it straight back with process_log(..., 'json'). This compares that round
+trip with process_event and process_events on the same corpus events,
+each case on a fresh SIEMCore, and reports events/s and the time per
+event saved. Detection dominates end-to-end time, so the cost of the
+round trip alone (dumps + JSONParser.parse) is reported too. Every
+installed JSON backend is measured.
+
+    python benchmarks/structured_ingest.py
+    python benchmarks/structured_ingest.py --events 50000 --json
+"""
+
+import sys
+from pathlib import Path
+import argparse
+import json
+import logging
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from realtime_siem.core.siem_engine import SIEMCore
+from realtime_siem.parsers.log_parser import JSONParser
+from realtime_siem.utils import json_codec
+from realtime_siem.utils.corpus import CorpusGenerator
+from realtime_siem.utils.helpers import StubConfig
+
+
+def run_round_trip(siem, events):
+    dumps = json_codec.dumps
+    for event in events:
+        siem.process_log(dumps(event), 'json')
+
+
+def run_process_event(siem, events):
+    for event in events:
+        siem.process_event(event)
+
+
+def run_process_events(siem, events):
+    siem.process_events(events)
+
+
+def round_trip_cost(events):
+    """Microseconds per event spent serializing and parsing back, without the engine"""
+    dumps, parse = json_codec.dumps, JSONParser().parse
+    started = time.perf_counter()
+    for event in events:
+        parse(dumps(event))
+    return round((time.perf_counter() - started) / len(events) * 1e6, 2)
+
+
+CASES = {
+    'dumps_process_log': run_round_trip,
+    'process_event': run_process_event,
+    'process_events': run_process_events,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark structured event ingestion against a JSON round trip')
+    parser.add_argument('--events', type=int, default=10000, help='Events per case')
+    parser.add_argument('--seed', type=int, default=42, help='Corpus seed')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    corpus = list(CorpusGenerator(seed=args.seed).events(args.events))
+    results = {}
+    round_trip = {}
+    for backend in json_codec.BACKENDS:
+        json_codec.use_backend(backend)
+        round_trip[backend] = round_trip_cost(corpus)
+        for name, case in CASES.items():
+            config = StubConfig({'processing.json_backend': backend})
+            siem = SIEMCore(config)
+            # The engine enriches events in place, so every case gets its own copies
+            events = [dict(event) for event in corpus]
+            started = time.perf_counter()
+            case(siem, events)
+            elapsed = time.perf_counter() - started
+            results[f'{backend}/{name}'] = {
+                'events_per_second': round(len(events) / elapsed, 1),
+                'us_per_event': round(elapsed / len(events) * 1e6, 1),
+                'alerts': len(siem.alert_manager.alerts),
+            }
+        baseline = results[f'{backend}/dumps_process_log']['us_per_event']
+        for name in CASES:
+            row = results[f'{backend}/{name}']
+            row['us_saved'] = round(baseline - row['us_per_event'], 1)
+    json_codec.use_backend('auto')
+
+    if args.json:
+        print(json.dumps({'round_trip_us': round_trip, 'cases': results}, indent=2))
+        return
+    print(f"{args.events} events per case")
+    for backend, cost in round_trip.items():
+        print(f"round trip alone ({backend}): {cost} us/event")
+    print()
+    print(f"{'case':<26} {'events/s':>10} {'us/event':>9} {'us saved':>9} {'alerts':>7}")
+    for name, row in results.items():
+        print(f"{name:<26} {row['events_per_second']:>10} {row['us_per_event']:>9} "
+              f"{row['us_saved']:>9} {row['alerts']:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Syslog listener benchmark - messages per second over local UDP and TCP
+
+Starts a SyslogServer on loopback and blasts it with pre-generated syslog
+lines. By default the pipeline only counts lines, which measures the
+listener itself; --engine feeds a real SIEMCore instead.
+
+    python benchmarks/syslog_ingest.py --messages 200000
+    python benchmarks/syslog_ingest.py --engine --messages 20000
+"""
+
+import sys
+from pathlib import Path
+import argparse
+import json
+import logging
+import socket
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from realtime_siem.ingest import IngestPipeline, SyslogServer
+from realtime_siem.utils.corpus import CorpusGenerator
+from realtime_siem.utils.helpers import StubConfig
+
+
+def make_pipeline(args, config):
+    if args.engine:
+        from realtime_siem.core.siem_engine import SIEMCore
+        siem = SIEMCore(config)
+        return siem.ingest
+    counted = []
+    return IngestPipeline(lambda line, log_type: counted.append(None), config)
+
+
+def send_udp(address, payloads, rate):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 * 1024 * 1024)
+    interval = 1.0 / rate if rate else 0.0
+    start = time.perf_counter()
+    for n, payload in enumerate(payloads):
+        if rate and n % 100 == 0:
+            ahead = start + n * interval - time.perf_counter()
+            if ahead > 0:
+                time.sleep(ahead)
+        try:
+            sock.sendto(payload, address)
+        except OSError:
+            pass
+    sock.close()
+
+
+def send_tcp(address, payloads, octet_counting):
+    sock = socket.create_connection(address)
+    if octet_counting:
+        frames = [b'%d %s' % (len(p), p) for p in payloads]
+    else:
+        frames = [p + b'\n' for p in payloads]
+    for start in range(0, len(frames), 1000):
+        sock.sendall(b''.join(frames[start:start + 1000]))
+    sock.close()
+
+
+def run(transport, args):
+    config = StubConfig({'ingest.batch_size': args.batch, 'ingest.queue_batches': args.queue,
+                         'ingest.syslog.batch_interval_ms': 20})
+    pipeline = make_pipeline(args, config)
+    server = SyslogServer(pipeline, config, host='127.0.0.1',
+                          udp_port=0 if transport == 'udp' else None,
+                          tcp_port=0 if transport != 'udp' else None)
+    generator = CorpusGenerator(seed=args.seed, formats=['rfc3164', 'rfc5424'])
+    payloads = [line.encode() for line, _ in generator.lines(args.messages)]
+
+    pipeline.start()
+    server.start()
+    started = time.perf_counter()
+    if transport == 'udp':
+        send_udp(server.udp_address, payloads, args.udp_rate)
+    else:
+        send_tcp(server.tcp_address, payloads, transport == 'tcp-octet')
+    sent = time.perf_counter() - started
+
+    # Wait until everything received has been processed
+    deadline = time.time() + args.timeout
+    while time.time() < deadline:
+        stats = server.get_stats()
+        received = stats['udp_received'] + stats['tcp_received']
+        settled = received == args.messages or (transport == 'udp' and time.perf_counter() - started > sent + 1)
+        if settled and pipeline.processed == received - stats['udp_dropped']:
+            break
+        time.sleep(0.005)
+    elapsed = time.perf_counter() - started
+    server.stop()
+    pipeline.stop()
+
+    stats = server.get_stats()
+    received = stats['udp_received'] + stats['tcp_received']
+    return {
+        'messages': args.messages,
+        'received': received,
+        'processed': pipeline.processed,
+        'udp_dropped': stats['udp_dropped'],
+        'lost_in_kernel': args.messages - received,
+        'tcp_pauses': stats['tcp_pauses'],
+        'send_seconds': round(sent, 3),
+        'seconds': round(elapsed, 3),
+        'processed_per_second': round(pipeline.processed / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the syslog listener')
+    parser.add_argument('--messages', type=int, default=100000, help='Messages per transport')
+    parser.add_argument('--transports', default='udp,tcp,tcp-octet', help='Comma separated: udp, tcp, tcp-octet')
+    parser.add_argument('--udp-rate', type=float, default=0, help='Paced UDP send rate (0 = as fast as possible)')
+    parser.add_argument('--batch', type=int, default=500, help='ingest.batch_size')
+    parser.add_argument('--queue', type=int, default=200, help='ingest.queue_batches')
+    parser.add_argument('--engine', action='store_true', help='Process lines with SIEMCore instead of counting them')
+    parser.add_argument('--seed', type=int, default=42, help='Corpus seed')
+    parser.add_argument('--timeout', type=float, default=120, help='Seconds to wait for processing per transport')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    results = {t.strip(): run(t.strip(), args) for t in args.transports.split(',') if t.strip()}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'transport':<10} {'processed':>10} {'msgs/s':>10} {'udp drop':>9} {'kernel':>8} {'pauses':>7}")
+    for transport, row in results.items():
+        print(f"{transport:<10} {row['processed']:>10} {row['processed_per_second']:>10} "
+              f"{row['udp_dropped']:>9} {row['lost_in_kernel']:>8} {row['tcp_pauses']:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Template mining benchmark - SyslogParser throughput with message templates
+
+Parses an auth.log-like stream (sshd logins and disconnects, pam_unix,
+sudo, cron, UFW blocks) with SyslogParser three ways: templates off,
+templates on, and templates on with the shape cache effectively disabled
+(every message walks the tree). Reports lines/s, the templates found,
+and how often the extracted user, source_ip and event_type match the
+values the generator put in the line. --file parses a real auth.log
+instead; accuracy is then not reported.
+
+    python benchmarks/template_mining.py
+    python benchmarks/template_mining.py --lines 200000 --json
+    python benchmarks/template_mining.py --file /var/log/auth.log
+"""
+
+import sys
+from pathlib import Path
+import argparse
+import json
+import logging
+import random
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from realtime_siem.parsers.log_parser import SyslogParser
+from realtime_siem.utils.helpers import StubConfig
+
+
+# (program, message, event_type); {user}, {ip}, {port}... are filled per line
+AUTH_MESSAGES = [
+    ('sshd', 'Failed password for {user} from {ip} port {port} ssh2', 'failed_login'),
+    ('sshd', 'Failed password for invalid user {user} from {ip} port {port} ssh2', 'failed_login'),
+    ('sshd', 'Invalid user {user} from {ip} port {port}', 'failed_login'),
+    ('sshd', 'Accepted password for {user} from {ip} port {port} ssh2', 'successful_login'),
+    ('sshd', 'Accepted publickey for {user} from {ip} port {port} ssh2: RSA SHA256:{key}', 'successful_login'),
+    ('sshd', 'pam_unix(sshd:session): session opened for user {user} by (uid=0)', 'session_opened'),
+    ('sshd', 'pam_unix(sshd:session): session closed for user {user}', 'session_closed'),
+    ('sshd', 'pam_unix(sshd:auth): authentication failure; logname= uid=0 euid=0 tty=ssh ruser= '
+             'rhost={ip}  user={user}', 'failed_login'),
+    ('sshd', 'Received disconnect from {ip} port {port}:11: disconnected by user', None),
+    ('sshd', 'Disconnected from user {user} {ip} port {port}', None),
+    ('sshd', 'Connection closed by {ip} port {port} [preauth]', None),
+    ('sudo', '{user} : TTY=pts/{tty} ; PWD=/home/{user} ; USER=root ; COMMAND=/usr/bin/systemctl', 'privileged_command'),
+    ('CRON', 'pam_unix(cron:session): session opened for user {user} by (uid=0)', 'session_opened'),
+    ('kernel', '[UFW BLOCK] IN=eth0 OUT= MAC=52:54:00:12:34:56 SRC={ip} DST=10.0.0.5 LEN=60 '
+               'PROTO=TCP SPT={port} DPT=22', 'connection_blocked'),
+]
+USERS = ['root', 'admin', 'alice', 'bob', 'deploy', 'git', 'oracle', 'test', 'ubuntu', 'postgres']
+HOSTS = ['web-01', 'web-02', 'bastion', 'db-01']
+
+
+def auth_log(count, seed):
+    """(line, expected fields) pairs"""
+    rng = random.Random(seed)
+    ips = [f'{rng.randint(1, 223)}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}'
+           for _ in range(500)]
+    for i in range(count):
+        program, template, event_type = rng.choice(AUTH_MESSAGES)
+        user, ip = rng.choice(USERS), rng.choice(ips)
+        message = template.format(user=user, ip=ip, port=rng.randint(1024, 65535),
+                                  tty=rng.randint(0, 9), key='%032x' % rng.getrandbits(128))
+        second = i // 50
+        line = (f'<38>Oct {11 + second // 86400:2d} {second // 3600 % 24:02d}:{second // 60 % 60:02d}:'
+                f'{second % 60:02d} {rng.choice(HOSTS)} {program}[{rng.randint(100, 65000)}]: {message}')
+        expected = {'event_type': event_type}
+        if '{user}' in template and program != 'sudo':
+            expected['user'] = user
+        if '{ip}' in template and 'rhost' not in template:
+            expected['source_ip'] = ip
+        yield line, expected
+
+
+def read_file(path, count):
+    with open(path, errors='replace') as f:
+        for i, line in enumerate(f):
+            if i >= count:
+                return
+            # auth.log lines carry no PRI; give them one so SyslogParser matches
+            yield '<38>' + line.rstrip('\n'), None
+
+
+def run(lines, config):
+    parser = SyslogParser(StubConfig(config))
+    started = time.perf_counter()
+    events = [parser.parse(line) for line, _ in lines]
+    elapsed = time.perf_counter() - started
+    row = {'lines_per_second': round(len(lines) / elapsed, 1),
+           'us_per_line': round(elapsed / len(lines) * 1e6, 2)}
+    if parser.templates:
+        row.update(parser.templates.get_stats())
+    return row, events
+
+
+def accuracy(lines, events):
+    checked = matched = 0
+    for (_, expected), event in zip(lines, events):
+        for field, value in expected.items():
+            checked += 1
+            matched += event.get(field) == value
+    return round(matched / checked * 100, 2) if checked else None
+
+
+CASES = {
+    'templates_off': {'parsers.templates.enabled': False},
+    'templates_on': {},
+    'templates_uncached': {'parsers.templates.cache_size': 1},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark syslog message template mining')
+    parser.add_argument('--lines', type=int, default=100000, help='Lines to parse')
+    parser.add_argument('--seed', type=int, default=42, help='Generator seed')
+    parser.add_argument('--file', help='Parse this auth.log instead of generated lines')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    source = read_file(args.file, args.lines) if args.file else auth_log(args.lines, args.seed)
+    lines = list(source)
+    results = {}
+    for name, config in CASES.items():
+        row, events = run(lines, config)
+        if name != 'templates_off' and not args.file:
+            row['accuracy_percent'] = accuracy(lines, events)
+        results[name] = row
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{len(lines)} lines from {args.file or 'generated auth.log'}\n")
+    print(f"{'case':<20} {'lines/s':>10} {'us/line':>8} {'templates':>10} {'cache hits':>11} {'accuracy %':>11}")
+    for name, row in results.items():
+        print(f"{name:<20} {row['lines_per_second']:>10} {row['us_per_line']:>8} {row.get('templates', '-'):>10} "
+              f"{row.get('cache_hits', '-'):>11} {row.get('accuracy_percent', '-'):>11}")
+
+
+if __name__ == '__main__':
+    main()
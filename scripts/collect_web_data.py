@@ -9,7 +9,6 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 import requests
-import json
 import time
 import threading
 from datetime import datetime
@@ -56,8 +55,7 @@ class WebDataCollector:
                         'threat_level': self._assess_threat_level(entry.get('title', ''))
                     }
                     
-                    # Convert to JSON and process
-                    self.siem.process_log(json.dumps(event), 'json')
+                    self.siem.process_event(event)
                     logger.info(f"  📰 {entry.get('title', 'Unknown')[:60]}...")
                     
             except Exception as e:
@@ -78,7 +76,7 @@ class WebDataCollector:
                 'threat_category': 'suspicious' if '192.0.2' in ip else 'clean'
             }
             
-            self.siem.process_log(json.dumps(event), 'json')
+            self.siem.process_event(event)
             logger.info(f"  🔎 Checked IP: {ip}")
     
     def collect_github_security_advisories(self):
@@ -103,7 +101,7 @@ class WebDataCollector:
                         'timestamp': datetime.utcnow().isoformat()
                     }
                     
-                    self.siem.process_log(json.dumps(event), 'json')
+                    self.siem.process_event(event)
                     logger.info(f"  🛡️  {advisory.get('summary', 'Unknown')[:60]}...")
                     
         except Exception as e:
@@ -157,7 +155,8 @@ class WebDataCollector:
             pattern['timestamp'] = datetime.utcnow().isoformat()
             pattern['type'] = 'web_traffic'
             
-            self.siem.process_log(json.dumps(pattern), 'json')
+            # The patterns are reused, so each event gets its own copy
+            self.siem.process_event(dict(pattern))
             time.sleep(0.5)
     
     def collect_honeypot_data(self):
@@ -178,7 +177,7 @@ class WebDataCollector:
         ]
         
         for event in honeypot_events:
-            self.siem.process_log(json.dumps(event), 'json')
+            self.siem.process_event(event)
             logger.info(f"  🎣 Honeypot catch: {event['source_ip']} tried {event['username']}")
     
     def _assess_threat_level(self, title: str) -> str:
@@ -86,16 +86,8 @@ def main():
     processed_events = []
     
     for i, log in enumerate(SAMPLE_LOGS):
-        # Determine log type
-        if log.strip().startswith('{'):
-            log_type = 'json'
-        elif log.strip().startswith('<'):
-            log_type = 'syslog'
-        else:
-            log_type = 'default'
-        
-        # Process log
-        result = siem.process_log(log, log_type)
+        # Process log; the parser is picked from the line's format
+        result = siem.process_log(log, 'auto')
         
         if result:
             processed_events.append(result)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+SIEM Load Generator - drive the engine at a target event rate
+
+Replays a realistic synthetic mix (normal traffic, brute-force bursts, port
+scans, exfiltration, privilege escalation) into SIEMCore in-process or to a
+local syslog socket, either paced at --rate events per second or open-loop
+as fast as possible (--rate 0), and reports the achieved rate against the
+target. Lines are generated before the clock starts so generation cost
+does not limit the rate. --sink events hands structured events to
+SIEMCore.process_event instead of lines.
+
+    python scripts/load_generator.py --rate 2000 --duration 30
+    python scripts/load_generator.py --rate 0 --count 100000 --sink tcp --port 5140
+    python scripts/load_generator.py --rate 0 --count 20000 --sink events
+"""
+
+import sys
+import time
+import json
+import socket
+import argparse
+import logging
+from pathlib import Path
+from itertools import cycle
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from realtime_siem.utils.corpus import CorpusGenerator, FORMATS, parse_mix
+
+# Sleep only when this far ahead of schedule; shorter sleeps overshoot
+MIN_SLEEP_SECONDS = 0.001
+
+
+class InProcessSink:
+    """Calls SIEMCore.process_log directly"""
+
+    def __init__(self, config_path, start_engine):
+        from realtime_siem.core.siem_engine import SIEMCore
+        from realtime_siem.config.config_manager import ConfigManager
+        self.siem = SIEMCore(ConfigManager(config_path=config_path))
+        self.started = start_engine
+        if start_engine:
+            self.siem.start()
+
+    def send(self, line, log_type):
+        self.siem.process_log(line, log_type)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        if self.started:
+            self.siem.stop()
+
+    def get_stats(self):
+        return {
+            'processed': self.siem.event_processor.processed_count,
+            'alerts': len(self.siem.alert_manager.alerts),
+        }
+
+
+class InProcessEventSink(InProcessSink):
+    """Calls SIEMCore.process_event with structured events, skipping serialize and parse"""
+
+    def send(self, event, log_type):
+        # Pool events are cycled, and the engine enriches what it is given in place
+        self.siem.process_event(dict(event), log_type)
+
+
+class TcpSink:
+    """Newline-framed syslog over one TCP connection, written in batches"""
+
+    def __init__(self, host, port, batch_bytes=65536):
+        self.sock = socket.create_connection((host, port))
+        self.batch_bytes = batch_bytes
+        self.buffer = []
+        self.buffered = 0
+
+    def send(self, line, log_type):
+        data = line.encode() + b'\n'
+        self.buffer.append(data)
+        self.buffered += len(data)
+        if self.buffered >= self.batch_bytes:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.sock.sendall(b''.join(self.buffer))
+            self.buffer, self.buffered = [], 0
+
+    def close(self):
+        self.flush()
+        self.sock.close()
+
+    def get_stats(self):
+        return {}
+
+
+class UdpSink:
+    """One syslog message per datagram"""
+
+    def __init__(self, host, port):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.address = (host, port)
+        self.errors = 0
+
+    def send(self, line, log_type):
+        try:
+            self.sock.sendto(line.encode(), self.address)
+        except OSError:
+            # e.g. ENOBUFS when the kernel buffer is full
+            self.errors += 1
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.sock.close()
+
+    def get_stats(self):
+        return {'send_errors': self.errors}
+
+
+def run(pool, sink, rate, duration, count, report_interval, quiet):
+    """Send lines from pool on an open-loop schedule; returns the summary"""
+    interval = 1.0 / rate if rate else 0.0
+    clock = time.perf_counter
+    start = clock()
+    next_report = start + report_interval
+    last_report, last_report_sent = start, 0
+    sent = 0
+    max_lag = 0.0
+    late = 0
+
+    for line, log_type in cycle(pool):
+        now = clock()
+        if (count and sent >= count) or (duration and now - start >= duration):
+            break
+        if rate:
+            # Event n is due at start + n / rate regardless of how earlier sends went
+            due = start + sent * interval
+            ahead = due - now
+            if ahead > MIN_SLEEP_SECONDS:
+                sink.flush()
+                time.sleep(ahead)
+            elif ahead < 0:
+                max_lag = max(max_lag, -ahead)
+                late += ahead < -0.01
+        sink.send(line, log_type)
+        sent += 1
+
+        if not quiet and now >= next_report:
+            window_rate = (sent - last_report_sent) / (now - last_report)
+            target = f"{rate:g}/s" if rate else 'max'
+            print(f"[{now - start:7.1f}s] sent {sent:>10}  {window_rate:>10.0f}/s  target {target}", file=sys.stderr)
+            last_report, last_report_sent = now, sent
+            next_report = now + report_interval
+
+    sink.flush()
+    elapsed = clock() - start
+    achieved = sent / elapsed if elapsed else 0.0
+    return {
+        'sent': sent,
+        'seconds': round(elapsed, 3),
+        'target_rate': rate or None,
+        'achieved_rate': round(achieved, 1),
+        'achieved_percent': round(achieved / rate * 100, 1) if rate else None,
+        'max_lag_ms': round(max_lag * 1000, 2),
+        'late_events': late,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SIEM Load Generator')
+    parser.add_argument('--rate', type=float, default=1000, help='Target events per second (0 = as fast as possible)')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds to run (0 = until --count)')
+    parser.add_argument('--count', type=int, default=0, help='Stop after this many events (0 = until --duration)')
+    parser.add_argument('--sink', choices=['inprocess', 'events', 'tcp', 'udp'], default='inprocess',
+                        help='Feed SIEMCore lines directly, structured events directly (events), '
+                             'or a syslog listener over a local socket')
+    parser.add_argument('--host', default='127.0.0.1', help='Listener host for tcp/udp')
+    parser.add_argument('--port', type=int, default=5140, help='Listener port for tcp/udp')
+    parser.add_argument('--config', default='config/siem_config.yaml', help='Configuration file (inprocess, events)')
+    parser.add_argument('--start-engine', action='store_true',
+                        help='Start SIEMCore background services (Elasticsearch, notifications) in-process')
+    parser.add_argument('--formats', help='Comma separated line formats (default: all in-process, syslog over sockets; ignored for events)')
+    parser.add_argument('--mix', type=parse_mix, help="Scenario shares, e.g. 'normal=0.8,brute_force=0.1,port_scan=0.1'")
+    parser.add_argument('--users', type=int, default=50, help='Distinct users')
+    parser.add_argument('--hosts', type=int, default=10, help='Distinct hosts')
+    parser.add_argument('--sources', type=int, default=500, help='Distinct source addresses')
+    parser.add_argument('--burst', type=int, default=20, help='Events per brute-force or port-scan burst')
+    parser.add_argument('--pool', type=int, default=100000, help='Distinct lines generated up front and cycled')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus seed')
+    parser.add_argument('--report-interval', type=float, default=1.0, help='Seconds between progress lines')
+    parser.add_argument('--quiet', action='store_true', help='Only print the summary')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    args = parser.parse_args()
+    if not args.duration and not args.count:
+        parser.error('set --duration or --count')
+    logging.disable(logging.WARNING)
+
+    if args.formats:
+        formats = [f.strip() for f in args.formats.split(',')]
+    else:
+        formats = list(FORMATS) if args.sink == 'inprocess' else ['rfc3164', 'rfc5424']
+    generator = CorpusGenerator(seed=args.seed, formats=formats, mix=args.mix, users=args.users,
+                                hosts=args.hosts, sources=args.sources, burst=args.burst)
+    pool_size = min(args.pool, args.count) if args.count else args.pool
+    if args.sink == 'events':
+        pool = [(event, 'event') for event in generator.events(pool_size)]
+    else:
+        pool = generator.corpus(pool_size)
+
+    if args.sink == 'inprocess':
+        sink = InProcessSink(args.config, args.start_engine)
+    elif args.sink == 'events':
+        sink = InProcessEventSink(args.config, args.start_engine)
+    elif args.sink == 'tcp':
+        sink = TcpSink(args.host, args.port)
+    else:
+        sink = UdpSink(args.host, args.port)
+
+    try:
+        summary = run(pool, sink, args.rate, args.duration, args.count, args.report_interval, args.quiet)
+    except KeyboardInterrupt:
+        print("\nInterrupted", file=sys.stderr)
+        return
+    finally:
+        sink.close()
+    summary['sink'] = args.sink
+    summary['pool_mix'] = generator.scenario_counts
+    summary.update(sink.get_stats())
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    target = f"{args.rate:g}/s" if args.rate else 'as fast as possible'
+    print(f"\nSent {summary['sent']} events to {args.sink} in {summary['seconds']}s")
+    print(f"  Target rate:   {target}")
+    print(f"  Achieved rate: {summary['achieved_rate']}/s"
+          + (f" ({summary['achieved_percent']}% of target)" if args.rate else ''))
+    if args.rate:
+        print(f"  Max lag:       {summary['max_lag_ms']} ms ({summary['late_events']} events more than 10 ms late)")
+    for key, value in sink.get_stats().items():
+        print(f"  {key.replace('_', ' ').capitalize() + ':':<15}{value}")
+    print(f"  Pool mix:      {', '.join(f'{k}={v}' for k, v in generator.scenario_counts.items())}")
+
+
+if __name__ == "__main__":
+    main()
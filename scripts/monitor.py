@@ -15,6 +15,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 from realtime_siem.core.siem_engine import SIEMCore
 from realtime_siem.config.config_manager import ConfigManager
 from realtime_siem.utils.helpers import setup_logging
+from realtime_siem.ingest import FileTailer
 
 try:
     from colorama import Fore, Style, init
@@ -97,38 +98,33 @@ def display_stats(siem):
     print(f"  Total Alerts: {stats['alerts_count']}")
     print(f"  Events Processed: {siem.event_processor.processed_count}")
 
-def monitor_file(filepath, siem, args):
-    """Monitor a log file for new entries"""
-    print(f"{Fore.CYAN}Monitoring file: {filepath}{Style.RESET_ALL}\n")
-    
-    with open(filepath, 'r') as f:
-        # Go to end of file if --tail is specified
-        if args.tail:
-            f.seek(0, 2)
-        
-        try:
+def monitor_file(patterns, siem, args):
+    """Monitor log files (paths or globs) for new entries"""
+    print(f"{Fore.CYAN}Monitoring: {', '.join(patterns)}{Style.RESET_ALL}\n")
+
+    def show(lines, path):
+        for line in lines:
+            result = siem.process_log(line, 'auto', source=path)
+            if result:
+                display_event(result, args.verbose)
+            if args.interval > 0:
+                time.sleep(args.interval)
+
+    tailer = FileTailer(show, {
+        'tailer.start_at': 'end' if args.tail else 'beginning',
+        'tailer.checkpoint_path': args.checkpoint,
+    }, patterns)
+    try:
+        if args.follow:
             while True:
-                line = f.readline()
-                
-                if not line:
-                    if args.follow:
-                        time.sleep(0.1)
-                        continue
-                    else:
-                        break
-                
-                # Process the log line
-                log_type = 'json' if line.strip().startswith('{') else 'syslog' if line.strip().startswith('<') else 'default'
-                result = siem.process_log(line.strip(), log_type)
-                
-                if result:
-                    display_event(result, args.verbose)
-                
-                if args.interval > 0:
-                    time.sleep(args.interval)
-        
-        except KeyboardInterrupt:
-            print(f"\n{Fore.YELLOW}Monitoring stopped{Style.RESET_ALL}")
+                if not tailer.poll():
+                    time.sleep(tailer.poll_interval)
+        else:
+            tailer.drain()
+    except KeyboardInterrupt:
+        print(f"\n{Fore.YELLOW}Monitoring stopped{Style.RESET_ALL}")
+    finally:
+        tailer.close()
 
 def simulate_events(siem, args):
     """Simulate random security events"""
@@ -148,9 +144,7 @@ def simulate_events(siem, args):
         count = 0
         while count < args.count if args.count > 0 else True:
             log = random.choice(sample_events)
-            log_type = 'json' if log.startswith('{') else 'syslog' if log.startswith('<') else 'default'
-            
-            result = siem.process_log(log, log_type)
+            result = siem.process_log(log, 'auto')
             
             if result:
                 display_event(result, args.verbose)
@@ -163,9 +157,10 @@ def simulate_events(siem, args):
 
 def main():
     parser = argparse.ArgumentParser(description='Real-time SIEM Monitor')
-    parser.add_argument('--file', type=str, help='Log file to monitor')
-    parser.add_argument('--follow', '-f', action='store_true', help='Follow log file (like tail -f)')
-    parser.add_argument('--tail', action='store_true', help='Start from end of file')
+    parser.add_argument('--file', type=str, action='append', help='Log file or glob to monitor (repeatable)')
+    parser.add_argument('--follow', '-f', action='store_true', help='Follow log files (like tail -F, across rotation)')
+    parser.add_argument('--tail', action='store_true', help='Start new files from the end')
+    parser.add_argument('--checkpoint', type=str, help='Save read offsets here and resume from them on restart')
     parser.add_argument('--simulate', action='store_true', help='Simulate random events')
     parser.add_argument('--count', type=int, default=10, help='Number of events to simulate (0 = infinite)')
     parser.add_argument('--interval', type=float, default=1.0, help='Interval between events (seconds)')
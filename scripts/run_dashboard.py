@@ -5,17 +5,13 @@ Simple Web Dashboard for SIEM - View alerts and statistics in browser
 
 import sys
 from pathlib import Path
-import json
-from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs
-import threading
-import time
+from html import escape
 
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from realtime_siem.core.siem_engine import SIEMCore
 from realtime_siem.config.config_manager import ConfigManager
+from realtime_siem.dashboard.server import DashboardServer, DashboardHandler
 
 # Global SIEM instance
 siem = None
@@ -173,82 +169,57 @@ HTML_TEMPLATE = """
 </html>
 """
 
-class DashboardHandler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        global siem
-        
-        parsed_path = urlparse(self.path)
-        
-        if parsed_path.path == '/':
-            self.send_response(200)
-            self.send_header('Content-type', 'text/html')
-            self.end_headers()
-            
-            # Get stats
-            stats = siem.get_stats()
-            alerts = siem.alert_manager.get_alerts()
-            open_alerts = siem.alert_manager.get_alerts(status='open')
-            
-            # Generate alerts HTML
-            alerts_html = ""
-            for alert in reversed(alerts[-20:]):  # Show last 20
-                severity = alert.get('severity', 'low')
-                status = alert.get('status', 'open')
-                threat = alert.get('threat', {})
-                
-                alerts_html += f"""
-                <div class="alert-item alert-{severity}">
-                    <div>
-                        <span class="severity-badge severity-{severity}">{severity.upper()}</span>
-                        <span class="status-badge status-{status}">{status.upper()}</span>
-                        <span class="timestamp">{alert.get('timestamp', 'N/A')}</span>
-                    </div>
-                    <h4>{alert.get('alert_id', 'N/A')}</h4>
-                    <p>Type: {threat.get('type', threat.get('rule_name', 'Unknown'))}</p>
-                    {f"<p>{threat.get('description', '')}</p>" if threat.get('description') else ''}
-                </div>
-                """
-            
-            if not alerts_html:
-                alerts_html = "<p>No alerts yet. System is monitoring...</p>"
-            
-            # Fill template
-            html = HTML_TEMPLATE.format(
-                total_alerts=stats['alerts_count'],
-                open_alerts=len(open_alerts),
-                events_processed=siem.event_processor.processed_count,
-                status='🟢 Running' if stats['is_running'] else '🔴 Stopped',
-                status_color='#28a745' if stats['is_running'] else '#dc3545',
-                alerts_html=alerts_html
-            )
-            
-            self.wfile.write(html.encode())
-        
-        elif parsed_path.path == '/api/stats':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            
-            stats = siem.get_stats()
-            stats['events_processed'] = siem.event_processor.processed_count
-            
-            self.wfile.write(json.dumps(stats).encode())
-        
-        elif parsed_path.path == '/api/alerts':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            
-            alerts = siem.alert_manager.get_alerts()
-            self.wfile.write(json.dumps(alerts, default=str).encode())
+def render_page(snapshot):
+    """Render the dashboard page from a published snapshot"""
+    stats = snapshot.stats
+    
+    # Generate alerts HTML
+    alerts_html = ""
+    for alert in reversed(snapshot.recent(20)):  # Show last 20
+        severity = escape(str(alert.get('severity', 'low')))
+        status = escape(str(alert.get('status', 'open')))
         
-        else:
-            self.send_response(404)
-            self.end_headers()
+        alerts_html += f"""
+        <div class="alert-item alert-{severity}">
+            <div>
+                <span class="severity-badge severity-{severity}">{severity.upper()}</span>
+                <span class="status-badge status-{status}">{status.upper()}</span>
+                <span class="timestamp">{escape(str(alert.get('timestamp', 'N/A')))}</span>
+            </div>
+            <h4>{escape(str(alert.get('alert_id', 'N/A')))}</h4>
+            <p>Type: {escape(str(alert.get('threat') or 'Unknown'))}</p>
+            {f"<p>{escape(str(alert['description']))}</p>" if alert.get('description') else ''}
+        </div>
+        """
+    
+    if not alerts_html:
+        alerts_html = "<p>No alerts yet. System is monitoring...</p>"
+    
+    # Fill template
+    is_running = stats.get('is_running', False)
+    html = HTML_TEMPLATE.format(
+        total_alerts=stats.get('total_alerts', 0),
+        open_alerts=stats.get('open_alerts', 0),
+        events_processed=stats.get('events_processed', 0),
+        status='🟢 Running' if is_running else '🔴 Stopped',
+        status_color='#28a745' if is_running else '#dc3545',
+        alerts_html=alerts_html
+    )
+    return html.encode()
+
+class SimpleDashboardHandler(DashboardHandler):
+    ROUTES = dict(DashboardHandler.ROUTES, **{'/': 'page'})
+    
+    # (snapshot version, rendered page); every viewer of a snapshot shares one render
+    _page = (None, b'')
     
-    def log_message(self, format, *args):
-        # Suppress access logs
-        pass
+    def page(self, query):
+        snapshot = self.snapshot
+        version, body = SimpleDashboardHandler._page
+        if version != snapshot.version:
+            body = render_page(snapshot)
+            SimpleDashboardHandler._page = (snapshot.version, body)
+        self.send_body(body, 'text/html')
 
 def run_dashboard(port=8080):
     global siem
@@ -263,7 +234,7 @@ def run_dashboard(port=8080):
     print(f"✓ SIEM initialized")
     
     # Start web server
-    server = HTTPServer(('', port), DashboardHandler)
+    server = DashboardServer(('', port), SimpleDashboardHandler, siem.dashboard, config)
     
     print(f"\n{'='*60}")
     print(f"  SIEM Dashboard running at: http://localhost:{port}")
@@ -277,8 +248,8 @@ def run_dashboard(port=8080):
         server.serve_forever()
     except KeyboardInterrupt:
         print("\n\n⚠️  Shutting down dashboard...")
+        server.close()
         siem.stop()
-        server.shutdown()
         print("✓ Dashboard stopped\n")
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import logging
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -10,21 +11,34 @@ class AlertManager:
         self.config = config
         self.alerts: List[Dict[str, Any]] = []
         self.alert_counter = 0
-    
+        self.open_count = 0
+        # Bumped whenever existing alerts change, so snapshot readers know to update
+        self.status_changes = 0
+        # Seq of the alert behind each status change after the first _changed_base ones
+        self._changed: List[int] = []
+        self._changed_base = 0
+        self.max_changes_kept = 10000
+        # Notified on every new alert so stream readers can block instead of polling
+        self._new_alert = threading.Condition()
+
     def create_alert(self, threat: Dict[str, Any], event: Dict[str, Any]) -> Dict[str, Any]:
-        self.alert_counter += 1
-        alert = {
-            "alert_id": f"alert_{self.alert_counter}_{int(datetime.utcnow().timestamp())}",
-            "threat": threat,
-            "event": event,
-            "severity": threat.get('severity', 'medium'),
-            "timestamp": datetime.utcnow().isoformat(),
-            "status": "open"
-        }
-        self.alerts.append(alert)
+        with self._new_alert:
+            self.alert_counter += 1
+            alert = {
+                "alert_id": f"alert_{self.alert_counter}_{int(datetime.utcnow().timestamp())}",
+                "seq": self.alert_counter,
+                "threat": threat,
+                "event": event,
+                "severity": threat.get('severity', 'medium'),
+                "timestamp": datetime.utcnow().isoformat(),
+                "status": "open"
+            }
+            self.alerts.append(alert)
+            self.open_count += 1
+            self._new_alert.notify_all()
         logger.warning(f"Alert created: {alert['alert_id']} - {threat.get('type', 'unknown')}")
         return alert
-    
+
     def get_alerts(self, severity: str = None, status: str = None) -> List[Dict[str, Any]]:
         filtered = self.alerts
         if severity:
@@ -32,24 +46,87 @@ class AlertManager:
         if status:
             filtered = [a for a in filtered if a.get('status') == status]
         return filtered
-    
+
+    def get_alerts_since(self, seq: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Alerts with a sequence number greater than seq, oldest first"""
+        alerts = self.alerts
+        if not alerts:
+            return []
+        # Sequence numbers are contiguous within the list, so the offset is direct
+        start = max(seq - alerts[0]['seq'] + 1, 0)
+        end = len(alerts) if limit is None else start + limit
+        return alerts[start:end]
+
+    def wait_for_alerts(self, seq: int, timeout: float) -> List[Dict[str, Any]]:
+        """Block until alerts newer than seq exist or timeout passes"""
+        with self._new_alert:
+            self._new_alert.wait_for(lambda: self.alert_counter > seq, timeout)
+        return self.get_alerts_since(seq)
+
+    def wait_for_change(self, seq: int, status_changes: int, timeout: float,
+                        stop: Optional[threading.Event] = None) -> bool:
+        """Block until alerts newer than seq exist, existing alerts change or stop is set"""
+        with self._new_alert:
+            return self._new_alert.wait_for(
+                lambda: (self.alert_counter > seq or self.status_changes != status_changes
+                         or (stop is not None and stop.is_set())), timeout)
+
+    def wake_waiters(self):
+        """Make blocked waiters re-check their stop condition"""
+        with self._new_alert:
+            self._new_alert.notify_all()
+
     def close_alert(self, alert_id: str):
         for alert in self.alerts:
             if alert['alert_id'] == alert_id:
+                if alert['status'] == 'open':
+                    self.open_count -= 1
                 alert['status'] = 'closed'
                 alert['closed_at'] = datetime.utcnow().isoformat()
+                self._record_change(alert['seq'])
                 logger.info(f"Alert closed: {alert_id}")
                 return True
         return False
-    
+
+    def _record_change(self, seq: int):
+        with self._new_alert:
+            self._changed.append(seq)
+            self.status_changes += 1
+            if len(self._changed) > self.max_changes_kept:
+                drop = len(self._changed) // 2
+                del self._changed[:drop]
+                self._changed_base += drop
+            self._new_alert.notify_all()
+
+    def changed_since(self, status_changes: int) -> Optional[List[int]]:
+        """Seqs of alerts changed after the given status_changes count.
+
+        None when that point is no longer covered (the alerts were cleared
+        or too many changes happened since), so the caller must rebuild.
+        """
+        with self._new_alert:
+            if status_changes < self._changed_base:
+                return None
+            return self._changed[status_changes - self._changed_base:]
+
+    def clear(self):
+        """Drop all stored alerts; sequence numbers keep increasing"""
+        with self._new_alert:
+            self.alerts = []
+            self.open_count = 0
+            self.status_changes += 1
+            self._changed = []
+            self._changed_base = self.status_changes
+            self._new_alert.notify_all()
+
     def get_stats(self) -> Dict[str, Any]:
         return {
             'total_alerts': len(self.alerts),
-            'open_alerts': len([a for a in self.alerts if a['status'] == 'open']),
+            'open_alerts': self.open_count,
             'closed_alerts': len([a for a in self.alerts if a['status'] == 'closed']),
             'severity_distribution': self._get_severity_distribution()
         }
-    
+
     def _get_severity_distribution(self) -> Dict[str, int]:
         distribution = {}
         for alert in self.alerts:
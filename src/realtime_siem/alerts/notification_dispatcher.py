@@ -0,0 +1,218 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Callable, Optional
+
+from .notification_handler import NotificationHandler
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Stops calling an endpoint after repeated failures until a cool-down passes"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+        self.state = self.CLOSED
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.state = self.CLOSED
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit opened after {self.failures} consecutive failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+
+class ChannelWorker:
+    """Delivers alerts for a single channel from a bounded queue on its own thread"""
+
+    def __init__(self, name: str, sender: Callable[[List[Dict[str, Any]]], None],
+                 queue_size: int = 1000, batch_size: int = 20, batch_window: float = 2.0,
+                 max_retries: int = 3, backoff: float = 1.0, backoff_max: float = 30.0,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.name = name
+        self.sender = sender
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker()
+
+        self.enqueued = 0
+        self.delivered = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retries = 0
+        self.batches = 0
+        self.latencies = deque(maxlen=1000)
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, alert: Dict[str, Any]) -> bool:
+        try:
+            self.queue.put_nowait((time.monotonic(), alert))
+            self.enqueued += 1
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=f"notify-{self.name}", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        # Keep draining after stop() so queued alerts still go out
+        while not (self._stop.is_set() and self.queue.empty()):
+            batch = self._next_batch()
+            if batch:
+                self._deliver(batch)
+
+    def _next_batch(self) -> List[Any]:
+        try:
+            batch = [self.queue.get(timeout=0.5)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.batch_size:
+            # While shutting down, take what is already queued without waiting
+            remaining = 0 if self._stop.is_set() else deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    batch.append(self.queue.get_nowait())
+                else:
+                    batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _deliver(self, batch: List[Any]):
+        alerts = [alert for _, alert in batch]
+        delay = self.backoff
+
+        for attempt in range(self.max_retries + 1):
+            if not self.breaker.allow():
+                break
+            try:
+                self.sender(alerts)
+                self.breaker.record_success()
+                now = time.monotonic()
+                self.latencies.extend(now - queued_at for queued_at, _ in batch)
+                self.delivered += len(batch)
+                self.batches += 1
+                return
+            except Exception as e:
+                self.breaker.record_failure()
+                logger.warning(f"{self.name} notification attempt {attempt + 1} failed: {e}")
+                if attempt < self.max_retries:
+                    self.retries += 1
+                    if self._stop.wait(delay):
+                        # Shutting down: make one last attempt without waiting
+                        delay = 0
+                    delay = min(delay * 2, self.backoff_max)
+
+        self.failed += len(batch)
+        logger.error(f"Dropped {len(batch)} {self.name} notification(s) after retries "
+                     f"(circuit {self.breaker.state})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        stats = {
+            'queue_depth': self.queue.qsize(),
+            'enqueued': self.enqueued,
+            'delivered': self.delivered,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'retries': self.retries,
+            'batches': self.batches,
+            'circuit_state': self.breaker.state,
+        }
+        if latencies:
+            stats['latency_ms'] = {
+                'avg': round(sum(latencies) / len(latencies) * 1000, 2),
+                'p50': round(latencies[len(latencies) // 2] * 1000, 2),
+                'p95': round(latencies[int(len(latencies) * 0.95)] * 1000, 2),
+                'max': round(latencies[-1] * 1000, 2),
+            }
+        return stats
+
+
+class NotificationDispatcher:
+    """Queues alerts per notification channel so delivery never blocks ingestion"""
+
+    def __init__(self, config=None, handler: Optional[NotificationHandler] = None):
+        self.config = config or {}
+        self.handler = handler or NotificationHandler(config)
+        self.channels: Dict[str, ChannelWorker] = {}
+
+        get = self.config.get
+        for name, sender in self.handler.get_senders().items():
+            self.channels[name] = ChannelWorker(
+                name,
+                sender,
+                queue_size=get('notifications.dispatcher.queue_size', 1000),
+                batch_size=get('notifications.dispatcher.batch_size', 20),
+                batch_window=get('notifications.dispatcher.batch_window_seconds', 2.0),
+                max_retries=get('notifications.dispatcher.max_retries', 3),
+                backoff=get('notifications.dispatcher.retry_backoff_seconds', 1.0),
+                backoff_max=get('notifications.dispatcher.retry_backoff_max_seconds', 30.0),
+                breaker=CircuitBreaker(
+                    failure_threshold=get('notifications.dispatcher.circuit_failure_threshold', 5),
+                    reset_timeout=get('notifications.dispatcher.circuit_reset_seconds', 60.0),
+                ),
+            )
+
+        if self.channels:
+            logger.info(f"Notification dispatcher configured for: {', '.join(self.channels)}")
+
+    def submit(self, alert: Dict[str, Any]) -> bool:
+        accepted = False
+        for channel in self.channels.values():
+            accepted = channel.submit(alert) or accepted
+        return accepted
+
+    def start(self):
+        for channel in self.channels.values():
+            channel.start()
+
+    def stop(self, timeout: float = 5.0):
+        for channel in self.channels.values():
+            channel.stop(timeout)
+        self.handler.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {name: channel.get_stats() for name, channel in self.channels.items()}
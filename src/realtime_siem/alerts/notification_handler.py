@@ -1,5 +1,10 @@
+import json
 import logging
-from typing import Dict, Any
+import smtplib
+import http.client
+from email.message import EmailMessage
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
@@ -10,38 +15,166 @@ class NotificationHandler:
         self.email_enabled = self.config.get('notifications.email.enabled', False)
         self.slack_enabled = self.config.get('notifications.slack.enabled', False)
         self.webhook_enabled = self.config.get('notifications.webhook.enabled', False)
-    
+        self.timeout = self.config.get('notifications.dispatcher.timeout_seconds', 5)
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._http_connections: Dict[Tuple[str, str, int], http.client.HTTPConnection] = {}
+
     def send_alert(self, alert: Dict[str, Any]) -> bool:
         try:
             sent = False
-            
+
             if self.email_enabled:
-                self._send_email(alert)
+                self._send_email([alert])
                 sent = True
-            
+
             if self.slack_enabled:
-                self._send_slack(alert)
+                self._send_slack([alert])
                 sent = True
-            
+
             if self.webhook_enabled:
-                self._send_webhook(alert)
+                self._send_webhook([alert])
                 sent = True
-            
+
             if sent:
                 logger.info(f"Alert notification sent: {alert.get('alert_id', 'unknown')}")
             else:
                 logger.debug(f"No notification channels enabled for alert: {alert.get('alert_id', 'unknown')}")
-            
+
             return sent
         except Exception as e:
             logger.error(f"Failed to send alert notification: {e}")
             return False
-    
-    def _send_email(self, alert: Dict[str, Any]):
-        logger.debug(f"Email notification: {alert.get('alert_id')} - {alert.get('severity')}")
-    
-    def _send_slack(self, alert: Dict[str, Any]):
-        logger.debug(f"Slack notification: {alert.get('alert_id')} - {alert.get('severity')}")
-    
-    def _send_webhook(self, alert: Dict[str, Any]):
-        logger.debug(f"Webhook notification: {alert.get('alert_id')} - {alert.get('severity')}")
+
+    def get_senders(self) -> Dict[str, Any]:
+        """Return the enabled channel senders, each taking a list of alerts"""
+        senders = {}
+        if self.email_enabled:
+            senders['email'] = self._send_email
+        if self.slack_enabled:
+            senders['slack'] = self._send_slack
+        if self.webhook_enabled:
+            senders['webhook'] = self._send_webhook
+        return senders
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+        for conn in self._http_connections.values():
+            conn.close()
+        self._http_connections.clear()
+
+    def _send_email(self, alerts: List[Dict[str, Any]]):
+        msg = EmailMessage()
+        msg['From'] = self.config.get('notifications.email.from', 'siem@localhost')
+        msg['To'] = self.config.get('notifications.email.to', 'security@localhost')
+        msg['Subject'] = self._subject(alerts)
+        msg.set_content('\n\n'.join(self._format_text(a) for a in alerts))
+
+        try:
+            self._get_smtp().send_message(msg)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            # The cached connection went stale; reconnect once and retry
+            self._smtp = None
+            self._get_smtp().send_message(msg)
+        logger.debug(f"Email notification sent with {len(alerts)} alert(s)")
+
+    def _send_slack(self, alerts: List[Dict[str, Any]]):
+        url = self.config.get('notifications.slack.webhook_url')
+        text = self._subject(alerts) + '\n' + '\n'.join(self._format_text(a) for a in alerts)
+        self._post_json(url, {'text': text})
+        logger.debug(f"Slack notification sent with {len(alerts)} alert(s)")
+
+    def _send_webhook(self, alerts: List[Dict[str, Any]]):
+        url = self.config.get('notifications.webhook.url')
+        self._post_json(url, {'alerts': [summarize_alert(a) for a in alerts]})
+        logger.debug(f"Webhook notification sent with {len(alerts)} alert(s)")
+
+    def _get_smtp(self) -> smtplib.SMTP:
+        if self._smtp is None:
+            server = self.config.get('notifications.email.smtp_server', 'localhost')
+            port = self.config.get('notifications.email.smtp_port', 25)
+            smtp = smtplib.SMTP(server, port, timeout=self.timeout)
+            if self.config.get('notifications.email.use_tls', port == 587):
+                smtp.starttls()
+            username = self.config.get('notifications.email.username')
+            if username:
+                smtp.login(username, self.config.get('notifications.email.password', ''))
+            self._smtp = smtp
+        return self._smtp
+
+    def _post_json(self, url: str, payload: Dict[str, Any]):
+        if not url:
+            raise ValueError("No URL configured for notification channel")
+
+        parsed = urlparse(url)
+        path = parsed.path or '/'
+        if parsed.query:
+            path += '?' + parsed.query
+        body = json.dumps(payload, default=str).encode()
+        headers = {'Content-Type': 'application/json'}
+
+        conn = self._get_http_connection(parsed.scheme, parsed.hostname, parsed.port)
+        try:
+            conn.request('POST', path, body=body, headers=headers)
+            response = conn.getresponse()
+        except (http.client.HTTPException, OSError):
+            # Keep-alive connection was closed by the peer; reconnect once
+            conn.close()
+            conn.request('POST', path, body=body, headers=headers)
+            response = conn.getresponse()
+        response.read()
+
+        if response.status >= 400:
+            raise RuntimeError(f"HTTP {response.status} from {parsed.hostname}")
+
+    def _get_http_connection(self, scheme: str, host: str, port: Optional[int]) -> http.client.HTTPConnection:
+        key = (scheme, host, port or 0)
+        conn = self._http_connections.get(key)
+        if conn is None:
+            if scheme == 'https':
+                conn = http.client.HTTPSConnection(host, port, timeout=self.timeout)
+            else:
+                conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+            self._http_connections[key] = conn
+        return conn
+
+    def _subject(self, alerts: List[Dict[str, Any]]) -> str:
+        if len(alerts) == 1:
+            alert = alerts[0]
+            return f"[SIEM] {str(alert.get('severity', 'medium')).upper()} alert {alert.get('alert_id', 'unknown')}"
+        return f"[SIEM] Digest of {len(alerts)} alerts"
+
+    def _format_text(self, alert: Dict[str, Any]) -> str:
+        summary = summarize_alert(alert)
+        lines = [f"{summary['alert_id']} [{str(summary['severity']).upper()}] {summary['threat']}"]
+        if summary.get('description'):
+            lines.append(f"  {summary['description']}")
+        for key in ('source_ip', 'user', 'hostname'):
+            if summary.get(key):
+                lines.append(f"  {key}: {summary[key]}")
+        return '\n'.join(lines)
+
+
+def summarize_alert(alert: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten an alert into a small serializable dict.
+
+    Alerts reference their event and the event references its threats, so the
+    raw alert cannot be serialized directly.
+    """
+    threat = alert.get('threat', {}) or {}
+    event = alert.get('event', {}) or {}
+    return {
+        'alert_id': alert.get('alert_id'),
+        'severity': alert.get('severity', 'medium'),
+        'timestamp': alert.get('timestamp'),
+        'threat': threat.get('type', threat.get('rule_name', 'unknown')),
+        'description': threat.get('description', threat.get('message', '')),
+        'source_ip': event.get('source_ip'),
+        'user': event.get('user'),
+        'hostname': event.get('hostname'),
+        'message': event.get('message'),
+    }
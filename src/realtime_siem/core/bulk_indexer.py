@@ -0,0 +1,198 @@
+import logging
+import threading
+import time
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from ..utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+# Bulk item statuses worth resending; anything else (mapping errors etc.) is permanent
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+def storable_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the event in a form that can be serialized.
+
+    Threats keep a reference back to their event, so they are stored without it.
+    """
+    if 'threats' in event:
+        event = dict(event)
+        event['threats'] = [
+            {k: v for k, v in threat.items() if k != 'event'}
+            for threat in event['threats']
+        ]
+    return event
+
+
+def serialize_event(event: Dict[str, Any]) -> str:
+    return json_codec.dumps(storable_event(event))
+
+
+class BulkIndexer:
+    """Buffers events and ships them to Elasticsearch through the _bulk API"""
+
+    def __init__(self, es, config=None, index_name: Optional[str] = None,
+                 on_failure: Optional[Callable[[List[str]], None]] = None):
+        self.es = es
+        self.on_failure = on_failure
+        self.config = config or {}
+        self.index_name = index_name or self.config.get('elasticsearch.index', 'siem-events')
+        self.batch_size = self.config.get('processing.batch_size', 100)
+        self.flush_interval = self.config.get('processing.flush_interval_seconds', 5)
+        self.max_buffer_size = self.config.get('elasticsearch.bulk.max_buffer_size', self.batch_size * 10)
+        self.max_retries = self.config.get('elasticsearch.bulk.max_retries', 3)
+        self.retry_backoff = self.config.get('elasticsearch.bulk.retry_backoff_seconds', 0.5)
+
+        self._buffer: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.indexed = 0
+        self.failed = 0
+        self.retried = 0
+        self.rejected = 0
+        self.spooled = 0
+        self.flushes = 0
+        self.bytes_sent = 0
+        self.flush_seconds = 0.0
+        self.started_at = time.time()
+
+    def add(self, event: Dict[str, Any], index: Optional[str] = None) -> bool:
+        """Buffer an event; returns False when the buffer is full"""
+        return self.add_serialized(serialize_event(event), index)
+
+    def add_serialized(self, doc: str, index: Optional[str] = None) -> bool:
+        # A rejected document stays the caller's: it may still spool it
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer_size:
+                self.rejected += 1
+                return False
+            self._buffer.append((index or self.index_name, doc))
+            size = len(self._buffer)
+
+        if size >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self.started_at = time.time()
+            self._thread = threading.Thread(target=self._run, name='bulk-indexer', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Bulk flush failed: {e}")
+
+    def flush(self) -> int:
+        """Send everything currently buffered; returns the number of indexed documents"""
+        with self._flush_lock:
+            indexed = 0
+            while True:
+                with self._lock:
+                    batch = self._buffer[:self.batch_size]
+                    del self._buffer[:self.batch_size]
+                if not batch:
+                    return indexed
+                indexed += self._send_with_retry(batch)
+
+    def _send_with_retry(self, batch: List[Tuple[str, str]]) -> int:
+        indexed = 0
+        delay = self.retry_backoff
+
+        for attempt in range(self.max_retries + 1):
+            ok, batch = self._send(batch)
+            indexed += ok
+            if not batch:
+                return indexed
+            if attempt == self.max_retries or self._stop.is_set():
+                break
+            self.retried += len(batch)
+            logger.warning(f"Retrying {len(batch)} rejected document(s) in {delay:.2f}s")
+            # Shutting down: stop retrying and hand the batch on right away
+            if self._stop.wait(delay):
+                break
+            delay *= 2
+
+        if self.on_failure:
+            logger.warning(f"Handing {len(batch)} document(s) to failure handler after {attempt} retries")
+            self.on_failure([doc for _, doc in batch])
+            self.spooled += len(batch)
+        else:
+            self.failed += len(batch)
+            logger.error(f"Giving up on {len(batch)} document(s) after {attempt} retries")
+        return indexed
+
+    def _send(self, batch: List[Tuple[str, str]]) -> Tuple[int, List[Tuple[str, str]]]:
+        """Send one _bulk request; returns (indexed count, documents to retry)"""
+        lines = []
+        for index, doc in batch:
+            lines.append(json_codec.dumps({'index': {'_index': index}}))
+            lines.append(doc)
+        body = '\n'.join(lines) + '\n'
+
+        start = time.perf_counter()
+        try:
+            response = self.es.bulk(body=body)
+        except Exception as e:
+            logger.warning(f"Bulk request failed: {e}")
+            return 0, batch
+        finally:
+            self.flush_seconds += time.perf_counter() - start
+            self.flushes += 1
+            self.bytes_sent += len(body)
+
+        if not response.get('errors'):
+            self.indexed += len(batch)
+            return len(batch), []
+
+        retry = []
+        ok = 0
+        for item, doc in zip(response.get('items', []), batch):
+            result = next(iter(item.values()))
+            status = result.get('status', 500)
+            if status < 300:
+                ok += 1
+            elif status in RETRYABLE_STATUSES:
+                retry.append(doc)
+            else:
+                self.failed += 1
+                logger.error(f"Document rejected by Elasticsearch ({status}): {result.get('error')}")
+
+        self.indexed += ok
+        return ok, retry
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            buffered = len(self._buffer)
+        elapsed = max(time.time() - self.started_at, 1e-9)
+        return {
+            'buffered': buffered,
+            'indexed': self.indexed,
+            'failed': self.failed,
+            'retried': self.retried,
+            'rejected': self.rejected,
+            'spooled': self.spooled,
+            'flushes': self.flushes,
+            'bytes_sent': self.bytes_sent,
+            'docs_per_second': round(self.indexed / elapsed, 2),
+            'bulk_docs_per_second': round(self.indexed / self.flush_seconds, 2) if self.flush_seconds else 0.0,
+        }
@@ -1,4 +1,5 @@
 import logging
+import time
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 from collections import defaultdict
@@ -32,12 +33,12 @@ class CorrelationEngine:
         correlations = []
         ip_events = defaultdict(list)
         
-        cutoff_time = datetime.utcnow() - self.correlation_window
+        now = time.time()
+        cutoff_time = now - self.correlation_window.total_seconds()
         
         for event in self.event_history:
             if 'source_ip' in event:
-                event_time = self._parse_timestamp(event.get('timestamp'))
-                if event_time and event_time > cutoff_time:
+                if event.get('epoch', now) > cutoff_time:
                     ip_events[event['source_ip']].append(event)
         
         for ip, events in ip_events.items():
@@ -57,12 +58,12 @@ class CorrelationEngine:
         correlations = []
         user_events = defaultdict(list)
         
-        cutoff_time = datetime.utcnow() - self.correlation_window
+        now = time.time()
+        cutoff_time = now - self.correlation_window.total_seconds()
         
         for event in self.event_history:
             if 'user' in event:
-                event_time = self._parse_timestamp(event.get('timestamp'))
-                if event_time and event_time > cutoff_time:
+                if event.get('epoch', now) > cutoff_time:
                     user_events[event['user']].append(event)
         
         for user, events in user_events.items():
@@ -92,17 +93,6 @@ class CorrelationEngine:
         
         return correlations
     
-    def _parse_timestamp(self, timestamp_str: str) -> datetime:
-        try:
-            if isinstance(timestamp_str, str):
-                dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-                if dt.tzinfo is not None:
-                    dt = dt.replace(tzinfo=None)
-                return dt
-            return datetime.utcnow()
-        except Exception:
-            return datetime.utcnow()
-    
     def clear_history(self):
         self.event_history.clear()
         logger.info("Correlation engine history cleared")
@@ -2,6 +2,8 @@ import logging
 from typing import Dict, Any
 from datetime import datetime
 
+from .timestamps import TimestampNormalizer
+
 logger = logging.getLogger(__name__)
 
 
@@ -9,12 +11,13 @@ class EventProcessor:
     def __init__(self, config=None):
         self.config = config
         self.processed_count = 0
+        self.timestamps = TimestampNormalizer(config)
     
     def process(self, event: Dict[str, Any]) -> Dict[str, Any]:
         self.processed_count += 1
         
-        if 'timestamp' not in event:
-            event['timestamp'] = datetime.utcnow().isoformat()
+        # Every later stage reads event['epoch'] instead of parsing timestamps again
+        self.timestamps.normalize(event)
         
         if 'event_id' not in event:
             event['event_id'] = f"evt_{self.processed_count}_{int(datetime.utcnow().timestamp())}"
@@ -0,0 +1,75 @@
+import logging
+import threading
+import time
+from typing import Dict, Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Probes dependencies on a background thread and caches the results.
+
+    Readers only ever see the cached status, so checking health never waits
+    on the network.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or {}
+        self.interval = self.config.get('health.probe_interval_seconds', 10)
+        self._probes: Dict[str, Callable[[], bool]] = {}
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, probe: Callable[[], bool]):
+        self._probes[name] = probe
+        self._status[name] = {'healthy': False, 'latency_ms': None, 'checked_at': None, 'error': 'not checked'}
+
+    def check(self, name: Optional[str] = None):
+        """Run one probe (or all of them) now and update the cache"""
+        names = [name] if name else list(self._probes)
+        for probe_name in names:
+            probe = self._probes[probe_name]
+            start = time.perf_counter()
+            error = None
+            try:
+                healthy = bool(probe())
+            except Exception as e:
+                healthy = False
+                error = str(e)
+            latency = (time.perf_counter() - start) * 1000
+
+            previous = self._status.get(probe_name, {})
+            if previous.get('healthy') != healthy and previous.get('checked_at') is not None:
+                logger.warning(f"{probe_name} is now {'healthy' if healthy else 'unhealthy'}")
+
+            # Swap in a new dict rather than mutating so readers never see a partial update
+            self._status[probe_name] = {
+                'healthy': healthy,
+                'latency_ms': round(latency, 2),
+                'checked_at': time.time(),
+                'error': error,
+            }
+
+    def is_healthy(self, name: str) -> bool:
+        status = self._status.get(name)
+        return bool(status and status['healthy'])
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='health-monitor', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self._status)
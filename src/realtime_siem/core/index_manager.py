@@ -0,0 +1,241 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+from ..utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+KEYWORD = {'type': 'keyword', 'ignore_above': 1024}
+IP = {'type': 'ip', 'ignore_malformed': True}
+DATE = {'type': 'date', 'ignore_malformed': True}
+
+# Explicit mappings for the normalized event fields. Anything else is kept in
+# _source but not indexed (dynamic: false), so new source fields never trigger
+# mapping updates.
+EVENT_MAPPINGS = {
+    'dynamic': False,
+    'properties': {
+        'timestamp': DATE,
+        'processed_at': DATE,
+        'event_id': KEYWORD,
+        'type': KEYWORD,
+        'format': KEYWORD,
+        'event_type': KEYWORD,
+        'action': KEYWORD,
+        'status': KEYWORD,
+        'user': KEYWORD,
+        'hostname': KEYWORD,
+        'process': KEYWORD,
+        'appname': KEYWORD,
+        'pid': KEYWORD,
+        'source_ip': IP,
+        'destination_ip': IP,
+        'ip_type': KEYWORD,
+        'privileged_user': {'type': 'boolean'},
+        'priority': {'type': 'integer'},
+        'facility': {'type': 'integer'},
+        'severity': {'type': 'integer', 'ignore_malformed': True},
+        'failed_logins': {'type': 'integer', 'ignore_malformed': True},
+        'bytes_sent': {'type': 'long', 'ignore_malformed': True},
+        'bytes_received': {'type': 'long', 'ignore_malformed': True},
+        'parse_status': KEYWORD,
+        'message': {'type': 'text'},
+        'raw_message': {'type': 'keyword', 'index': False, 'doc_values': False},
+        'threats': {
+            'properties': {
+                'type': KEYWORD,
+                'rule_name': KEYWORD,
+                'severity': KEYWORD,
+                'description': {'type': 'text'},
+            }
+        },
+    },
+}
+
+
+class IndexManager:
+    """Time-partitioned index naming, index template installation and retention.
+
+    With the 'daily' strategy each event goes to <prefix>-YYYY.MM.DD based on
+    its own timestamp. With 'rollover' events are written to the <prefix>
+    alias and Elasticsearch rolls the backing index over by size, document
+    count or age. Retention deletes whole indices instead of running
+    delete-by-query.
+    """
+
+    def __init__(self, es, config=None):
+        self.es = es
+        self.config = config or {}
+        get = self.config.get
+        self.prefix = get('elasticsearch.index', 'siem-events')
+        self.strategy = get('elasticsearch.index_management.strategy', 'daily')
+        self.template_name = get('elasticsearch.index_management.template_name', self.prefix)
+        self.retention_days = get('elasticsearch.index_management.retention_days', 30)
+        self.rollover_conditions = {
+            'max_size': get('elasticsearch.index_management.rollover_max_size', '50gb'),
+            'max_docs': get('elasticsearch.index_management.rollover_max_docs', 50000000),
+            'max_age': get('elasticsearch.index_management.rollover_max_age', '1d'),
+        }
+        self.maintenance_interval = get('elasticsearch.index_management.maintenance_interval_seconds', 3600)
+
+        self._day_cache: Dict[str, str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.deleted_indices: List[str] = []
+        self.rollovers = 0
+        # Why setup could not finish; rollover is skipped while this is set
+        self.setup_error: Optional[str] = None
+
+    def index_for(self, event: Dict[str, Any]) -> str:
+        if self.strategy != 'daily':
+            return self.prefix
+
+        timestamp = event.get('timestamp')
+        day = timestamp[:10] if isinstance(timestamp, str) else ''
+        index = self._day_cache.get(day)
+        if index is None:
+            try:
+                date = datetime.strptime(day, '%Y-%m-%d')
+            except ValueError:
+                # Not an ISO date (e.g. a raw syslog timestamp): file it under today
+                return f"{self.prefix}-{datetime.utcnow():%Y.%m.%d}"
+            index = f"{self.prefix}-{date:%Y.%m.%d}"
+            if len(self._day_cache) > 1000:
+                self._day_cache.clear()
+            self._day_cache[day] = index
+        return index
+
+    def index_for_document(self, doc: str) -> str:
+        if self.strategy != 'daily':
+            return self.prefix
+        try:
+            return self.index_for(json_codec.loads(doc))
+        except ValueError:
+            return self.index_for({})
+
+    def setup(self):
+        """Install the index template and, for rollover, bootstrap the write alias"""
+        try:
+            self.install_template()
+            if self.strategy == 'rollover':
+                self._bootstrap_rollover()
+        except Exception as e:
+            self.setup_error = str(e)
+            logger.error(f"Index setup failed: {e}")
+
+    def install_template(self):
+        body = {
+            'index_patterns': [self.prefix, f"{self.prefix}-*"],
+            'settings': {
+                'number_of_shards': self.config.get('elasticsearch.index_management.number_of_shards', 1),
+                'number_of_replicas': self.config.get('elasticsearch.index_management.number_of_replicas', 1),
+                'refresh_interval': self.config.get('elasticsearch.index_management.refresh_interval', '5s'),
+            },
+            'mappings': EVENT_MAPPINGS,
+        }
+        self.es.indices.put_template(name=self.template_name, body=body)
+        logger.info(f"Installed index template {self.template_name} for {self.prefix}")
+
+    def _bootstrap_rollover(self):
+        if self.es.indices.exists_alias(name=self.prefix):
+            return
+        first_index = f"{self.prefix}-000001"
+        if self.es.indices.exists(index=self.prefix):
+            # Single-index layout from before rollover: events keep going to it, but nothing rolls over
+            self.setup_error = (f"{self.prefix} is a plain index, not a write alias; rollover is disabled. "
+                                f"To migrate, reindex {self.prefix} into {first_index}, delete {self.prefix} "
+                                f"and restart so the alias can be created")
+            logger.error(self.setup_error)
+            return
+        # Body fields as keyword arguments need elasticsearch-py 7.15+ (the declared minimum)
+        self.es.indices.create(index=first_index, aliases={self.prefix: {'is_write_index': True}})
+        logger.info(f"Created {first_index} behind write alias {self.prefix}")
+
+    def maybe_rollover(self) -> bool:
+        if self.strategy != 'rollover' or self.setup_error:
+            return False
+        response = self.es.indices.rollover(alias=self.prefix, body={'conditions': self.rollover_conditions})
+        if response.get('rolled_over'):
+            self.rollovers += 1
+            logger.info(f"Rolled {self.prefix} over to {response.get('new_index')}")
+            return True
+        return False
+
+    def apply_retention(self, now: Optional[datetime] = None) -> List[str]:
+        """Delete indices older than retention_days; returns the deleted names"""
+        if not self.retention_days:
+            return []
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(days=self.retention_days)
+        settings = self.es.indices.get_settings(index=f"{self.prefix}-*", name='index.creation_date')
+
+        expired = []
+        for index, data in settings.items():
+            created = self._index_date(index, data)
+            if created is not None and created < cutoff:
+                expired.append(index)
+
+        if self.strategy == 'rollover' and expired:
+            # Never drop the index currently receiving writes
+            current = self._write_index()
+            expired = [index for index in expired if index != current]
+
+        for index in sorted(expired):
+            self.es.indices.delete(index=index)
+            self.deleted_indices.append(index)
+            logger.info(f"Deleted index {index} (older than {self.retention_days} days)")
+        return expired
+
+    def _index_date(self, index: str, data: Dict[str, Any]) -> Optional[datetime]:
+        if self.strategy == 'daily':
+            try:
+                return datetime.strptime(index[len(self.prefix) + 1:], '%Y.%m.%d') + timedelta(days=1)
+            except ValueError:
+                pass
+        try:
+            created_ms = int(data['settings']['index']['creation_date'])
+            return datetime.utcfromtimestamp(created_ms / 1000)
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _write_index(self) -> Optional[str]:
+        aliases = self.es.indices.get_alias(name=self.prefix)
+        for index, data in aliases.items():
+            if data.get('aliases', {}).get(self.prefix, {}).get('is_write_index'):
+                return index
+        return None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='index-manager', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        # One pass right away, then every maintenance_interval
+        while True:
+            try:
+                self.maybe_rollover()
+                self.apply_retention()
+            except Exception as e:
+                logger.error(f"Index maintenance failed: {e}")
+            if self._stop.wait(self.maintenance_interval):
+                return
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'strategy': self.strategy,
+            'template': self.template_name,
+            'retention_days': self.retention_days,
+            'rollovers': self.rollovers,
+            'deleted_indices': len(self.deleted_indices),
+            'setup_error': self.setup_error,
+        }
@@ -0,0 +1,196 @@
+import logging
+import threading
+from bisect import bisect_left
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds; pipeline stages run from microseconds (parsing) to tens of milliseconds (indexing)
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+                   0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _ThreadCells:
+    """One cell per writing thread, so recording never takes a lock.
+
+    Only the owning thread writes a cell; readers sum all cells, which may
+    miss an in-flight update but never loses one.
+    """
+
+    def __init__(self, width: int):
+        self._width = width
+        self._cells: Dict[int, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def cell(self) -> List[float]:
+        ident = threading.get_ident()
+        cell = self._cells.get(ident)
+        if cell is None:
+            # First write from this thread
+            cell = [0] * self._width
+            with self._lock:
+                self._cells[ident] = cell
+        return cell
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            cells = list(self._cells.values())
+        return [sum(column) for column in zip(*cells)] if cells else [0] * self._width
+
+
+class Counter:
+    __slots__ = ('_cells',)
+
+    def __init__(self):
+        self._cells = _ThreadCells(1)
+
+    def inc(self, amount: float = 1):
+        self._cells.cell()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+
+class Gauge:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value: float):
+        self.value = value
+
+
+class Histogram:
+    """Fixed-bucket histogram; each thread counts into its own cell"""
+
+    __slots__ = ('bounds', '_cells')
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        # One count per bound, one for +Inf, then the running sum
+        self._cells = _ThreadCells(len(self.bounds) + 2)
+
+    def observe(self, value: float):
+        cell = self._cells.cell()
+        cell[bisect_left(self.bounds, value)] += 1
+        cell[-1] += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        """Cumulative bucket counts (the last is the total) and the sum"""
+        totals = self._cells.totals()
+        cumulative, running = [], 0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, totals[-1]
+
+
+class _Family:
+    __slots__ = ('name', 'kind', 'help', 'children', 'collect', 'label')
+
+    def __init__(self, name: str, kind: str, help_text: str, collect: Optional[Callable] = None,
+                 label: Optional[str] = None):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.children: Dict[LabelKey, Any] = {}
+        self.collect = collect
+        self.label = label
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value: float) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """Counters, gauges and latency histograms rendered in Prometheus text format.
+
+    Components look metrics up once and keep the object; ``inc``, ``set`` and
+    ``observe`` are plain attribute updates with no locking. Values that
+    already live on a component (queue depths, drop counts) are registered
+    as callbacks and read only when /metrics is scraped.
+    """
+
+    def __init__(self, config=None):
+        get = (config or {}).get
+        self.latency_buckets = tuple(get('metrics.latency_buckets', LATENCY_BUCKETS))
+        self._families: Dict[str, _Family] = {}
+        self._lock = threading.Lock()
+
+    def _child(self, name: str, kind: str, help_text: str, labels: Dict[str, str], factory: Callable):
+        key: LabelKey = tuple(sorted(labels.items()))
+        family = self._families.get(name)
+        if family is not None and family.kind == kind:
+            child = family.children.get(key)
+            if child is not None:
+                return child
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = _Family(name, kind, help_text)
+            elif family.kind != kind:
+                raise ValueError(f"Metric {name} is already registered as a {family.kind}")
+            return family.children.setdefault(key, factory())
+
+    def counter(self, name: str, help_text: str = '', **labels) -> Counter:
+        return self._child(name, 'counter', help_text, labels, Counter)
+
+    def gauge(self, name: str, help_text: str = '', **labels) -> Gauge:
+        return self._child(name, 'gauge', help_text, labels, Gauge)
+
+    def histogram(self, name: str, help_text: str = '', buckets: Optional[Sequence[float]] = None,
+                  **labels) -> Histogram:
+        return self._child(name, 'histogram', help_text, labels,
+                           lambda: Histogram(buckets or self.latency_buckets))
+
+    def register_callback(self, name: str, kind: str, help_text: str, label: str,
+                          collect: Callable[[], Dict[str, float]]):
+        """Expose values computed at scrape time, one sample per key of collect()"""
+        with self._lock:
+            self._families[name] = _Family(name, kind, help_text, collect, label)
+
+    def render(self) -> str:
+        with self._lock:
+            families = sorted(self._families.values(), key=lambda f: f.name)
+        lines = []
+        for family in families:
+            if family.collect is not None:
+                try:
+                    samples = family.collect()
+                except Exception as e:
+                    logger.error(f"Metrics callback {family.name} failed: {e}")
+                    continue
+                children = {((family.label, key),): value for key, value in samples.items()}
+            else:
+                children = dict(family.children)
+            lines.append(f'# HELP {family.name} {family.help}')
+            lines.append(f'# TYPE {family.name} {family.kind}')
+            for key, child in sorted(children.items()):
+                if family.kind == 'histogram':
+                    cumulative, total = child.snapshot()
+                    for bound, count in zip(child.bounds, cumulative):
+                        lines.append(f'{family.name}_bucket{_labels(key, ("le", _number(float(bound))))} {count}')
+                    lines.append(f'{family.name}_bucket{_labels(key, ("le", "+Inf"))} {cumulative[-1]}')
+                    lines.append(f'{family.name}_sum{_labels(key)} {_number(total)}')
+                    lines.append(f'{family.name}_count{_labels(key)} {cumulative[-1]}')
+                else:
+                    value = child if family.collect is not None else child.value
+                    lines.append(f'{family.name}{_labels(key)} {_number(value)}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,136 @@
+import logging
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OTHER_SOURCES = '(other)'
+
+# name -> (bucket width in seconds, config key for the number of buckets, default count)
+RESOLUTIONS = {
+    'second': (1, 'rollups.seconds', 300),
+    'minute': (60, 'rollups.minutes', 1440),
+    'hour': (3600, 'rollups.hours', 168),
+}
+
+
+class _Ring:
+    """Fixed number of time buckets for one resolution, reused as time moves on"""
+
+    __slots__ = ('step', 'size', 'buckets', 'events', 'severities', 'rules', 'sources')
+
+    def __init__(self, step: int, size: int):
+        self.step = step
+        self.size = size
+        # Bucket number (epoch // step) held by each slot; -1 when unused
+        self.buckets = [-1] * size
+        self.events = [0] * size
+        self.severities: List[Dict[str, int]] = [{} for _ in range(size)]
+        self.rules: List[Dict[str, int]] = [{} for _ in range(size)]
+        self.sources: List[Dict[str, int]] = [{} for _ in range(size)]
+
+    def slot(self, now: float) -> int:
+        bucket = int(now // self.step)
+        index = bucket % self.size
+        if self.buckets[index] != bucket:
+            # The slot still holds a bucket from one lap ago
+            self.buckets[index] = bucket
+            self.events[index] = 0
+            self.severities[index] = {}
+            self.rules[index] = {}
+            self.sources[index] = {}
+        return index
+
+
+class TimeSeriesRollups:
+    """Pre-aggregated event and alert counts for dashboard charts.
+
+    Keeps per-second, per-minute and per-hour ring buffers of event counts,
+    alerts by severity, alerts by rule and events by source IP. Recording an
+    event touches one slot per resolution, so the cost does not depend on
+    history; a chart reads the arrays instead of scanning alerts. Buckets
+    are keyed by ingest time.
+    """
+
+    def __init__(self, config=None):
+        get = (config or {}).get
+        self.max_sources = get('rollups.max_sources_per_bucket', 1000)
+        self.top_sources = get('rollups.top_sources', 10)
+        self._rings = {name: _Ring(step, get(key, default)) for name, (step, key, default) in RESOLUTIONS.items()}
+        self._lock = threading.Lock()
+        self.events_recorded = 0
+        self.alerts_recorded = 0
+
+    def record(self, event: Dict[str, Any], threats: Optional[List[Dict[str, Any]]] = None,
+               now: Optional[float] = None):
+        """Count one processed event and the threats raised for it"""
+        now = time.time() if now is None else now
+        source_ip = event.get('source_ip')
+        threats = threats or ()
+        with self._lock:
+            self.events_recorded += 1
+            self.alerts_recorded += len(threats)
+            for ring in self._rings.values():
+                index = ring.slot(now)
+                ring.events[index] += 1
+                if source_ip:
+                    sources = ring.sources[index]
+                    if source_ip in sources or len(sources) < self.max_sources:
+                        sources[source_ip] = sources.get(source_ip, 0) + 1
+                    else:
+                        sources[OTHER_SOURCES] = sources.get(OTHER_SOURCES, 0) + 1
+                for threat in threats:
+                    severities = ring.severities[index]
+                    severity = threat.get('severity', 'medium')
+                    severities[severity] = severities.get(severity, 0) + 1
+                    rules = ring.rules[index]
+                    rule = threat.get('rule_name') or threat.get('type', 'unknown')
+                    rules[rule] = rules.get(rule, 0) + 1
+
+    def series(self, resolution: str = 'minute', points: Optional[int] = None,
+               now: Optional[float] = None) -> Dict[str, Any]:
+        """The last ``points`` buckets of a resolution as parallel arrays, oldest first"""
+        ring = self._rings.get(resolution)
+        if ring is None:
+            raise ValueError(f"Unknown resolution '{resolution}', expected one of {', '.join(RESOLUTIONS)}")
+        points = ring.size if points is None else min(max(points, 1), ring.size)
+        now = time.time() if now is None else now
+        last = int(now // ring.step)
+        first = last - points + 1
+
+        events = [0] * points
+        severities: Dict[str, List[int]] = {}
+        rules: Dict[str, List[int]] = {}
+        sources: Dict[str, int] = {}
+        with self._lock:
+            for offset in range(points):
+                index = (first + offset) % ring.size
+                if ring.buckets[index] != first + offset:
+                    continue
+                events[offset] = ring.events[index]
+                for severity, count in ring.severities[index].items():
+                    severities.setdefault(severity, [0] * points)[offset] = count
+                for rule, count in ring.rules[index].items():
+                    rules.setdefault(rule, [0] * points)[offset] = count
+                for source_ip, count in ring.sources[index].items():
+                    sources[source_ip] = sources.get(source_ip, 0) + count
+
+        top = sorted(sources.items(), key=lambda item: item[1], reverse=True)[:self.top_sources]
+        return {
+            'resolution': resolution,
+            'step_seconds': ring.step,
+            'start': first * ring.step,
+            'points': points,
+            'events': events,
+            'alerts_by_severity': severities,
+            'alerts_by_rule': rules,
+            'top_sources': [{'source_ip': ip, 'events': count} for ip, count in top],
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'events_recorded': self.events_recorded,
+            'alerts_recorded': self.alerts_recorded,
+            'buckets': {name: ring.size for name, ring in self._rings.items()},
+        }
@@ -1,12 +1,28 @@
 import logging
-from typing import Dict, Any, Optional, List
+from time import perf_counter
+from typing import Dict, Any, Iterable, Optional, List
 from elasticsearch import Elasticsearch
 from ..config.config_manager import ConfigManager
-from ..parsers.log_parser import LogParser, SyslogParser, JSONParser
+from ..parsers.router import ParserRouter
+from ..utils import json_codec
 from .event_processor import EventProcessor
 from .correlation_engine import CorrelationEngine
+from .bulk_indexer import BulkIndexer, serialize_event
+from .spool import DiskSpool, SpoolReplayer
+from .health_monitor import HealthMonitor
+from .index_manager import IndexManager
+from .rollups import TimeSeriesRollups
+from .metrics import MetricsRegistry
+from .tracing import Tracer
 from ..detection.threat_detector import ThreatDetector
 from ..alerts.alert_manager import AlertManager
+from ..alerts.notification_dispatcher import NotificationDispatcher
+from ..storage.event_store import EventStore
+from ..dashboard.snapshot import SnapshotPublisher
+from ..ingest.pipeline import IngestPipeline
+from ..ingest.syslog import SyslogServer
+from ..ingest.http import HTTPIngestServer
+from ..ingest.tailer import FileTailer
 
 logger = logging.getLogger(__name__)
 
@@ -15,24 +31,99 @@ class SIEMCore:
     def __init__(self, config: Optional[ConfigManager] = None):
         self.config = config or ConfigManager()
         self.es: Optional[Elasticsearch] = None
+        self.indexer: Optional[BulkIndexer] = None
+        self.index_manager: Optional[IndexManager] = None
+        self.index_name = self.config.get('elasticsearch.index', 'siem-events')
         self.parsers: Dict[str, Any] = {}
+        self.metrics = MetricsRegistry(self.config)
+        self.tracer = Tracer(self.config)
         self.event_processor = EventProcessor(self.config)
         self.correlation_engine = CorrelationEngine(self.config)
-        self.threat_detector = ThreatDetector(self.config)
+        self.threat_detector = ThreatDetector(self.config, self.metrics)
         self.alert_manager = AlertManager(self.config)
+        self.notifier = NotificationDispatcher(self.config)
+        self.rollups = TimeSeriesRollups(self.config)
+        self.dashboard = SnapshotPublisher(self.alert_manager, self._dashboard_stats, self.config, self.rollups,
+                                           self.metrics, self.tracer, full_stats_source=self.get_stats)
+        self.health = HealthMonitor(self.config)
+        self.health.register('elasticsearch', self._probe_elasticsearch)
+        self.spool: Optional[DiskSpool] = None
+        # Events the indexer could not take: spooled, or lost when there is no spool
+        self.index_spooled = 0
+        self.index_dropped = 0
+        self.spool_replayer: Optional[SpoolReplayer] = None
+        self.event_store: Optional[EventStore] = None
+        self.ingest = IngestPipeline(self.process_log, self.config)
+        self.syslog: Optional[SyslogServer] = None
+        self.http_ingest: Optional[HTTPIngestServer] = None
+        self.tailer: Optional[FileTailer] = None
         self.is_running = False
+
+        if self.config.get('spool.enabled', False):
+            self.spool = DiskSpool(self.config)
+            self.spool_replayer = SpoolReplayer(
+                self.spool, self._replay_document,
+                lambda: self.health.is_healthy('elasticsearch'), self.config
+            )
+        if self.config.get('storage.enabled', False):
+            self.event_store = EventStore(self.config)
+        if self.config.get('ingest.syslog.enabled', False):
+            self.syslog = SyslogServer(self.ingest, self.config)
+        if self.config.get('ingest.http.enabled', False):
+            self.http_ingest = HTTPIngestServer(self.ingest, self.config)
+        if self.config.get('tailer.enabled', False):
+            self.tailer = FileTailer(self.ingest_file_lines, self.config)
         
         self._initialize_parsers()
+        self._initialize_metrics()
         logger.info("SIEM Core initialized")
 
     def _initialize_parsers(self):
-        self.parsers = {
-            'syslog': SyslogParser(self.config),
-            'json': JSONParser(self.config),
-            'default': LogParser(self.config)
-        }
+        json_codec.use_backend(self.config.get('processing.json_backend', 'auto'))
+        self.router = ParserRouter(self.config)
+        self.parsers = self.router.parsers
         logger.debug(f"Initialized {len(self.parsers)} parsers")
 
+    def _initialize_metrics(self):
+        stage = 'Time spent per pipeline stage'
+        self._parse_seconds = self.metrics.histogram('siem_stage_seconds', stage, stage='parse')
+        self._enrich_seconds = self.metrics.histogram('siem_stage_seconds', stage, stage='enrich')
+        self._alert_seconds = self.metrics.histogram('siem_stage_seconds', stage, stage='alert')
+        self._index_seconds = self.metrics.histogram('siem_stage_seconds', stage, stage='index')
+        self._events_total = self.metrics.counter('siem_events_total', 'Log lines processed')
+        self._event_errors_total = self.metrics.counter('siem_event_errors_total', 'Log lines that failed processing')
+        self.metrics.register_callback('siem_queue_depth', 'gauge', 'Items waiting in internal queues',
+                                       'queue', self._queue_depths)
+        self.metrics.register_callback('siem_spooled_total', 'counter', 'Events written to the disk spool instead of indexed',
+                                       'component', self._spool_counts)
+        self.metrics.register_callback('siem_dropped_total', 'counter', 'Items dropped because a queue was full',
+                                       'component', self._drop_counts)
+
+    def _queue_depths(self) -> Dict[str, int]:
+        depths = {f'notify_{name}': channel.queue.qsize() for name, channel in self.notifier.channels.items()}
+        depths['ingest_batches'] = self.ingest.queue.qsize()
+        if self.indexer:
+            depths['indexer'] = self.indexer.get_stats()['buffered']
+        if self.spool:
+            depths['spool'] = self.spool.get_stats()['pending_events']
+        if self.event_store:
+            depths['event_store'] = self.event_store.get_stats()['buffered_events']
+        return depths
+
+    def _spool_counts(self) -> Dict[str, int]:
+        # Buffer full or no connection, plus batches the indexer gave up retrying
+        return {'indexer': self.index_spooled + (self.indexer.spooled if self.indexer else 0)}
+
+    def _drop_counts(self) -> Dict[str, int]:
+        drops = {f'notify_{name}': channel.dropped for name, channel in self.notifier.channels.items()}
+        if self.syslog:
+            drops['syslog_udp'] = self.syslog.udp_dropped
+        if self.indexer:
+            drops['indexer'] = self.index_dropped
+        if self.spool:
+            drops['spool'] = self.spool.dropped_events
+        return drops
+
     def connect_to_elasticsearch(self):
         try:
             es_host = self.config.get('elasticsearch.host', 'localhost')
@@ -45,6 +136,19 @@ class SIEMCore:
             
             if self.es.ping():
                 logger.info(f"Connected to Elasticsearch at {es_host}:{es_port}")
+                if self.indexer is None:
+                    self.index_manager = IndexManager(self.es, self.config)
+                    self.index_manager.setup()
+                    self.indexer = BulkIndexer(
+                        self.es, self.config, self.index_name,
+                        on_failure=self.spool.append_many if self.spool else None
+                    )
+                    if self.is_running:
+                        self.indexer.start()
+                        self.index_manager.start()
+                else:
+                    self.indexer.es = self.es
+                    self.index_manager.es = self.es
             else:
                 logger.error("Elasticsearch connection failed")
                 self.es = None
@@ -52,50 +156,195 @@ class SIEMCore:
             logger.error(f"Failed to connect to Elasticsearch: {e}")
             self.es = None
 
-    def process_log(self, log_line: str, log_type: str = 'default') -> Optional[Dict[str, Any]]:
+    def process_log(self, log_line: str, log_type: str = 'default',
+                    source: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Process one raw line; log_type 'auto' detects the format, cached per source"""
+        start = perf_counter()
         try:
-            parser = self.parsers.get(log_type, self.parsers['default'])
-            parsed_event = parser.parse(log_line)
-            
+            if log_type == 'auto':
+                parsed_event = self.router.parse(log_line, source)
+            else:
+                parsed_event = self.parsers.get(log_type, self.parsers['default']).parse(log_line)
+        except Exception as e:
+            return self._failed(log_line, log_type, start, e)
+        return self._process(parsed_event, log_line, log_type, start)
+
+    def process_event(self, event: Dict[str, Any], log_type: str = 'event') -> Optional[Dict[str, Any]]:
+        """Process an already structured event, skipping serialization and parsing.
+
+        The dict is enriched in place and kept by alerts and the event
+        store, so producers should pass a fresh dict per event. Its own
+        'type' is kept; events without one are tagged log_type, as parsers
+        tag every event they produce.
+        """
+        start = perf_counter()
+        if 'type' not in event:
+            event['type'] = log_type
+        return self._process(event, event, log_type, start)
+
+    def process_events(self, events: Iterable[Dict[str, Any]], log_type: str = 'event') -> int:
+        """Process structured events in order; returns how many succeeded"""
+        process = self.process_event
+        processed = 0
+        for event in events:
+            if process(event, log_type) is not None:
+                processed += 1
+        return processed
+
+    def _process(self, parsed_event: Dict[str, Any], raw: Any, log_type: str,
+                 start: float) -> Optional[Dict[str, Any]]:
+        """Enrichment, detection, alerting and storage of a parsed event; raw is what the tracer shows"""
+        try:
+            parsed = perf_counter()
             processed_event = self.event_processor.process(parsed_event)
-            
+            enriched = perf_counter()
+
+            # Rules and anomaly stages are timed inside the detector
             threats = self.threat_detector.detect(processed_event)
-            
+            detected = perf_counter()
+
             if threats:
                 processed_event['threats'] = threats
                 for threat in threats:
-                    self.alert_manager.create_alert(threat, processed_event)
-            
-            if self.es:
+                    alert = self.alert_manager.create_alert(threat, processed_event)
+                    self.notifier.submit(alert)
+                    self.metrics.counter('siem_alerts_total', 'Alerts raised', severity=alert['severity']).inc()
+            self.rollups.record(processed_event, threats)
+            alerted = perf_counter()
+
+            if self.event_store:
+                self.event_store.append(processed_event)
+
+            if self.indexer or self.spool:
                 self._index_event(processed_event)
-            
+
+            indexed = perf_counter()
+            self._parse_seconds.observe(parsed - start)
+            self._enrich_seconds.observe(enriched - parsed)
+            self._alert_seconds.observe(alerted - detected)
+            self._index_seconds.observe(indexed - alerted)
+            self._events_total.inc()
+            if self.tracer.enabled:
+                self.tracer.record(raw, log_type, (start, parsed, enriched, detected, alerted, indexed))
             return processed_event
         except Exception as e:
-            logger.error(f"Error processing log: {e}")
-            return None
+            return self._failed(raw, log_type, start, e)
+
+    def _failed(self, raw: Any, log_type: str, start: float, error: Exception) -> None:
+        self._event_errors_total.inc()
+        if self.tracer.enabled:
+            self.tracer.record_error(raw, log_type, start, error)
+        logger.error(f"Error processing log: {error}")
+        return None
+
+    def ingest_file_lines(self, lines: List[str], path: str):
+        """Queue lines read by the file tailer, waiting for room so no line is lost"""
+        self.ingest.put(lines, self.config.get('tailer.log_type', 'auto'), source=path)
 
     def _index_event(self, event: Dict[str, Any]):
         try:
-            index_name = self.config.get('elasticsearch.index', 'siem-events')
-            self.es.index(index=index_name, document=event)
+            if self.indexer and self.indexer.add(event, self.index_manager.index_for(event)):
+                return
+            # Elasticsearch is down or the bulk buffer is full: keep the event on disk
+            if self.spool:
+                self.spool.append(serialize_event(event))
+                self.index_spooled += 1
+            else:
+                self.index_dropped += 1
         except Exception as e:
             logger.error(f"Failed to index event: {e}")
 
+    def _replay_document(self, doc: str) -> bool:
+        if self.indexer is None:
+            return False
+        return self.indexer.add_serialized(doc, self.index_manager.index_for_document(doc))
+
+    def _probe_elasticsearch(self) -> bool:
+        if self.es is None:
+            # Doubles as the reconnect loop while the cluster is unreachable
+            self.connect_to_elasticsearch()
+            return self.es is not None
+        return self.es.ping(request_timeout=self.config.get('health.probe_timeout_seconds', 2))
+
     def start(self):
-        self.connect_to_elasticsearch()
+        # The first Elasticsearch probe establishes the connection
+        self.health.check()
+        if self.indexer:
+            self.indexer.start()
+            self.index_manager.start()
+        self.notifier.start()
+        if self.spool_replayer:
+            self.spool_replayer.start()
+        if self.event_store:
+            self.event_store.start()
         self.is_running = True
+        self.health.start()
+        self.dashboard.start()
+        self.ingest.start()
+        if self.syslog:
+            self.syslog.start()
+        if self.http_ingest:
+            self.http_ingest.start()
+        if self.tailer:
+            self.tailer.start()
         logger.info("SIEM Core started")
 
     def stop(self):
         self.is_running = False
+        # Stop accepting input first and process what was already received
+        if self.syslog:
+            self.syslog.stop()
+        if self.http_ingest:
+            self.http_ingest.stop()
+        if self.tailer:
+            self.tailer.stop()
+        self.ingest.stop()
+        self.dashboard.stop()
+        self.health.stop()
+        self.notifier.stop()
+        if self.spool_replayer:
+            self.spool_replayer.stop()
+        if self.indexer:
+            self.index_manager.stop()
+            self.indexer.stop()
+        if self.spool:
+            self.spool.close()
+        if self.event_store:
+            self.event_store.stop()
         if self.es:
             self.es.close()
         logger.info("SIEM Core stopped")
 
     def get_stats(self) -> Dict[str, Any]:
+        templates = self.parsers['syslog'].templates
         return {
             'is_running': self.is_running,
-            'elasticsearch_connected': self.es is not None and self.es.ping() if self.es else False,
+            'elasticsearch_connected': self.health.is_healthy('elasticsearch'),
+            'health': self.health.get_stats(),
             'parsers': list(self.parsers.keys()),
-            'alerts_count': len(self.alert_manager.alerts)
+            'alerts_count': len(self.alert_manager.alerts),
+            'notifications': self.notifier.get_stats(),
+            'indexer': self.indexer.get_stats() if self.indexer else None,
+            'index_management': self.index_manager.get_stats() if self.index_manager else None,
+            'spool': dict(self.spool.get_stats(), replay=self.spool_replayer.get_stats()) if self.spool else None,
+            'event_store': self.event_store.get_stats() if self.event_store else None,
+            'rollups': self.rollups.get_stats(),
+            'tracing': self.tracer.get_stats(),
+            'parser_router': self.router.get_stats(),
+            'templates': templates.get_stats() if templates else None,
+            'json_backend': json_codec.backend,
+            'timestamps': self.event_processor.timestamps.get_stats(),
+            'ingest': dict(self.ingest.get_stats(), syslog=self.syslog.get_stats() if self.syslog else None,
+                           http=self.http_ingest.get_stats() if self.http_ingest else None,
+                           tailer=self.tailer.get_stats() if self.tailer else None)
+        }
+
+    def _dashboard_stats(self) -> Dict[str, Any]:
+        # Read on every snapshot publish; the rest of get_stats() is refreshed on a slower timer
+        return {
+            'is_running': self.is_running,
+            'elasticsearch_connected': self.health.is_healthy('elasticsearch'),
+            'alerts_count': len(self.alert_manager.alerts),
+            'events_processed': self.event_processor.processed_count,
+            'open_alerts': self.alert_manager.open_count,
         }
@@ -0,0 +1,285 @@
+import gzip
+import logging
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = '.ndjson.gz'
+OPEN_SUFFIX = '.open'
+
+
+def segment_name(sequence: int, events: Optional[int] = None) -> str:
+    """Sealed segments carry their event count: spool-<sequence>-<events>.ndjson.gz"""
+    if events is None:
+        return f"spool-{sequence:012d}{SEGMENT_SUFFIX}"
+    return f"spool-{sequence:012d}-{events}{SEGMENT_SUFFIX}"
+
+
+def segment_events(path: Path) -> Optional[int]:
+    """Event count from a sealed segment's name; None for segments named without one"""
+    parts = path.name[:-len(SEGMENT_SUFFIX)].split('-')
+    return int(parts[2]) if len(parts) == 3 and parts[2].isdigit() else None
+
+
+class DiskSpool:
+    """Append-only, segmented store for serialized events that could not be indexed.
+
+    Events are written to one gzip-compressed NDJSON segment at a time. A
+    segment is sealed once it reaches its size or age limit and only sealed
+    segments are handed to the replayer, oldest first.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or {}
+        self.directory = Path(self.config.get('spool.directory', 'data/spool'))
+        self.segment_max_bytes = self.config.get('spool.segment_max_bytes', 8 * 1024 * 1024)
+        self.segment_max_age = self.config.get('spool.segment_max_age_seconds', 60)
+        self.max_total_bytes = self.config.get('spool.max_total_bytes', 1024 * 1024 * 1024)
+        self.compress_level = self.config.get('spool.compress_level', 6)
+
+        self._lock = threading.Lock()
+        self._active: Optional[gzip.GzipFile] = None
+        self._active_path: Optional[Path] = None
+        self._active_opened = 0.0
+        self._active_bytes = 0
+        self._active_count = 0
+        self._sequence = 0
+        self._segments: List[Path] = []
+        self._segment_bytes: Dict[Path, int] = {}
+        self._segment_created: Dict[Path, float] = {}
+        self._segment_events: Dict[Path, int] = {}
+
+        self.spooled = 0
+        self.dropped_segments = 0
+        self.dropped_events = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._recover()
+
+    def _recover(self):
+        # Segments left open by a crash are sealed as-is; the reader tolerates a truncated tail.
+        # They (and segments from before counts were kept in the name) are counted once here.
+        for path in self.directory.glob(f'*{SEGMENT_SUFFIX}{OPEN_SUFFIX}'):
+            path.rename(path.with_name(path.name[:-len(OPEN_SUFFIX)]))
+        for path in sorted(self.directory.glob(f'spool-*{SEGMENT_SUFFIX}')):
+            events = segment_events(path)
+            if events is None:
+                events = sum(1 for _ in self.read_segment(path))
+                sequence = int(path.name.split('-')[1].split('.')[0])
+                path = path.rename(path.with_name(segment_name(sequence, events)))
+            stat = path.stat()
+            self._segments.append(path)
+            self._segment_bytes[path] = stat.st_size
+            self._segment_created[path] = stat.st_mtime
+            self._segment_events[path] = events
+        if self._segments:
+            self._sequence = int(self._segments[-1].name.split('-')[1].split('.')[0])
+            logger.info(f"Found {len(self._segments)} spooled segment(s) awaiting replay")
+
+    def append(self, doc: str):
+        self.append_many([doc])
+
+    def append_many(self, docs: List[str]):
+        data = ''.join(doc + '\n' for doc in docs).encode()
+        with self._lock:
+            if self._active is None:
+                self._open_segment()
+            self._active.write(data)
+            self._active_bytes += len(data)
+            self._active_count += len(docs)
+            self.spooled += len(docs)
+            if self._active_bytes >= self.segment_max_bytes:
+                self._seal_segment()
+
+    def _open_segment(self):
+        self._sequence += 1
+        self._active_path = self.directory / (segment_name(self._sequence) + OPEN_SUFFIX)
+        self._active = gzip.open(self._active_path, 'wb', compresslevel=self.compress_level)
+        self._active_opened = time.time()
+        self._active_bytes = 0
+        self._active_count = 0
+
+    def _seal_segment(self):
+        if self._active is None:
+            return
+        self._active.close()
+        sealed = self._active_path.with_name(segment_name(self._sequence, self._active_count))
+        self._active_path.rename(sealed)
+        self._segments.append(sealed)
+        self._segment_bytes[sealed] = sealed.stat().st_size
+        self._segment_created[sealed] = self._active_opened
+        self._segment_events[sealed] = self._active_count
+        self._active = None
+        self._active_path = None
+        self._active_bytes = 0
+        self._active_count = 0
+        self._enforce_size_limit()
+
+    def _enforce_size_limit(self):
+        total = sum(self._segment_bytes.values())
+        while self._segments and total > self.max_total_bytes:
+            oldest = self._segments[0]
+            total -= self._segment_bytes[oldest]
+            self.dropped_events += self._segment_events[oldest]
+            self._forget(oldest)
+            self.dropped_segments += 1
+            logger.error(f"Spool exceeded {self.max_total_bytes} bytes, dropped segment {oldest.name}")
+
+    def _forget(self, path: Path):
+        if path in self._segment_bytes:
+            self._segments.remove(path)
+            del self._segment_bytes[path]
+            del self._segment_created[path]
+            del self._segment_events[path]
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def seal(self, force: bool = False):
+        """Seal the active segment if it is old enough (or unconditionally with force)"""
+        with self._lock:
+            if self._active is not None and self._active_count and (
+                    force or time.time() - self._active_opened >= self.segment_max_age):
+                self._seal_segment()
+
+    def sealed_segments(self) -> List[Path]:
+        with self._lock:
+            return list(self._segments)
+
+    def read_segment(self, path: Path) -> Iterator[str]:
+        try:
+            with gzip.open(path, 'rt') as f:
+                for line in f:
+                    if line.endswith('\n'):
+                        yield line[:-1]
+        except (EOFError, zlib.error, OSError) as e:
+            logger.warning(f"Spool segment {path.name} is truncated: {e}")
+
+    def remove(self, path: Path):
+        with self._lock:
+            self._forget(path)
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            return not self._active_count and not self._segments
+
+    def close(self):
+        with self._lock:
+            self._seal_segment()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            segments = len(self._segments)
+            total_bytes = sum(self._segment_bytes.values())
+            oldest = self._segment_created[self._segments[0]] if self._segments else None
+            pending = sum(self._segment_events.values()) + self._active_count
+        oldest_age = 0.0
+        if oldest is not None:
+            oldest_age = time.time() - oldest
+        elif self._active is not None:
+            oldest_age = time.time() - self._active_opened
+        return {
+            'directory': str(self.directory),
+            'segments': segments + (1 if self._active is not None else 0),
+            'bytes': total_bytes,
+            'active_segment_events': self._active_count,
+            'pending_events': pending,
+            'oldest_segment_age_seconds': round(oldest_age, 1),
+            'spooled': self.spooled,
+            'dropped_segments': self.dropped_segments,
+            'dropped_events': self.dropped_events,
+        }
+
+
+class SpoolReplayer:
+    """Drains a DiskSpool into a sink at a bounded rate once the sink is reachable"""
+
+    def __init__(self, spool: DiskSpool, sink: Callable[[str], bool],
+                 is_available: Callable[[], bool], config=None):
+        self.spool = spool
+        self.sink = sink
+        self.is_available = is_available
+        config = config or {}
+        self.rate = config.get('spool.replay_rate', 1000)
+        self.interval = config.get('spool.replay_interval_seconds', 5)
+
+        self.replayed = 0
+        self.current_segment: Optional[str] = None
+        self.current_offset = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='spool-replayer', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.spool.seal()
+                if self.spool.sealed_segments() and self.is_available():
+                    self.replay()
+            except Exception as e:
+                logger.error(f"Spool replay failed: {e}")
+
+    def replay(self) -> int:
+        """Replay sealed segments oldest-first; stops early if the sink pushes back"""
+        replayed = 0
+        for segment in self.spool.sealed_segments():
+            if self._stop.is_set():
+                break
+            if self.current_segment != segment.name:
+                self.current_segment = segment.name
+                self.current_offset = 0
+
+            window_start = time.monotonic()
+            window_count = 0
+            completed = True
+            for i, doc in enumerate(self.spool.read_segment(segment)):
+                if i < self.current_offset:
+                    continue
+                if not self.sink(doc):
+                    completed = False
+                    break
+                self.current_offset = i + 1
+                replayed += 1
+                self.replayed += 1
+
+                window_count += 1
+                if window_count >= self.rate:
+                    elapsed = time.monotonic() - window_start
+                    if elapsed < 1.0 and self._stop.wait(1.0 - elapsed):
+                        completed = False
+                        break
+                    window_start = time.monotonic()
+                    window_count = 0
+
+            if not completed:
+                logger.info(f"Spool replay paused at {segment.name}:{self.current_offset}")
+                break
+            self.spool.remove(segment)
+            self.current_segment = None
+            self.current_offset = 0
+            logger.info(f"Replayed spool segment {segment.name}")
+        return replayed
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'replayed': self.replayed,
+            'current_segment': self.current_segment,
+            'current_offset': self.current_offset,
+            'segments_remaining': len(self.spool.sealed_segments()),
+        }
@@ -0,0 +1,210 @@
+import logging
+import re
+import time
+from datetime import datetime, timedelta, timezone, tzinfo
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8
+    ZoneInfo = None
+
+logger = logging.getLogger(__name__)
+
+MONTHS = {name: n for n, name in enumerate(
+    ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'), 1)}
+
+# Numeric timestamps above this are taken to be milliseconds (year 5138 in seconds)
+MILLISECONDS_ABOVE = 1e11
+
+# 'Oct 11 22:14:15', 'Oct  1 22:14:15' or 'Oct 1 22:14:15'
+RFC3164_TIME = re.compile(r'([A-Z][a-z]{2}) +(\d{1,2}) +(\d{1,2}):(\d{2}):(\d{2})')
+UTC_OFFSET = re.compile(r'([+-])(\d{2}):?(\d{2})')
+
+
+def resolve_timezone(name: Optional[str]) -> Optional[tzinfo]:
+    """tzinfo for a configured zone; None stands for the host's local time.
+
+    Accepts 'local', 'UTC', offsets like '+02:00' and, where zoneinfo is
+    available, IANA names like 'Europe/Berlin'.
+    """
+    if not name or str(name).lower() == 'local':
+        return None
+    name = str(name)
+    if name.upper() in ('UTC', 'Z'):
+        return timezone.utc
+    offset = UTC_OFFSET.fullmatch(name)
+    if offset:
+        sign, hours, minutes = offset.groups()
+        delta = timedelta(hours=int(hours), minutes=int(minutes))
+        return timezone(-delta if sign == '-' else delta)
+    if ZoneInfo is None:
+        raise ValueError(f"Time zone {name} needs Python 3.9 or later; use an offset like +02:00")
+    try:
+        return ZoneInfo(name)
+    except (KeyError, ValueError):
+        raise ValueError(f"Unknown time zone: {name}")
+
+
+def _iso_second(epoch_second: int) -> str:
+    return datetime.fromtimestamp(epoch_second, timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+class TimestampNormalizer:
+    """Turns an event's timestamp into epoch seconds and a UTC ISO 8601 string.
+
+    Handles ISO 8601 (RFC 5424, JSON), RFC 3164 ``Mmm dd hh:mm:ss`` read in
+    timestamps.timezone (local time by default) with the year inferred as
+    the one putting the date closest to now, epoch seconds
+    or milliseconds, and datetimes. Consecutive lines mostly share their
+    second, so the parsed second is cached by the text up to it (plus the
+    UTC offset) and only the fraction is read per event.
+    """
+
+    def __init__(self, config=None):
+        get = (config or {}).get
+        self.cache_size = get('timestamps.cache_size', 4096)
+        # Zone RFC 3164 timestamps are written in; None is the host's local time
+        self.timezone = resolve_timezone(get('timestamps.timezone', 'local'))
+        # second-resolution key -> (epoch second, ISO text up to the second)
+        self._seconds: Dict[str, Tuple[int, str]] = {}
+        self._day: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.unparsed = 0
+
+    def normalize(self, event: Dict[str, Any], now: Optional[float] = None) -> Dict[str, Any]:
+        """Set event['epoch'] and rewrite event['timestamp'] in place.
+
+        Non-ISO originals (RFC 3164 text, unreadable values) are kept in
+        timestamp_raw. Events whose timestamp cannot be read get the
+        receive time and timestamp_status 'unparsed'.
+        """
+        if 'epoch' in event:
+            return event
+        now = time.time() if now is None else now
+        raw = event.get('timestamp')
+        parsed = self.parse(raw, now) if raw is not None else None
+        if parsed is None:
+            parsed = now, _iso(now)
+            if raw is not None:
+                self.unparsed += 1
+                event['timestamp_raw'] = raw
+                event['timestamp_status'] = 'unparsed'
+        elif isinstance(raw, str) and not raw[:4].isdigit():
+            event['timestamp_raw'] = raw
+        event['epoch'], event['timestamp'] = parsed
+        return event
+
+    def parse(self, value: Any, now: Optional[float] = None) -> Optional[Tuple[float, str]]:
+        """(epoch seconds, UTC ISO 8601) for a timestamp value, or None"""
+        if isinstance(value, str):
+            text = value.strip()
+            if text[:4].isdigit() and text[4:5] == '-':
+                return self._parse_iso(text, now)
+            if text[:3] in MONTHS:
+                return self._parse_rfc3164(text, now)
+            try:
+                value = float(text)
+            except ValueError:
+                return None
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, (int, float)):
+            epoch = float(value) / 1000 if value > MILLISECONDS_ABOVE else float(value)
+            return epoch, _iso(epoch)
+        if isinstance(value, datetime):
+            if value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            epoch = value.timestamp()
+            return epoch, _iso(epoch)
+        return None
+
+    def _cached(self, key: str, now: Optional[float]) -> Optional[Tuple[int, str]]:
+        # Year inference depends on today, so the cache starts over each UTC day
+        day = int((time.time() if now is None else now) // 86400)
+        if day != self._day or len(self._seconds) > self.cache_size:
+            self._seconds.clear()
+            self._day = day
+        entry = self._seconds.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def _parse_iso(self, text: str, now: Optional[float]) -> Optional[Tuple[float, str]]:
+        prefix, rest = text[:19], text[19:]
+        micros = 0
+        if rest[:1] in ('.', ','):
+            digits = rest[1:]
+            rest = digits.lstrip('0123456789')
+            micros = int((digits[:len(digits) - len(rest)] + '000000')[:6])
+        key = prefix + rest
+        entry = self._cached(key, now)
+        if entry is None:
+            offset = rest
+            if offset in ('', 'Z', 'z'):
+                offset = '+00:00'
+            elif len(offset) == 5 and offset[0] in '+-':
+                # +0200 -> +02:00, which fromisoformat needs before Python 3.11
+                offset = offset[:3] + ':' + offset[3:]
+            try:
+                parsed = datetime.fromisoformat(prefix + offset)
+            except ValueError:
+                return self._parse_iso_uncached(text)
+            if parsed.tzinfo is None:
+                # A bare date drops the offset on Python 3.11+ and would be read as local time
+                return self._parse_iso_uncached(text)
+            second = int(parsed.timestamp())
+            entry = self._seconds[key] = (second, _iso_second(second))
+        second, base = entry
+        if micros:
+            return second + micros / 1e6, f"{base}.{micros:06d}+00:00"
+        return float(second), base + '+00:00'
+
+    def _parse_iso_uncached(self, text: str) -> Optional[Tuple[float, str]]:
+        """Shorter ISO forms such as a bare date or hours and minutes only"""
+        try:
+            dt = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        return self.parse(dt)
+
+    def _parse_rfc3164(self, text: str, now: Optional[float]) -> Optional[Tuple[float, str]]:
+        # Already second resolution; the day may be space-padded or not
+        match = RFC3164_TIME.match(text)
+        if match is None or match.group(1) not in MONTHS:
+            return None
+        key = match.group(0)
+        entry = self._cached(key, now)
+        if entry is None:
+            month = MONTHS[match.group(1)]
+            day, hour, minute, second = (int(part) for part in match.group(2, 3, 4, 5))
+            now = time.time() if now is None else now
+            year = datetime.fromtimestamp(now, self.timezone).year
+            candidates = []
+            for y in (year - 1, year, year + 1):
+                try:
+                    # Without a tzinfo, timestamp() reads the datetime as local time
+                    candidates.append(datetime(y, month, day, hour, minute, second,
+                                               tzinfo=self.timezone).timestamp())
+                except ValueError:
+                    continue  # e.g. Feb 29 outside a leap year
+            if not candidates:
+                return None
+            epoch = int(min(candidates, key=lambda c: abs(c - now)))
+            entry = self._seconds[key] = (epoch, _iso_second(epoch))
+        return float(entry[0]), entry[1] + '+00:00'
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'cache_hits': self.hits,
+            'cache_misses': self.misses,
+            'cached_seconds': len(self._seconds),
+            'unparsed': self.unparsed,
+        }
@@ -0,0 +1,102 @@
+import logging
+import time
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Spans between consecutive timestamps taken in SIEMCore.process_log/process_event;
+# parse is zero for structured events
+STAGES = ('parse', 'enrich', 'detect', 'alert', 'index')
+
+
+class Tracer:
+    """Keeps per-stage timings of selected events in a ring buffer.
+
+    An event is kept when it is the Nth since the last sample (sample_every),
+    when it took at least slow_ms end to end (tail-based), or when it failed.
+    The pipeline only calls record() while ``enabled`` is true, so a disabled
+    tracer costs one attribute check per event. Hooks receive every kept span.
+    """
+
+    def __init__(self, config=None):
+        get = (config or {}).get
+        self.max_line_chars = get('tracing.max_line_chars', 256)
+        self.spans: deque = deque(maxlen=get('tracing.buffer_size', 1000))
+        self.hooks: List[Callable[[Dict[str, Any]], None]] = []
+        self.seen = 0
+        self.kept = 0
+        self._next_id = 0
+        self.configure(get('tracing.sample_every', 0), get('tracing.slow_ms', 0))
+
+    def configure(self, sample_every: int = 0, slow_ms: float = 0):
+        """Change sampling at runtime; both zero disables tracing"""
+        self.sample_every = sample_every
+        self.slow_ms = slow_ms
+        self._slow_seconds = slow_ms / 1000.0
+        self.enabled = bool(sample_every or slow_ms)
+
+    def add_hook(self, hook: Callable[[Dict[str, Any]], None]):
+        self.hooks.append(hook)
+
+    def record(self, log_line: str, log_type: str, stamps: Sequence[float]):
+        """Consider one processed event; stamps are perf_counter values at each stage boundary"""
+        self.seen += 1
+        total = stamps[-1] - stamps[0]
+        if self._slow_seconds and total >= self._slow_seconds:
+            reason = 'slow'
+        elif self.sample_every and self.seen % self.sample_every == 0:
+            reason = 'sampled'
+        else:
+            return
+        stages = {name: round((stamps[i + 1] - stamps[i]) * 1000, 3) for i, name in enumerate(STAGES)}
+        self._keep(log_line, log_type, total, reason, stages)
+
+    def record_error(self, log_line: str, log_type: str, start: float, error: Exception):
+        self.seen += 1
+        self._keep(log_line, log_type, time.perf_counter() - start, 'error', {}, repr(error))
+
+    def _keep(self, log_line: str, log_type: str, total: float, reason: str, stages: Dict[str, float],
+              error: Optional[str] = None):
+        self._next_id += 1
+        span = {
+            'id': self._next_id,
+            'time': time.time(),
+            'log_type': log_type,
+            'reason': reason,
+            'total_ms': round(total * 1000, 3),
+            'stages_ms': stages,
+            # Structured events from SIEMCore.process_event are shown as their repr
+            'line': (log_line if isinstance(log_line, str) else repr(log_line))[:self.max_line_chars],
+        }
+        if error:
+            span['error'] = error
+        self.spans.append(span)
+        self.kept += 1
+        for hook in self.hooks:
+            try:
+                hook(span)
+            except Exception as e:
+                logger.error(f"Trace hook failed: {e}")
+
+    def dump(self, limit: Optional[int] = None, slowest: bool = False) -> List[Dict[str, Any]]:
+        """Kept spans, newest first or slowest first"""
+        spans = list(self.spans)
+        if slowest:
+            spans.sort(key=lambda span: span['total_ms'], reverse=True)
+        else:
+            spans.reverse()
+        return spans[:limit] if limit else spans
+
+    def clear(self):
+        self.spans.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'enabled': self.enabled,
+            'sample_every': self.sample_every,
+            'slow_ms': self.slow_ms,
+            'seen': self.seen,
+            'kept': self.kept,
+            'buffered': len(self.spans),
+        }
@@ -0,0 +1,6 @@
+from .snapshot import DashboardSnapshot, SnapshotPublisher, alert_view
+from .stream import AlertStream
+from .server import DashboardServer, DashboardHandler
+
+__all__ = ["DashboardSnapshot", "SnapshotPublisher", "alert_view", "AlertStream",
+           "DashboardServer", "DashboardHandler"]
@@ -0,0 +1,220 @@
+import gzip
+import logging
+import threading
+import zlib
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from ..utils import json_codec
+from .stream import AlertStream, STREAM_HEADERS
+
+logger = logging.getLogger(__name__)
+
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class DashboardServer(ThreadingHTTPServer):
+    """Threaded HTTP server for the dashboards.
+
+    Every request runs on its own thread and reads only the snapshot
+    published by the engine, so a slow client or a long-lived event stream
+    never holds up other requests.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, handler_class, publisher, config=None):
+        self.publisher = publisher
+        self.stream = AlertStream(publisher, config)
+        get = (config or {}).get
+        self.default_limit = get('dashboard.api.default_limit', 100)
+        self.max_limit = get('dashboard.api.max_limit', 1000)
+        self.gzip_min_bytes = get('dashboard.api.gzip_min_bytes', 1024)
+        self.gzip_level = get('dashboard.api.gzip_level', 6)
+        self.cache_size = get('dashboard.api.response_cache_size', 64)
+
+        # ETag -> (body, gzipped); identical pages are built and compressed once
+        self._responses: 'OrderedDict[str, Tuple[bytes, bool]]' = OrderedDict()
+        self._responses_lock = threading.Lock()
+        super().__init__(address, handler_class)
+
+    def cached_response(self, etag: str) -> Optional[Tuple[bytes, bool]]:
+        with self._responses_lock:
+            response = self._responses.get(etag)
+            if response is not None:
+                self._responses.move_to_end(etag)
+            return response
+
+    def cache_response(self, etag: str, response: Tuple[bytes, bool]):
+        with self._responses_lock:
+            self._responses[etag] = response
+            if len(self._responses) > self.cache_size:
+                self._responses.popitem(last=False)
+
+    def close(self):
+        self.stream.close()
+        self.shutdown()
+        self.server_close()
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    """JSON API shared by the dashboards; subclasses add pages to ROUTES"""
+
+    ROUTES: Dict[str, str] = {
+        '/api/stats': 'api_stats',
+        '/api/alerts': 'api_alerts',
+        '/api/stream': 'api_stream',
+        '/api/timeseries': 'api_timeseries',
+        '/api/traces': 'api_traces',
+        '/metrics': 'metrics',
+    }
+
+    def do_GET(self):
+        parsed_path = urlparse(self.path)
+        route = self.ROUTES.get(parsed_path.path)
+        if route is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        getattr(self, route)(parse_qs(parsed_path.query))
+
+    @property
+    def snapshot(self):
+        return self.server.publisher.current
+
+    def send_body(self, body: bytes, content_type: str, status: int = 200, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None):
+        body = data if isinstance(data, bytes) else json_codec.dumps_bytes(data)
+        self.send_body(body, 'application/json', status, headers)
+
+    def accepts_gzip(self) -> bool:
+        return 'gzip' in self.headers.get('Accept-Encoding', '')
+
+    def not_modified(self, etag: str) -> bool:
+        """Answer 304 if the client already holds this representation"""
+        if_none_match = self.headers.get('If-None-Match')
+        if not if_none_match:
+            return False
+        candidates = [tag.strip() for tag in if_none_match.split(',')]
+        if etag not in candidates and '*' not in candidates:
+            return False
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+        return True
+
+    def api_stats(self, query):
+        self.send_json(self.snapshot.stats_json)
+
+    def api_alerts(self, query):
+        """Alerts after the ``since`` cursor, oldest first.
+
+        Query parameters: since (alert seq, default 0), limit, fields
+        (comma separated projection). The response carries next_since for
+        the following request, an ETag for conditional polling and is
+        gzip-encoded when the client accepts it.
+        """
+        server = self.server
+        try:
+            since = int(query.get('since', ['0'])[0])
+            limit = min(max(int(query.get('limit', [server.default_limit])[0]), 1), server.max_limit)
+        except ValueError:
+            self.send_json({'error': 'since and limit must be integers'}, status=400)
+            return
+        fields = [f for f in ','.join(query.get('fields', [])).split(',') if f]
+
+        snapshot = self.snapshot
+        end_seq = snapshot.last_seq
+        gzipped = self.accepts_gzip()
+        fields_key = zlib.crc32(','.join(fields).encode())
+        etag = f'"{snapshot.generation}-{since}-{limit}-{end_seq}-{fields_key:x}{"-gz" if gzipped else ""}"'
+        if self.not_modified(etag):
+            return
+
+        headers = {'ETag': etag, 'Vary': 'Accept-Encoding', 'Cache-Control': 'no-cache'}
+        response = server.cached_response(etag)
+        if response is None:
+            response = self._alerts_page(snapshot, since, limit, fields, gzipped)
+            server.cache_response(etag, response)
+        body, compressed = response
+        if compressed:
+            headers['Content-Encoding'] = 'gzip'
+        self.send_json(body, headers=headers)
+
+    def _alerts_page(self, snapshot, since: int, limit: int, fields: List[str], gzipped: bool) -> Tuple[bytes, bool]:
+        views = snapshot.alerts_since(since, limit)
+        if fields:
+            items = [json_codec.dumps({f: view.get(f) for f in fields}) for view in views]
+        else:
+            items = snapshot.encoded_since(since, limit)
+        next_since = views[-1]['seq'] if views else since
+
+        body = (
+            '{"alerts": [' + ','.join(items) + '], '
+            f'"next_since": {next_since}, "has_more": {"true" if next_since < snapshot.last_seq else "false"}, '
+            f'"total": {snapshot.alert_count}}}'
+        ).encode()
+        if gzipped and len(body) >= self.server.gzip_min_bytes:
+            return gzip.compress(body, compresslevel=self.server.gzip_level), True
+        return body, False
+
+    def api_timeseries(self, query):
+        """Rolled-up counts for charts: ?resolution=second|minute|hour&points=n"""
+        rollups = self.server.publisher.rollups
+        if rollups is None:
+            self.send_json({'error': 'time-series rollups are not enabled'}, status=404)
+            return
+        try:
+            points = query.get('points')
+            series = rollups.series(query.get('resolution', ['minute'])[0], int(points[0]) if points else None)
+        except ValueError as e:
+            self.send_json({'error': str(e)}, status=400)
+            return
+        self.send_json(series, headers={'Cache-Control': 'no-cache'})
+
+    def api_traces(self, query):
+        """Kept per-stage trace spans: ?limit=n&order=newest|slowest"""
+        tracer = self.server.publisher.tracer
+        if tracer is None:
+            self.send_json({'error': 'tracing is not available'}, status=404)
+            return
+        try:
+            limit = int(query.get('limit', ['100'])[0])
+        except ValueError:
+            self.send_json({'error': 'limit must be an integer'}, status=400)
+            return
+        slowest = query.get('order', ['newest'])[0] == 'slowest'
+        self.send_json({'spans': tracer.dump(limit, slowest), 'stats': tracer.get_stats()},
+                       headers={'Cache-Control': 'no-cache'})
+
+    def metrics(self, query):
+        """Prometheus text exposition of the engine's metrics registry"""
+        registry = self.server.publisher.metrics
+        if registry is None:
+            self.send_json({'error': 'metrics are not enabled'}, status=404)
+            return
+        self.send_body(registry.render().encode(), METRICS_CONTENT_TYPE)
+
+    def api_stream(self, query):
+        self.send_response(200)
+        for name, value in STREAM_HEADERS.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        last_id: Optional[str] = self.headers.get('Last-Event-ID')
+        self.server.stream.serve(self.wfile, int(last_id) if last_id and last_id.isdigit() else None)
+
+    def log_message(self, format, *args):
+        pass
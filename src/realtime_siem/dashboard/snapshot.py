@@ -0,0 +1,206 @@
+import logging
+import threading
+import time
+from typing import Dict, Any, Callable, List, Optional
+
+from ..alerts.notification_handler import summarize_alert
+from ..utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+
+def alert_view(alert: Dict[str, Any]) -> Dict[str, Any]:
+    """The serializable form of an alert sent to dashboards"""
+    view = summarize_alert(alert)
+    view['seq'] = alert.get('seq')
+    view['status'] = alert.get('status', 'open')
+    return view
+
+
+class DashboardSnapshot:
+    """Alerts and stats as of one publish; never modified once published.
+
+    The alert lists are shared between consecutive snapshots and only ever
+    appended to, so each snapshot reads just its first alert_count entries.
+    When an alert changes, the publisher swaps its entry into a copy of the
+    lists instead.
+    """
+
+    __slots__ = ('version', 'generation', 'published_at', 'stats', 'stats_json', 'alert_count',
+                 '_views', '_encoded')
+
+    def __init__(self, version: int, stats: Dict[str, Any], views: List[Dict[str, Any]],
+                 encoded: List[str], alert_count: int, generation: int = 0):
+        self.version = version
+        # Changes when the alert lists are rebuilt, i.e. when published alerts changed
+        self.generation = generation
+        self.published_at = time.time()
+        self.stats = stats
+        self.stats_json = json_codec.dumps_bytes(stats)
+        self.alert_count = alert_count
+        self._views = views
+        self._encoded = encoded
+
+    @property
+    def last_seq(self) -> int:
+        return self._views[self.alert_count - 1]['seq'] if self.alert_count else 0
+
+    def _offset(self, seq: int) -> int:
+        # Sequence numbers are contiguous, so the offset is direct
+        if not self.alert_count:
+            return 0
+        return min(max(seq - self._views[0]['seq'] + 1, 0), self.alert_count)
+
+    def recent(self, count: int) -> List[Dict[str, Any]]:
+        """The newest alert views, oldest first"""
+        return self._views[max(self.alert_count - count, 0):self.alert_count]
+
+    def alerts_since(self, seq: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        start = self._offset(seq)
+        end = self.alert_count if limit is None else min(start + limit, self.alert_count)
+        return self._views[start:end]
+
+    def encoded_since(self, seq: int, limit: Optional[int] = None) -> List[str]:
+        """Like alerts_since, but already JSON-encoded"""
+        start = self._offset(seq)
+        end = self.alert_count if limit is None else min(start + limit, self.alert_count)
+        return self._encoded[start:end]
+
+
+class SnapshotPublisher:
+    """Publishes dashboard snapshots so request handlers never touch live engine state.
+
+    A background thread wakes on new alerts (or every interval for stats),
+    builds a new DashboardSnapshot and swaps it in. Readers take
+    ``publisher.current`` without locking. Each alert is summarized and
+    JSON-encoded once, when it is first published. stats_source should only
+    read cheap counters as it runs on every publish; the full engine stats
+    from full_stats_source are refreshed every full_stats_interval and
+    merged underneath. Time-series charts,
+    /metrics and traces are served straight from the engine's rollups,
+    metrics registry and tracer, which are already aggregated.
+    """
+
+    def __init__(self, alert_manager, stats_source: Callable[[], Dict[str, Any]], config=None, rollups=None,
+                 metrics=None, tracer=None, full_stats_source: Optional[Callable[[], Dict[str, Any]]] = None):
+        self.alert_manager = alert_manager
+        self.stats_source = stats_source
+        self.full_stats_source = full_stats_source
+        self.rollups = rollups
+        self.metrics = metrics
+        self.tracer = tracer
+        get = (config or {}).get
+        self.interval = get('dashboard.snapshot_interval_seconds', 1.0)
+        self.min_interval = get('dashboard.snapshot_min_interval_seconds', 1.0)
+        self.full_stats_interval = get('dashboard.full_stats_interval_seconds', 10.0)
+
+        self._full_stats: Dict[str, Any] = {}
+        self._full_stats_at: Optional[float] = None
+
+        self._views: List[Dict[str, Any]] = []
+        self._encoded: List[str] = []
+        self._source_alerts = None
+        self._status_changes = 0
+        self._seen_counter = 0
+        self._generation = 0
+        self._published = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.current = DashboardSnapshot(0, {}, self._views, self._encoded, 0)
+
+    def publish(self) -> DashboardSnapshot:
+        self._seen_counter = self.alert_manager.alert_counter
+        alerts = self.alert_manager.alerts
+        status_changes = self.alert_manager.status_changes
+        changed = None
+        if alerts is self._source_alerts and status_changes != self._status_changes:
+            changed = self.alert_manager.changed_since(self._status_changes)
+        if alerts is not self._source_alerts or (status_changes != self._status_changes and changed is None):
+            # Cleared: start new lists so published snapshots stay intact
+            self._views, self._encoded = [], []
+            self._generation += 1
+            self._source_alerts = alerts
+            self._status_changes = self.alert_manager.status_changes
+            new_alerts = list(alerts)
+        else:
+            if changed:
+                self._update_changed(alerts, changed)
+            new_alerts = self.alert_manager.get_alerts_since(self._views[-1]['seq'] if self._views else 0)
+
+        for alert in new_alerts:
+            view = alert_view(alert)
+            self._encoded.append(json_codec.dumps(view))
+            self._views.append(view)
+
+        stats = dict(self._refresh_full_stats())
+        stats.update(self.stats_source())
+        stats['total_alerts'] = len(self._views)
+        snapshot = DashboardSnapshot(self.current.version + 1, stats, self._views, self._encoded,
+                                     len(self._views), self._generation)
+        with self._published:
+            self.current = snapshot
+            self._published.notify_all()
+        return snapshot
+
+    def _update_changed(self, alerts: List[Dict[str, Any]], changed: List[int]):
+        # Copy the lists, not the views, so published snapshots keep the old entries
+        self._views, self._encoded = list(self._views), list(self._encoded)
+        self._generation += 1
+        self._status_changes += len(changed)
+        if not self._views:
+            return
+        first = self._views[0]['seq']
+        for seq in set(changed):
+            offset = seq - first
+            if 0 <= offset < len(self._views):
+                view = alert_view(alerts[offset])
+                self._views[offset] = view
+                self._encoded[offset] = json_codec.dumps(view)
+
+    def _refresh_full_stats(self) -> Dict[str, Any]:
+        if self.full_stats_source is not None:
+            now = time.monotonic()
+            if self._full_stats_at is None or now - self._full_stats_at >= self.full_stats_interval:
+                self._full_stats = self.full_stats_source()
+                self._full_stats_at = now
+        return self._full_stats
+
+    def wait_for_update(self, version: int, timeout: float) -> DashboardSnapshot:
+        """Block until a snapshot newer than version is published or timeout passes"""
+        with self._published:
+            self._published.wait_for(lambda: self.current.version > version, timeout)
+            return self.current
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self.publish()
+            self._thread = threading.Thread(target=self._run, name='dashboard-snapshots', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self.alert_manager.wake_waiters()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.alert_manager.wait_for_change(self._seen_counter, self._status_changes, self.interval, self._stop)
+            if self._stop.is_set():
+                break
+            try:
+                self.publish()
+            except Exception as e:
+                logger.error(f"Dashboard snapshot failed: {e}")
+            # Coalesce alert bursts into one snapshot
+            self._stop.wait(self.min_interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self.current
+        return {
+            'version': snapshot.version,
+            'alerts': snapshot.alert_count,
+            'age_seconds': round(time.time() - snapshot.published_at, 3),
+        }
@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from ..utils import json_codec
+
+logger = logging.getLogger(__name__)
+
+STREAM_HEADERS = {
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache',
+    'Connection': 'keep-alive',
+    'X-Accel-Buffering': 'no',
+}
+
+# The subset of snapshot stats pushed to live viewers
+STREAM_STATS = ('total_alerts', 'open_alerts', 'events_processed', 'is_running')
+
+
+def format_event(event: str, data: str, event_id: Optional[int] = None) -> bytes:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {data}")
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+class AlertStream:
+    """Pushes new alerts and stat changes to dashboard viewers as Server-Sent Events.
+
+    Each viewer blocks until a new snapshot is published, so idle viewers
+    cost nothing. Alerts go out in the JSON the snapshot already encoded,
+    and stats are sent only when they change.
+    """
+
+    def __init__(self, publisher, config=None):
+        self.publisher = publisher
+        get = (config or {}).get
+        self.stats_interval = get('dashboard.stream.stats_interval_seconds', 1.0)
+        self.keepalive_interval = get('dashboard.stream.keepalive_seconds', 15)
+        self.initial_alerts = get('dashboard.stream.initial_alerts', 20)
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self.viewers = 0
+        self.messages_sent = 0
+
+    def serve(self, wfile, last_seq: Optional[int] = None):
+        """Stream events to one viewer until it disconnects or the stream is closed.
+
+        last_seq resumes after a reconnect (the EventSource Last-Event-ID);
+        a new viewer first receives the most recent alerts.
+        """
+        with self._lock:
+            self.viewers += 1
+        snapshot = self.publisher.current
+        newest = snapshot.last_seq
+        # A Last-Event-ID from before a restart is ahead of the counter; start over
+        seq = last_seq if last_seq is not None and last_seq <= newest else max(newest - self.initial_alerts, 0)
+        last_stats: Optional[Dict[str, Any]] = None
+        last_write = 0.0
+        try:
+            while not self._stop.is_set():
+                chunks = []
+                encoded = snapshot.encoded_since(seq)
+                if encoded:
+                    seq = snapshot.last_seq
+                    chunks.append(format_event('alerts', '[' + ','.join(encoded) + ']', seq))
+
+                stats = {key: snapshot.stats.get(key) for key in STREAM_STATS}
+                delta = {k: v for k, v in stats.items() if last_stats is None or last_stats.get(k) != v}
+                if delta:
+                    chunks.append(format_event('stats', json_codec.dumps(delta)))
+                    last_stats = stats
+
+                now = time.time()
+                if not chunks and now - last_write >= self.keepalive_interval:
+                    chunks.append(b': keepalive\n\n')
+                if chunks:
+                    wfile.write(b''.join(chunks))
+                    wfile.flush()
+                    last_write = now
+                    with self._lock:
+                        self.messages_sent += len(chunks)
+
+                snapshot = self.publisher.wait_for_update(snapshot.version, self.stats_interval)
+        except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+            pass
+        finally:
+            with self._lock:
+                self.viewers -= 1
+
+    def close(self):
+        self._stop.set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'viewers': self.viewers,
+            'messages_sent': self.messages_sent,
+        }
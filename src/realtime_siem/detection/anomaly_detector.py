@@ -3,6 +3,8 @@ from typing import Dict, Any, List
 from collections import defaultdict
 from datetime import datetime, timedelta
 
+from ..core.timestamps import resolve_timezone
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,6 +16,8 @@ class AnomalyDetector:
         self.anomaly_threshold_multiplier = 3.0
         self.event_history = []
         self.max_history = 10000
+        # Working hours are judged in the site's zone; None is the host's local time
+        self.timezone = resolve_timezone((config or {}).get('timestamps.timezone', 'local'))
     
     def detect_anomalies(self, event: Dict[str, Any]) -> List[Dict[str, Any]]:
         anomalies = []
@@ -90,20 +94,16 @@ class AnomalyDetector:
         return False
     
     def _check_unusual_time(self, event: Dict[str, Any]) -> bool:
-        timestamp = event.get('timestamp')
-        if not timestamp:
+        # Set by EventProcessor from the normalized timestamp
+        epoch = event.get('epoch')
+        if epoch is None:
             return False
         
-        try:
-            event_time = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            hour = event_time.hour
-            
-            if hour < 6 or hour > 22:
-                event_type = event.get('type', '')
-                if event_type in ['login', 'file_access', 'database_query']:
-                    return True
-        except Exception:
-            pass
+        hour = datetime.fromtimestamp(epoch, self.timezone).hour
+        if hour < 6 or hour > 22:
+            event_type = event.get('type', '')
+            if event_type in ['login', 'file_access', 'database_query']:
+                return True
         
         return False
     
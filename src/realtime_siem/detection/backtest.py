@@ -0,0 +1,211 @@
+import logging
+import multiprocessing
+import os
+import time
+from collections import Counter
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .rules_engine import RulesEngine
+from ..core.event_processor import EventProcessor
+from ..parsers.router import ParserRouter
+from ..ingest.archive import detect_compression, open_archive
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def plan_chunks(paths: Iterable[str], chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> List[Tuple[str, int, Optional[int]]]:
+    """Split log files into (path, start, end) byte ranges.
+
+    Compressed files, recognised by their leading bytes like open_archive
+    does, cannot be split and are scanned as one chunk (end is None). A
+    line belongs to the chunk in which it starts.
+    """
+    chunks = []
+    for path in paths:
+        path = str(path)
+        if detect_compression(path):
+            chunks.append((path, 0, None))
+            continue
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), chunk_bytes):
+            chunks.append((path, start, min(start + chunk_bytes, size)))
+    return chunks
+
+
+def iter_chunk_lines(path: str, start: int, end: Optional[int]) -> Iterator[bytes]:
+    """Stream the lines that start inside [start, end) of a file"""
+    if end is None:
+        with open_archive(path) as f:
+            yield from f
+        return
+
+    with open(path, 'rb') as f:
+        position = start
+        if start > 0:
+            # Skip the tail of a line owned by the previous chunk
+            f.seek(start - 1)
+            position = start - 1 + len(f.readline())
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line
+
+
+class _Replayer:
+    """Per-process parse, enrich and match state for one backtest"""
+
+    def __init__(self, log_type: str, source: Optional[str] = None):
+        self.log_type = log_type
+        self.source = source
+        self.router = ParserRouter()
+        self.processor = EventProcessor()
+
+    def parse(self, line: str) -> Dict[str, Any]:
+        if self.log_type == 'auto':
+            return self.processor.process(self.router.parse(line, self.source))
+        return self.processor.process(self.router.parsers[self.log_type].parse(line))
+
+
+def _engine(rules: List[Dict[str, Any]]) -> RulesEngine:
+    engine = RulesEngine()
+    engine.rules = rules
+    return engine
+
+
+def backtest_chunk(args) -> Dict[str, Any]:
+    """Replay one byte range through both rule sets; runs inside worker processes"""
+    path, start, end, candidate_rules, baseline_rules, log_type, bucket_seconds = args
+
+    replayer = _Replayer(log_type, path)
+    candidate = _engine(candidate_rules)
+    baseline = _engine(baseline_rules)
+
+    result = {
+        'lines': 0, 'parse_errors': 0, 'untimed_events': 0,
+        'candidate_hits': Counter(), 'baseline_hits': Counter(),
+        'candidate_buckets': Counter(), 'baseline_buckets': Counter(),
+        'only_candidate': 0, 'only_baseline': 0, 'both': 0,
+    }
+    for raw in iter_chunk_lines(path, start, end):
+        line = raw.decode('utf-8', errors='replace').strip()
+        if not line:
+            continue
+        result['lines'] += 1
+        try:
+            event = replayer.parse(line)
+        except Exception:
+            result['parse_errors'] += 1
+            continue
+
+        candidate_names = [rule.get('name', 'unknown') for rule in candidate.match_rules(event)]
+        baseline_names = [rule.get('name', 'unknown') for rule in baseline.match_rules(event)]
+        if not candidate_names and not baseline_names:
+            continue
+
+        if event.get('timestamp_status') == 'unparsed':
+            result['untimed_events'] += 1
+        else:
+            bucket = int(event['epoch'] // bucket_seconds * bucket_seconds)
+            result['candidate_buckets'][bucket] += len(candidate_names)
+            result['baseline_buckets'][bucket] += len(baseline_names)
+
+        result['candidate_hits'].update(candidate_names)
+        result['baseline_hits'].update(baseline_names)
+        if candidate_names and baseline_names:
+            result['both'] += 1
+        elif candidate_names:
+            result['only_candidate'] += 1
+        else:
+            result['only_baseline'] += 1
+    return result
+
+
+def _comparable(rule: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in rule.items() if not k.startswith('_')}
+
+
+def diff_rules(candidate: List[Dict[str, Any]], baseline: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Rule names added, removed or changed in the candidate set"""
+    candidate_by_name = {rule.get('name'): _comparable(rule) for rule in candidate}
+    baseline_by_name = {rule.get('name'): _comparable(rule) for rule in baseline}
+    return {
+        'added': sorted(name for name in candidate_by_name if name not in baseline_by_name),
+        'removed': sorted(name for name in baseline_by_name if name not in candidate_by_name),
+        'changed': sorted(name for name in candidate_by_name
+                          if name in baseline_by_name and candidate_by_name[name] != baseline_by_name[name]),
+    }
+
+
+def backtest(paths: Iterable[str], candidate_rules: List[Dict[str, Any]], baseline_rules: List[Dict[str, Any]],
+             log_type: str = 'auto', bucket_seconds: int = 3600, workers: Optional[int] = None,
+             chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+             progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """Replay log files through a candidate and a baseline rule set in parallel.
+
+    Files are split into byte-range chunks that worker processes stream
+    line by line, so memory use does not grow with the corpus size.
+    """
+    chunks = plan_chunks(paths, chunk_bytes)
+    tasks = [(path, start, end, candidate_rules, baseline_rules, log_type, bucket_seconds)
+             for path, start, end in chunks]
+
+    totals = {
+        'lines': 0, 'parse_errors': 0, 'untimed_events': 0,
+        'candidate_hits': Counter(), 'baseline_hits': Counter(),
+        'candidate_buckets': Counter(), 'baseline_buckets': Counter(),
+        'only_candidate': 0, 'only_baseline': 0, 'both': 0,
+    }
+    started_at = time.time()
+
+    workers = min(workers or os.cpu_count() or 1, max(len(tasks), 1))
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        results = pool.imap_unordered(backtest_chunk, tasks) if pool else map(backtest_chunk, tasks)
+        for done, result in enumerate(results, 1):
+            for key, value in result.items():
+                totals[key] += value
+            if progress:
+                progress({'chunks_total': len(tasks), 'chunks_done': done, 'lines': totals['lines'],
+                          'elapsed_seconds': round(time.time() - started_at, 3)})
+    finally:
+        if pool:
+            pool.terminate()
+            pool.join()
+
+    rule_names = [rule.get('name', 'unknown') for rule in candidate_rules]
+    rule_names += [rule.get('name', 'unknown') for rule in baseline_rules if rule.get('name') not in rule_names]
+    buckets = sorted(set(totals['candidate_buckets']) | set(totals['baseline_buckets']))
+    elapsed = time.time() - started_at
+
+    return {
+        'files': len(set(path for path, _, _ in chunks)),
+        'chunks': len(chunks),
+        'lines': totals['lines'],
+        'parse_errors': totals['parse_errors'],
+        'untimed_events': totals['untimed_events'],
+        'elapsed_seconds': round(elapsed, 3),
+        'lines_per_second': round(totals['lines'] / elapsed, 1) if elapsed > 0 else 0.0,
+        'rules': {
+            name: {
+                'candidate': totals['candidate_hits'].get(name, 0),
+                'baseline': totals['baseline_hits'].get(name, 0),
+                'delta': totals['candidate_hits'].get(name, 0) - totals['baseline_hits'].get(name, 0),
+            }
+            for name in rule_names
+        },
+        'timeline': [
+            {'bucket': bucket, 'candidate': totals['candidate_buckets'].get(bucket, 0),
+             'baseline': totals['baseline_buckets'].get(bucket, 0)}
+            for bucket in buckets
+        ],
+        'events': {
+            'only_candidate': totals['only_candidate'],
+            'only_baseline': totals['only_baseline'],
+            'both': totals['both'],
+        },
+        'rule_changes': diff_rules(candidate_rules, baseline_rules),
+    }
@@ -1,3 +1,4 @@
+import ipaddress
 import logging
 import re
 from typing import Dict, Any, List, Optional
@@ -83,6 +84,21 @@ class RulesEngine:
             logger.error(f"Error loading rules from file: {e}")
             self._load_default_rules()
 
+    def load_rules(self, rules_file: str):
+        """Load rules from a YAML file, raising instead of falling back to defaults"""
+        with open(rules_file, 'r') as f:
+            data = yaml.safe_load(f)
+        rules = data.get('rules') if isinstance(data, dict) else None
+        if not rules:
+            raise ValueError(f"No rules found in {rules_file}")
+        for index, rule in enumerate(rules):
+            if not isinstance(rule, dict) or not rule.get('name'):
+                raise ValueError(f"Rule #{index + 1} in {rules_file} has no name")
+        self.rules = rules
+        self.rules_file = rules_file
+        self._process_rules()
+        logger.info(f"Loaded {len(self.rules)} rules from {rules_file}")
+
     def _process_rules(self):
         for rule in self.rules:
             if 'condition' in rule:
@@ -116,62 +132,36 @@ class RulesEngine:
     def check_rules(self, event: Dict[str, Any]) -> List[Dict[str, Any]]:
         violations = []
         
+        for rule in self.match_rules(event):
+            violation = {
+                'rule_name': rule.get('name', 'unknown'),
+                'description': rule.get('description', ''),
+                'severity': rule.get('severity', 'medium'),
+                'matched_condition': rule.get('condition', ''),
+                'event': event,
+                'timestamp': datetime.utcnow().isoformat()
+            }
+            violations.append(violation)
+            logger.warning(f"Rule violation detected: {rule['name']}")
+        
+        return violations
+
+    def match_rules(self, event: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Rules matching the event, without building violations or logging them"""
+        matched = []
         for rule in self.rules:
             try:
                 if self._evaluate_rule(rule, event):
-                    violation = {
-                        'rule_name': rule.get('name', 'unknown'),
-                        'description': rule.get('description', ''),
-                        'severity': rule.get('severity', 'medium'),
-                        'matched_condition': rule.get('condition', ''),
-                        'event': event,
-                        'timestamp': datetime.utcnow().isoformat()
-                    }
-                    violations.append(violation)
-                    logger.warning(f"Rule violation detected: {rule['name']}")
+                    matched.append(rule)
             except Exception as e:
                 logger.error(f"Error evaluating rule {rule.get('name', 'unknown')}: {e}")
-        
-        return violations
+        return matched
 
     def _evaluate_rule(self, rule: Dict[str, Any], event: Dict[str, Any]) -> bool:
-        field = rule.get('field')
-        operator = rule.get('operator')
-        
-        if not field or field not in event:
-            return False
-        
-        event_value = event[field]
-        
-        if operator == '>':
-            threshold = rule.get('threshold', 0)
-            return float(event_value) > float(threshold) if self._is_numeric(event_value) else False
-        
-        elif operator == '<':
-            threshold = rule.get('threshold', 0)
-            return float(event_value) < float(threshold) if self._is_numeric(event_value) else False
-        
-        elif operator == '==':
-            return str(event_value) == str(rule.get('value', ''))
-        
-        elif operator == 'in':
-            blacklist = rule.get('blacklist', [])
-            values = rule.get('values', [])
-            check_list = blacklist or values
-            return event_value in check_list
-        
-        elif operator == 'regex':
-            pattern = rule.get('pattern', '')
-            return bool(re.match(pattern, str(event_value)))
-        
-        return False
+        return evaluate_condition(rule, event)
 
     def _is_numeric(self, value) -> bool:
-        try:
-            float(value)
-            return True
-        except (ValueError, TypeError):
-            return False
+        return _is_numeric(value)
 
     def add_rule(self, rule: Dict[str, Any]):
         self.rules.append(rule)
@@ -206,3 +196,70 @@ class RulesEngine:
             'severity_distribution': severity_counts,
             'rules_file': self.rules_file
         }
+
+
+def evaluate_condition(rule: Dict[str, Any], event: Dict[str, Any]) -> bool:
+    """Evaluate a single field/operator condition against an event.
+
+    Shared by rule matching and threat hunting so both interpret conditions
+    the same way.
+    """
+    field = rule.get('field')
+    operator = rule.get('operator')
+
+    if not field or field not in event:
+        return False
+
+    event_value = event[field]
+
+    if operator in ('>', '<', '>=', '<='):
+        if not _is_numeric(event_value):
+            return False
+        value = float(event_value)
+        threshold = float(rule.get('threshold', 0))
+        if operator == '>':
+            return value > threshold
+        if operator == '<':
+            return value < threshold
+        if operator == '>=':
+            return value >= threshold
+        return value <= threshold
+
+    elif operator == '==':
+        return str(event_value) == str(rule.get('value', ''))
+
+    elif operator == '!=':
+        return str(event_value) != str(rule.get('value', ''))
+
+    elif operator == 'in':
+        blacklist = rule.get('blacklist', [])
+        values = rule.get('values', [])
+        check_list = blacklist or values
+        if event_value in check_list:
+            return True
+        # Hunt queries compare members as text like == does, so port 22 matches '22'
+        text_values = rule.get('text_values')
+        return text_values is not None and str(event_value) in text_values
+
+    elif operator == 'regex':
+        pattern = rule.get('pattern', '')
+        return bool(re.match(pattern, str(event_value)))
+
+    elif operator == 'cidr':
+        network = rule.get('_network')
+        if network is None:
+            network = rule['_network'] = ipaddress.ip_network(rule.get('network', ''), strict=False)
+        try:
+            return ipaddress.ip_address(str(event_value)) in network
+        except ValueError:
+            return False
+
+    return False
+
+
+def _is_numeric(value) -> bool:
+    try:
+        float(value)
+        return True
+    except (ValueError, TypeError):
+        return False
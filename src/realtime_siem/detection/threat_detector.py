@@ -1,16 +1,24 @@
 """Main threat detection engine"""
 
+from time import perf_counter
+
 from .rules_engine import RulesEngine
 from .anomaly_detector import AnomalyDetector
 
 class ThreatDetector:
     """Main threat detection engine"""
     
-    def __init__(self, config=None):
+    def __init__(self, config=None, metrics=None):
         self.config = config
         # Initialize with simple implementations
         self.rules_engine = RulesEngine(config)
         self.anomaly_detector = AnomalyDetector(config)
+        # Per-stage latency histograms when a MetricsRegistry is supplied
+        self.rules_seconds = None
+        self.anomaly_seconds = None
+        if metrics is not None:
+            self.rules_seconds = metrics.histogram('siem_stage_seconds', 'Time spent per pipeline stage', stage='rules')
+            self.anomaly_seconds = metrics.histogram('siem_stage_seconds', 'Time spent per pipeline stage', stage='anomaly')
         
     def detect(self, event):
         """Detect threats in a single event"""
@@ -20,13 +28,18 @@ class ThreatDetector:
         """Analyze a single event for threats"""
         threats = []
         
-        # Rule-based detection
-        rule_threats = self.rules_engine.check_rules(event)
-        threats.extend(rule_threats)
-        
-        # Anomaly detection
-        anomaly_threats = self.anomaly_detector.detect_anomalies(event)
-        threats.extend(anomaly_threats)
+        if self.rules_seconds is None:
+            # Rule-based detection
+            threats.extend(self.rules_engine.check_rules(event))
+            # Anomaly detection
+            threats.extend(self.anomaly_detector.detect_anomalies(event))
+        else:
+            start = perf_counter()
+            threats.extend(self.rules_engine.check_rules(event))
+            rules_done = perf_counter()
+            threats.extend(self.anomaly_detector.detect_anomalies(event))
+            self.rules_seconds.observe(rules_done - start)
+            self.anomaly_seconds.observe(perf_counter() - rules_done)
         
         # Basic rule checking as fallback
         if not threats and self._check_basic_rules(event):
@@ -0,0 +1,6 @@
+from .pipeline import IngestPipeline
+from .syslog import SyslogServer
+from .http import HTTPIngestServer
+from .tailer import FileTailer
+
+__all__ = ["IngestPipeline", "SyslogServer", "HTTPIngestServer", "FileTailer"]
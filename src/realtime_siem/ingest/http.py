@@ -0,0 +1,308 @@
+import json
+import logging
+import threading
+import zlib
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, Any, Iterator, List, Optional
+
+from .pipeline import IngestPipeline
+
+logger = logging.getLogger(__name__)
+
+READ_SIZE = 64 * 1024
+
+
+class Throttled(Exception):
+    """The pipeline stayed full for longer than ingest.http.put_timeout_seconds"""
+
+
+class BodyError(Exception):
+    """The request body is not valid for its Content-Encoding or framing"""
+
+
+class BodyTooLarge(BodyError):
+    """The decoded body is larger than ingest.http.max_body_bytes"""
+
+
+def read_body(rfile, length: Optional[int], chunked: bool) -> Iterator[bytes]:
+    """Yield the raw request body in pieces of at most READ_SIZE"""
+    if chunked:
+        while True:
+            size_line = rfile.readline(1024)
+            try:
+                size = int(size_line.split(b';', 1)[0].strip(), 16)
+            except ValueError:
+                raise BodyError('invalid chunk size')
+            if size == 0:
+                # Skip trailers
+                while rfile.readline(1024) not in (b'\r\n', b'\n', b''):
+                    pass
+                return
+            while size:
+                data = rfile.read(min(size, READ_SIZE))
+                if not data:
+                    raise BodyError('body ended inside a chunk')
+                size -= len(data)
+                yield data
+            rfile.readline(1024)
+        return
+    remaining = length or 0
+    while remaining:
+        data = rfile.read(min(remaining, READ_SIZE))
+        if not data:
+            raise BodyError('body shorter than Content-Length')
+        remaining -= len(data)
+        yield data
+
+
+def gunzip(pieces: Iterator[bytes], max_bytes: Optional[int] = None) -> Iterator[bytes]:
+    """Decompress a gzip stream incrementally, including concatenated members.
+
+    Output comes in pieces of at most READ_SIZE, and never more than one
+    byte past max_bytes, so a small piece of a gzip bomb cannot expand in
+    memory before the size limit applies.
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    total = 0
+    for piece in pieces:
+        while True:
+            limit = READ_SIZE if max_bytes is None else min(READ_SIZE, max_bytes - total + 1)
+            try:
+                data = decompressor.decompress(piece, limit)
+            except zlib.error as e:
+                raise BodyError(f'invalid gzip data: {e}')
+            if data:
+                total += len(data)
+                if max_bytes is not None and total > max_bytes:
+                    raise BodyTooLarge(f'body larger than {max_bytes} bytes once decompressed')
+                yield data
+            if decompressor.eof:
+                piece = decompressor.unused_data
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                if not piece:
+                    break
+            else:
+                piece = decompressor.unconsumed_tail
+                # A full output piece may leave more output pending even with no input left
+                if not piece and len(data) < limit:
+                    break
+
+
+def split_lines(pieces: Iterator[bytes], max_line: int) -> Iterator[Optional[bytes]]:
+    """Yield complete NDJSON lines; None stands for a line longer than max_line"""
+    pending = b''
+    skipping = False
+    for piece in pieces:
+        lines = (pending + piece).split(b'\n')
+        pending = lines.pop()
+        for line in lines:
+            if skipping:
+                skipping = False
+                yield None
+            elif len(line) > max_line:
+                yield None
+            else:
+                yield line
+        if len(pending) > max_line:
+            # Drop the oversized line as it streams in instead of buffering it
+            pending = b''
+            skipping = True
+    if skipping:
+        yield None
+    elif pending.strip():
+        yield pending if len(pending) <= max_line else None
+
+
+class HTTPIngestServer(ThreadingHTTPServer):
+    """Bulk NDJSON input over HTTP.
+
+    ``POST /ingest`` takes newline-delimited JSON events, optionally with
+    ``Content-Encoding: gzip`` and chunked transfer encoding. The body is
+    decompressed and split as it is read and handed to the IngestPipeline
+    in ingest.batch_size batches, so memory use does not depend on the body
+    size. When the pipeline stays full the request is answered with 429 and
+    the number of lines accepted so far; the client resends from there.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, pipeline: IngestPipeline, config=None, host: Optional[str] = None,
+                 port: Optional[int] = None):
+        get = (config or {}).get
+        self.pipeline = pipeline
+        self.log_type = get('ingest.http.log_type', 'json')
+        self.put_timeout = get('ingest.http.put_timeout_seconds', 1.0)
+        self.max_line = get('ingest.http.max_line_bytes', 1024 * 1024)
+        self.max_body = get('ingest.http.max_body_bytes', 256 * 1024 * 1024)
+        self.retry_after = get('ingest.http.retry_after_seconds', 1)
+        self._thread: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+
+        self.requests = 0
+        self.throttled = 0
+        self.bytes_received = 0
+        self.bytes_decoded = 0
+        self.lines = 0
+        self.invalid = 0
+        super().__init__((host or get('ingest.http.host', '127.0.0.1'),
+                          get('ingest.http.port', 8088) if port is None else port), HTTPIngestHandler)
+
+    @property
+    def address(self):
+        return self.server_address
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.serve_forever, name='http-ingest', daemon=True)
+            self._thread.start()
+            logger.info(f"HTTP ingest listening on {self.address}")
+
+    def stop(self, timeout: float = 5.0):
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join(timeout)
+            self._thread = None
+        self.server_close()
+
+    def count(self, **deltas):
+        with self._stats_lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'bytes_received': self.bytes_received,
+            'bytes_decoded': self.bytes_decoded,
+            'lines': self.lines,
+            'invalid': self.invalid,
+        }
+
+
+class HTTPIngestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        if self.path.split('?', 1)[0] != '/ingest':
+            self.send_json({'error': 'not found'}, 404)
+            return
+        server = self.server
+        encoding = self.headers.get('Content-Encoding', 'identity').strip().lower()
+        if encoding not in ('identity', 'gzip'):
+            self.send_json({'error': f'unsupported Content-Encoding {encoding}'}, 415)
+            return
+        chunked = 'chunked' in self.headers.get('Transfer-Encoding', '').lower()
+        length = self.headers.get('Content-Length')
+        if not chunked and (length is None or not length.isdigit()):
+            self.send_json({'error': 'Content-Length or chunked encoding required'}, 411)
+            return
+        server.count(requests=1)
+        if not chunked and encoding == 'identity' and int(length) > server.max_body:
+            self.close_connection = True
+            self.send_json({'error': f'body larger than {server.max_body} bytes'}, 413, {'Connection': 'close'})
+            return
+        # Lines of the body fully handled; a throttled client resends from here
+        self.committed = 0
+        if server.pipeline.queue.full():
+            # Nothing read yet: refuse the whole body up front
+            self.throttle({'accepted': 0, 'rejected': 0, 'invalid': 0, 'batches': []})
+            return
+
+        result = {'accepted': 0, 'rejected': 0, 'invalid': 0, 'batches': []}
+        received = [0]
+
+        def counted(pieces):
+            for piece in pieces:
+                received[0] += len(piece)
+                yield piece
+
+        def decoded(pieces):
+            total = 0
+            for piece in pieces:
+                total += len(piece)
+                if total > server.max_body:
+                    raise BodyTooLarge(f'body larger than {server.max_body} bytes')
+                server.count(bytes_decoded=len(piece))
+                yield piece
+
+        body = counted(read_body(self.rfile, None if chunked else int(length), chunked))
+        if encoding == 'gzip':
+            body = gunzip(body, server.max_body)
+        try:
+            self.ingest(split_lines(decoded(body), server.max_line), result)
+        except Throttled:
+            server.count(bytes_received=received[0])
+            self.throttle(result)
+            return
+        except BodyError as e:
+            server.count(bytes_received=received[0])
+            self.close_connection = True
+            result['error'] = str(e)
+            self.send_json(result, 413 if isinstance(e, BodyTooLarge) else 400)
+            return
+        server.count(bytes_received=received[0])
+        self.send_json(result)
+
+    def ingest(self, lines: Iterator[Optional[bytes]], result: Dict[str, Any]):
+        server = self.server
+        size = server.pipeline.batch_size
+        batch: List[str] = []
+        invalid = 0
+        seen = 0
+        for line in lines:
+            seen += 1
+            if line is None:
+                invalid += 1
+                continue
+            try:
+                text = line.decode('utf-8').strip()
+            except UnicodeDecodeError:
+                invalid += 1
+                continue
+            if not text:
+                continue
+            if text[0] != '{':
+                # Only JSON objects are events; the JSON parser does the full decode
+                invalid += 1
+                continue
+            batch.append(text)
+            if len(batch) >= size:
+                self.put(batch, invalid, seen, result)
+                batch, invalid = [], 0
+        if batch or invalid:
+            self.put(batch, invalid, seen, result)
+
+    def put(self, batch: List[str], invalid: int, seen: int, result: Dict[str, Any]):
+        server = self.server
+        result['invalid'] += invalid
+        server.count(invalid=invalid)
+        if batch and not server.pipeline.put(batch, server.log_type, timeout=server.put_timeout):
+            result['rejected'] += len(batch)
+            result['batches'].append({'accepted': 0, 'rejected': len(batch), 'invalid': invalid})
+            raise Throttled()
+        result['accepted'] += len(batch)
+        self.committed = seen
+        server.count(lines=len(batch))
+        result['batches'].append({'accepted': len(batch), 'rejected': 0, 'invalid': invalid})
+
+    def throttle(self, result: Dict[str, Any]):
+        # The rest of the body is unread, so the connection cannot be reused
+        self.server.count(throttled=1)
+        self.close_connection = True
+        result['resume_from_line'] = self.committed
+        self.send_json(result, 429, {'Retry-After': str(self.server.retry_after), 'Connection': 'close'})
+
+    def send_json(self, data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,106 @@
+import logging
+import queue
+import threading
+from typing import Dict, Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class IngestPipeline:
+    """Bounded hand-off from network listeners to the engine.
+
+    Listeners offer batches of raw lines without blocking; a worker thread
+    feeds them to ``process(line, log_type)``, or ``process(line, log_type,
+    source)`` for batches queued with a source. When the queue is full, offer()
+    refuses the batch and the listener applies its own backpressure (pausing
+    a TCP connection, dropping a UDP datagram). Drain listeners are told when
+    the worker frees space after a refusal.
+    """
+
+    def __init__(self, process: Callable[[str, str], Any], config=None):
+        get = (config or {}).get
+        self.process = process
+        self.batch_size = get('ingest.batch_size', 500)
+        self.queue: queue.Queue = queue.Queue(maxsize=get('ingest.queue_batches', 200))
+
+        self._drain_listeners: List[Callable[[], None]] = []
+        self._refused = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.accepted = 0
+        self.rejected = 0
+        self.processed = 0
+        self.batches = 0
+
+    def offer(self, lines: List[str], log_type: str = 'syslog') -> bool:
+        """Queue a batch if there is room; never blocks"""
+        try:
+            self.queue.put_nowait((lines, log_type, None))
+        except queue.Full:
+            self._refused.set()
+            self.rejected += len(lines)
+            return False
+        self.accepted += len(lines)
+        return True
+
+    def put(self, lines: List[str], log_type: str = 'syslog', timeout: Optional[float] = None,
+            source: Optional[str] = None) -> bool:
+        """Queue a batch, waiting up to timeout for room"""
+        try:
+            self.queue.put((lines, log_type, source), timeout=timeout)
+        except queue.Full:
+            self._refused.set()
+            self.rejected += len(lines)
+            return False
+        self.accepted += len(lines)
+        return True
+
+    def add_drain_listener(self, listener: Callable[[], None]):
+        self._drain_listeners.append(listener)
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='ingest-pipeline', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Process what is already queued, then stop"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not (self._stop.is_set() and self.queue.empty()):
+            try:
+                lines, log_type, source = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if self._refused.is_set():
+                # A listener is holding data back; tell it there is room again
+                self._refused.clear()
+                for listener in self._drain_listeners:
+                    try:
+                        listener()
+                    except Exception as e:
+                        logger.error(f"Ingest drain listener failed: {e}")
+            for line in lines:
+                try:
+                    if source is None:
+                        self.process(line, log_type)
+                    else:
+                        self.process(line, log_type, source)
+                except Exception as e:
+                    logger.error(f"Ingest processing failed: {e}")
+            self.processed += len(lines)
+            self.batches += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'queued_batches': self.queue.qsize(),
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'processed': self.processed,
+            'batches': self.batches,
+        }
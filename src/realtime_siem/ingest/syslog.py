@@ -0,0 +1,307 @@
+import asyncio
+import logging
+import socket
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from .pipeline import IngestPipeline
+
+logger = logging.getLogger(__name__)
+
+
+def split_frames(buffer: bytearray, max_message: int) -> Tuple[List[bytes], int]:
+    """Split complete syslog frames off the front of a TCP stream buffer.
+
+    Supports both RFC 6587 framings: octet counting ("<len> <msg>", used when
+    the frame starts with a digit) and LF-terminated messages. Returns the
+    messages and how many bytes of buffer they used; an unterminated message
+    longer than max_message is cut off there.
+    """
+    messages = []
+    pos = 0
+    end = len(buffer)
+    while pos < end:
+        if 48 <= buffer[pos] <= 57:
+            space = buffer.find(b' ', pos, min(pos + 11, end))
+            if space != -1 and buffer[pos:space].isdigit():
+                length = int(buffer[pos:space])
+                if space + 1 + length > end:
+                    break
+                messages.append(bytes(buffer[space + 1:space + 1 + length]))
+                pos = space + 1 + length
+                continue
+            if space == -1 and end - pos < 11 and buffer[pos:end].isdigit():
+                # Octet count not complete yet
+                break
+        newline = buffer.find(b'\n', pos)
+        if newline == -1:
+            if end - pos >= max_message:
+                messages.append(bytes(buffer[pos:pos + max_message]))
+                pos += max_message
+                continue
+            break
+        messages.append(bytes(buffer[pos:newline]))
+        pos = newline + 1
+    return messages, pos
+
+
+def decode(message: bytes) -> str:
+    return message.decode('utf-8', 'replace').rstrip('\r\n\x00')
+
+
+class _Batcher(ABC):
+    """Collects decoded messages and offers them to the pipeline in batches"""
+
+    def __init__(self, server: 'SyslogServer'):
+        self.server = server
+        self.lines: List[str] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def add(self, lines: List[str]):
+        self.lines.extend(lines)
+        if len(self.lines) >= self.server.pipeline.batch_size:
+            self.flush()
+        elif self.timer is None:
+            self.timer = self.server.loop.call_later(self.server.batch_interval, self.flush)
+
+    def take(self) -> List[str]:
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        lines, self.lines = self.lines, []
+        return lines
+
+    @abstractmethod
+    def flush(self):
+        """Hand the collected lines to the pipeline"""
+
+
+class _UDPBatcher(_Batcher):
+
+    def flush(self):
+        left = self.server.offer(self.take())
+        # UDP has no flow control; count what the engine could not take
+        self.server.udp_dropped += len(left)
+
+
+class _TCPBatcher(_Batcher):
+
+    def add(self, lines: List[str]):
+        if self.server.blocked is not None:
+            self.lines.extend(lines)
+            return
+        super().add(lines)
+
+    def flush(self):
+        if self.server.blocked is not None:
+            return
+        left = self.server.offer(self.take())
+        if left:
+            self.server.block(left)
+
+
+class _UDPProtocol(asyncio.DatagramProtocol):
+
+    def __init__(self, server: 'SyslogServer'):
+        self.server = server
+        self.batcher = _UDPBatcher(server)
+
+    def datagram_received(self, data: bytes, addr):
+        self.server.udp_received += 1
+        self.batcher.add([decode(data)])
+
+    def error_received(self, exc):
+        logger.debug(f"Syslog UDP error: {exc}")
+
+
+class _TCPProtocol(asyncio.Protocol):
+
+    def __init__(self, server: 'SyslogServer'):
+        self.server = server
+        self.buffer = bytearray()
+        self.transport: Optional[asyncio.Transport] = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server.connections.add(self)
+        self.server.tcp_connections += 1
+        if self.server.blocked is not None:
+            transport.pause_reading()
+
+    def connection_lost(self, exc):
+        if self.buffer:
+            # A final message without a trailing newline
+            self.server.tcp_batcher.add([decode(self.buffer)])
+            self.buffer.clear()
+        self.server.connections.discard(self)
+
+    def data_received(self, data: bytes):
+        self.buffer += data
+        messages, used = split_frames(self.buffer, self.server.max_message)
+        if used:
+            del self.buffer[:used]
+        if messages:
+            self.server.tcp_received += len(messages)
+            self.server.tcp_batcher.add([decode(m) for m in messages])
+
+
+class SyslogServer:
+    """Receives syslog over UDP and TCP on an asyncio loop in its own thread.
+
+    Messages are batched (ingest.batch_size or ingest.syslog.batch_interval_ms,
+    whichever comes first) and offered to the IngestPipeline. When the
+    pipeline is full, TCP connections stop reading, so senders are slowed by
+    TCP flow control, until the pipeline drains. UDP datagrams that do not
+    fit are dropped and counted.
+    """
+
+    def __init__(self, pipeline: IngestPipeline, config=None, host: Optional[str] = None,
+                 udp_port: Optional[int] = None, tcp_port: Optional[int] = None):
+        get = (config or {}).get
+        self.pipeline = pipeline
+        self.host = host or get('ingest.syslog.host', '0.0.0.0')
+        self.udp_port = get('ingest.syslog.udp_port', 5140) if udp_port is None else udp_port
+        self.tcp_port = get('ingest.syslog.tcp_port', 5140) if tcp_port is None else tcp_port
+        self.batch_interval = get('ingest.syslog.batch_interval_ms', 50) / 1000.0
+        self.max_message = get('ingest.syslog.max_message_bytes', 65536)
+        self.udp_buffer_bytes = get('ingest.syslog.udp_receive_buffer_bytes', 4 * 1024 * 1024)
+        self.log_type = get('ingest.syslog.log_type', 'syslog')
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.connections: Set[_TCPProtocol] = set()
+        self.blocked: Optional[List[str]] = None
+        self.tcp_batcher = _TCPBatcher(self)
+        self.udp_address: Optional[Tuple[str, int]] = None
+        self.tcp_address: Optional[Tuple[str, int]] = None
+        self._udp_transport = None
+        self._udp_protocol: Optional[_UDPProtocol] = None
+        self._tcp_server = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._error: Optional[BaseException] = None
+
+        self.udp_received = 0
+        self.udp_dropped = 0
+        self.tcp_received = 0
+        self.tcp_connections = 0
+        self.tcp_pauses = 0
+
+        pipeline.add_drain_listener(self._on_drain)
+
+    def start(self):
+        """Bind the listeners; raises if a port cannot be bound"""
+        if self._thread is not None:
+            return
+        self._started.clear()
+        self._thread = threading.Thread(target=self._run, name='syslog-server', daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._error is not None:
+            error, self._error = self._error, None
+            self._thread.join()
+            self._thread = None
+            raise error
+        logger.info(f"Syslog listening on UDP {self.udp_address} and TCP {self.tcp_address}")
+
+    def stop(self, timeout: float = 5.0):
+        if self._thread is None:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._open())
+        except BaseException as e:
+            self._error = e
+            self.loop.close()
+            self._started.set()
+            return
+        self._started.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self._close()
+            self.loop.close()
+
+    async def _open(self):
+        if self.udp_port is not None:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.udp_buffer_bytes)
+            except OSError:
+                pass
+            sock.bind((self.host, self.udp_port))
+            self._udp_transport, self._udp_protocol = await self.loop.create_datagram_endpoint(
+                lambda: _UDPProtocol(self), sock=sock)
+            self.udp_address = sock.getsockname()
+        if self.tcp_port is not None:
+            self._tcp_server = await self.loop.create_server(
+                lambda: _TCPProtocol(self), self.host, self.tcp_port, reuse_address=True)
+            self.tcp_address = self._tcp_server.sockets[0].getsockname()
+
+    def _close(self):
+        # Hand over whatever is batched; wait for room rather than lose TCP data
+        if self._udp_transport is not None:
+            self._udp_protocol.batcher.flush()
+            self._udp_transport.close()
+        if self._tcp_server is not None:
+            self._tcp_server.close()
+        for connection in list(self.connections):
+            connection.transport.close()
+            connection.connection_lost(None)
+        pending = (self.blocked or []) + self.tcp_batcher.take()
+        if pending:
+            self.pipeline.put(pending, self.log_type, timeout=5.0)
+        self.blocked = None
+
+    def offer(self, lines: List[str]) -> List[str]:
+        """Offer lines to the pipeline in batch_size chunks; returns what did not fit"""
+        size = self.pipeline.batch_size
+        for start in range(0, len(lines), size):
+            if not self.pipeline.offer(lines[start:start + size], self.log_type):
+                return lines[start:]
+        return []
+
+    def block(self, lines: List[str]):
+        """The pipeline refused a TCP batch: hold it and stop reading"""
+        self.blocked = lines
+        self.tcp_pauses += 1
+        for connection in self.connections:
+            connection.transport.pause_reading()
+
+    def _on_drain(self):
+        # Called on the pipeline worker thread. The refused batch may not be
+        # recorded in self.blocked yet, so always let the loop thread re-check.
+        if self.loop is not None:
+            try:
+                self.loop.call_soon_threadsafe(self._retry)
+            except RuntimeError:
+                pass
+
+    def _retry(self):
+        if self.blocked is None:
+            return
+        self.blocked = self.offer(self.blocked) or None
+        if self.blocked is not None:
+            return
+        for connection in self.connections:
+            connection.transport.resume_reading()
+        if self.tcp_batcher.lines:
+            self.tcp_batcher.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'udp_received': self.udp_received,
+            'udp_dropped': self.udp_dropped,
+            'tcp_received': self.tcp_received,
+            'tcp_connections': self.tcp_connections,
+            'tcp_open_connections': len(self.connections),
+            'tcp_pauses': self.tcp_pauses,
+            'tcp_paused': self.blocked is not None,
+        }
@@ -0,0 +1,281 @@
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _key(identity: Tuple[int, int]) -> str:
+    return f'{identity[0]}:{identity[1]}'
+
+
+class _TailedFile:
+    """An open file and how far into it complete lines have been delivered"""
+
+    def __init__(self, path: str, handle, identity: Tuple[int, int], offset: int):
+        self.path = path
+        self.handle = handle
+        self.identity = identity
+        self.offset = offset
+        self.partial = b''
+        self.handle.seek(offset)
+
+    def read(self, size: int, max_line: int) -> List[bytes]:
+        data = self.handle.read(size)
+        if not data:
+            return []
+        lines = (self.partial + data).split(b'\n')
+        self.partial = lines.pop()
+        if len(self.partial) > max_line:
+            # No newline in sight; deliver what we have rather than grow without bound
+            lines.append(self.partial)
+            self.partial = b''
+        self.offset += len(data)
+        return lines
+
+    @property
+    def committed(self) -> int:
+        """Offset of the first byte not yet delivered as part of a complete line"""
+        return self.offset - len(self.partial)
+
+    def close(self):
+        self.handle.close()
+
+
+class FileTailer:
+    """Follows many files and globs from one thread.
+
+    Each pass re-stats every file, reads new data in tailer.read_bytes
+    chunks and hands complete lines to ``emit(lines, path)``. A path that
+    now names a different inode was rotated: the old file is read to its
+    end first, then the new one from the start. A file that shrank was
+    truncated and is read again from the start. Delivered byte offsets are
+    checkpointed to tailer.checkpoint_path by device and inode, so a
+    restart resumes after the last delivered line even if the file has
+    since been renamed; files seen for the first time start at
+    tailer.start_at (beginning or end).
+    """
+
+    # Rotated-out files remembered so a glob that also matches them does not re-read them
+    MAX_FINISHED = 100
+
+    def __init__(self, emit: Callable[[List[str], str], Any], config=None,
+                 patterns: Optional[Sequence[str]] = None):
+        get = (config or {}).get
+        self.emit = emit
+        self.patterns = list(patterns if patterns is not None else get('tailer.paths', []) or [])
+        self.read_bytes = get('tailer.read_bytes', 1024 * 1024)
+        self.max_line = get('tailer.max_line_bytes', 1024 * 1024)
+        self.poll_interval = get('tailer.poll_interval_seconds', 0.25)
+        self.rescan_interval = get('tailer.rescan_interval_seconds', 5.0)
+        self.checkpoint_interval = get('tailer.checkpoint_interval_seconds', 1.0)
+        self.start_at = get('tailer.start_at', 'beginning')
+        checkpoint = get('tailer.checkpoint_path', 'data/tailer_offsets.json')
+        self.checkpoint_path = Path(checkpoint) if checkpoint else None
+
+        self.files: Dict[str, _TailedFile] = {}
+        # "dev:ino" -> {"path", "offset"} for files no longer open
+        self._finished: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict(self._load_checkpoints())
+        self._last_scan = 0.0
+        self._last_checkpoint = time.monotonic()
+        self._dirty = False
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.lines = 0
+        self.bytes = 0
+        self.rotations = 0
+        self.truncations = 0
+
+    # Checkpoints
+
+    def _load_checkpoints(self) -> Dict[str, Dict[str, Any]]:
+        if self.checkpoint_path is None or not self.checkpoint_path.exists():
+            return {}
+        try:
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable tailer checkpoint {self.checkpoint_path}: {e}")
+            return {}
+
+    def checkpoint(self):
+        """Write delivered offsets; the file is replaced atomically"""
+        self._last_checkpoint = time.monotonic()
+        self._dirty = False
+        if self.checkpoint_path is None:
+            return
+        offsets = dict(self._finished)
+        for tailed in self.files.values():
+            offsets[_key(tailed.identity)] = {'path': tailed.path, 'offset': tailed.committed}
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.checkpoint_path.with_name(self.checkpoint_path.name + '.tmp')
+        with open(temporary, 'w') as f:
+            json.dump(offsets, f)
+        os.replace(temporary, self.checkpoint_path)
+
+    def _finish(self, tailed: _TailedFile):
+        self._finished[_key(tailed.identity)] = {'path': tailed.path, 'offset': tailed.committed}
+        while len(self._finished) > self.MAX_FINISHED:
+            self._finished.popitem(last=False)
+
+    # Files
+
+    def _scan(self):
+        self._last_scan = time.monotonic()
+        for pattern in self.patterns:
+            for path in sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]:
+                if path not in self.files and os.path.isfile(path):
+                    self._open(path, initial=True)
+
+    def _is_open(self, identity: Tuple[int, int]) -> bool:
+        return any(tailed.identity == identity for tailed in self.files.values())
+
+    def _open(self, path: str, initial: bool):
+        try:
+            handle = open(path, 'rb')
+        except OSError as e:
+            logger.warning(f"Cannot open {path}: {e}")
+            return
+        stat = os.fstat(handle.fileno())
+        identity = (stat.st_dev, stat.st_ino)
+        if self._is_open(identity):
+            # The file being followed under its old name, matched again after rotation
+            handle.close()
+            return
+        saved = self._finished.pop(_key(identity), None)
+        if saved and saved['offset'] <= stat.st_size:
+            offset = saved['offset']
+        elif initial and saved is None and self.start_at == 'end' and not self._known(path):
+            offset = stat.st_size
+        else:
+            # A new file, or one truncated while we were not running
+            offset = 0
+        self.files[path] = _TailedFile(path, handle, identity, offset)
+        self._dirty = True
+        logger.info(f"Tailing {path} from offset {offset}")
+
+    def _known(self, path: str) -> bool:
+        return any(entry['path'] == path for entry in self._finished.values())
+
+    def _deliver(self, tailed: _TailedFile, lines: List[bytes]) -> int:
+        decoded = [line.decode('utf-8', 'replace').rstrip('\r') for line in lines]
+        decoded = [line for line in decoded if line]
+        if decoded:
+            self.emit(decoded, tailed.path)
+            self.lines += len(decoded)
+            self._dirty = True
+        return len(decoded)
+
+    def _read_available(self, tailed: _TailedFile, budget: int) -> int:
+        """Read up to budget chunks; returns the number of lines delivered"""
+        delivered = 0
+        for _ in range(budget):
+            before = tailed.offset
+            lines = tailed.read(self.read_bytes, self.max_line)
+            self.bytes += tailed.offset - before
+            if tailed.offset == before:
+                break
+            delivered += self._deliver(tailed, lines)
+        return delivered
+
+    def _check_rotation(self, tailed: _TailedFile) -> int:
+        try:
+            stat = os.stat(tailed.path)
+        except FileNotFoundError:
+            # Renamed away and not recreated yet; keep reading the open file
+            return 0
+        if (stat.st_dev, stat.st_ino) != tailed.identity:
+            delivered = self._read_available(tailed, budget=1 << 30)
+            if tailed.partial:
+                # The writer has moved on; the last line will never get its newline
+                delivered += self._deliver(tailed, [tailed.partial])
+                tailed.partial = b''
+            tailed.close()
+            del self.files[tailed.path]
+            self._finish(tailed)
+            self.rotations += 1
+            logger.info(f"{tailed.path} was rotated; following the new file")
+            self._open(tailed.path, initial=False)
+            return delivered
+        if stat.st_size < tailed.offset:
+            self.truncations += 1
+            logger.info(f"{tailed.path} was truncated; reading from the start")
+            tailed.offset = 0
+            tailed.partial = b''
+            tailed.handle.seek(0)
+            self._dirty = True
+        return 0
+
+    def poll(self) -> int:
+        """One pass over all files; returns the number of lines delivered"""
+        if not self.files or time.monotonic() - self._last_scan >= self.rescan_interval:
+            self._scan()
+        delivered = 0
+        for tailed in list(self.files.values()):
+            delivered += self._check_rotation(tailed)
+            tailed = self.files.get(tailed.path)
+            if tailed is not None:
+                # A few chunks per file per pass keeps one busy file from starving the rest
+                delivered += self._read_available(tailed, budget=4)
+        if self._dirty and time.monotonic() - self._last_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+        return delivered
+
+    def drain(self) -> int:
+        """Poll until every file is read to its current end"""
+        total = 0
+        while True:
+            delivered = self.poll()
+            if not delivered and all(t.handle.tell() >= os.fstat(t.handle.fileno()).st_size
+                                     for t in self.files.values()):
+                return total
+            total += delivered
+
+    # Background thread
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='file-tailer', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.close()
+
+    def close(self):
+        if self.files:
+            self.checkpoint()
+        for tailed in self.files.values():
+            tailed.close()
+            self._finish(tailed)
+        self.files.clear()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                delivered = self.poll()
+            except Exception as e:
+                logger.error(f"File tailer error: {e}")
+                delivered = 0
+            if not delivered:
+                self._stop.wait(self.poll_interval)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'files': len(self.files),
+            'lines': self.lines,
+            'bytes': self.bytes,
+            'rotations': self.rotations,
+            'truncations': self.truncations,
+        }
@@ -14,8 +14,16 @@ def cli():
 
 @cli.command()
 @click.option('--config', default='config/siem_config.yaml', help='Configuration file path')
-def start(config):
+@click.option('--syslog/--no-syslog', default=None, help='Listen for syslog (default: ingest.syslog.enabled)')
+@click.option('--syslog-host', help='Syslog listen address (default: ingest.syslog.host)')
+@click.option('--syslog-port', type=int, help='Syslog UDP and TCP port (default: ingest.syslog.udp_port/tcp_port)')
+@click.option('--http/--no-http', 'http', default=None, help='Accept NDJSON on POST /ingest (default: ingest.http.enabled)')
+@click.option('--http-host', help='HTTP ingest listen address (default: ingest.http.host)')
+@click.option('--http-port', type=int, help='HTTP ingest port (default: ingest.http.port)')
+def start(config, syslog, syslog_host, syslog_port, http, http_host, http_port):
     """Start the SIEM system"""
+    import time
+    from .ingest import SyslogServer, HTTPIngestServer
     click.echo("Starting Real-Time SIEM System...")
     
     # Load configuration
@@ -23,7 +31,30 @@ def start(config):
     
     # Initialize and start SIEM core
     siem = SIEMCore(config_manager)
+    if syslog is False:
+        siem.syslog = None
+    elif syslog or syslog_host or syslog_port:
+        siem.syslog = SyslogServer(siem.ingest, config_manager, host=syslog_host,
+                                   udp_port=syslog_port, tcp_port=syslog_port)
+    if siem.http_ingest and (http is False or http_host or http_port):
+        # Bound from the config file; release it before rebinding elsewhere
+        siem.http_ingest.server_close()
+        siem.http_ingest = None
+    if http is not False and (http or http_host or http_port) and siem.http_ingest is None:
+        siem.http_ingest = HTTPIngestServer(siem.ingest, config_manager, host=http_host, port=http_port)
     siem.start()
+    if siem.syslog:
+        click.echo(f"Syslog listening on UDP {siem.syslog.udp_address} and TCP {siem.syslog.tcp_address}")
+    if siem.http_ingest:
+        click.echo(f"HTTP ingest listening on http://{siem.http_ingest.address[0]}:{siem.http_ingest.address[1]}/ingest")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        click.echo("Stopping...")
+    finally:
+        siem.stop()
 
 @cli.command()
 def status():
@@ -32,15 +63,198 @@ def status():
 
 @cli.command()
 @click.option('--rule-file', help='Path to rule file to validate')
-def validate_rules(rule_file):
-    """Validate detection rules"""
+@click.option('--backtest', 'logs', multiple=True, type=click.Path(exists=True, dir_okay=False),
+              help='Replay this log file (repeatable, .gz/.bz2/.xz/.zst allowed) through the rules')
+@click.option('--baseline', help='Deployed rule file to compare against (defaults to detection.rules_file)')
+@click.option('--config', default='config/siem_config.yaml', help='Configuration file path')
+@click.option('--log-type', type=click.Choice(['auto', 'syslog', 'json', 'default']), default='auto',
+              help='Parser for the replayed logs')
+@click.option('--bucket-seconds', type=int, default=3600, help='Alert volume bucket size')
+@click.option('--workers', type=int, help='Number of replay processes (default: CPU count)')
+@click.option('--json', 'as_json', is_flag=True, help='Print the backtest report as JSON')
+def validate_rules(rule_file, logs, baseline, config, log_type, bucket_seconds, workers, as_json):
+    """Validate detection rules, optionally backtesting them against historical logs"""
     from .detection.rules_engine import RulesEngine
     engine = RulesEngine()
     try:
-        engine.load_rules(rule_file)
-        click.echo("✓ Rules validation successful")
+        if rule_file:
+            engine.load_rules(rule_file)
+        click.echo("✓ Rules validation successful", err=bool(logs))
     except Exception as e:
         click.echo(f"✗ Rules validation failed: {e}")
+        raise SystemExit(1)
+
+    if not logs:
+        return
+
+    import json
+    from datetime import datetime
+    from .detection.backtest import backtest
+
+    config_manager = ConfigManager(config_path=config)
+    baseline = baseline or config_manager.get('detection.rules_file')
+    deployed = RulesEngine()
+    if baseline:
+        # Comparing against the built-in defaults by accident would make every delta meaningless
+        try:
+            deployed.load_rules(baseline)
+        except FileNotFoundError:
+            raise click.BadParameter(f"baseline rules file {baseline} does not exist", param_hint='--baseline')
+        except Exception as e:
+            raise click.BadParameter(f"cannot load baseline rules: {e}", param_hint='--baseline')
+
+    def report(state):
+        click.echo(f"[{state['chunks_done']}/{state['chunks_total']} chunks] "
+                   f"{state['lines']} lines in {state['elapsed_seconds']}s", err=True)
+
+    result = backtest(logs, engine.rules, deployed.rules, log_type=log_type,
+                      bucket_seconds=bucket_seconds, workers=workers, progress=report)
+    if as_json:
+        click.echo(json.dumps(result, indent=2))
+        return
+
+    click.echo(f"Replayed {result['lines']} lines from {result['files']} file(s) "
+               f"in {result['elapsed_seconds']}s ({result['lines_per_second']} lines/s)")
+    click.echo(f"\n{'rule':<40} {'candidate':>10} {'deployed':>10} {'delta':>8}")
+    for name, hits in sorted(result['rules'].items(), key=lambda item: -abs(item[1]['delta'])):
+        click.echo(f"{name:<40} {hits['candidate']:>10} {hits['baseline']:>10} {hits['delta']:>+8}")
+
+    click.echo(f"\n{'bucket (UTC)':<20} {'candidate':>10} {'deployed':>10}")
+    for row in result['timeline']:
+        bucket = datetime.utcfromtimestamp(row['bucket']).strftime('%Y-%m-%d %H:%M')
+        click.echo(f"{bucket:<20} {row['candidate']:>10} {row['baseline']:>10}")
+    if result['untimed_events']:
+        click.echo(f"({result['untimed_events']} matching events had no parseable timestamp)")
+
+    events = result['events']
+    changes = result['rule_changes']
+    click.echo(f"\nEvents alerting only with candidate rules: {events['only_candidate']}, "
+               f"only with deployed rules: {events['only_baseline']}, with both: {events['both']}")
+    for kind in ('added', 'removed', 'changed'):
+        if changes[kind]:
+            click.echo(f"Rules {kind}: {', '.join(changes[kind])}")
+
+@cli.command()
+@click.argument('files', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--config', default='config/siem_config.yaml', help='Configuration file path')
+@click.option('--log-type', type=click.Choice(['auto', 'syslog', 'json', 'default']), default='auto',
+              help='Parser for the lines (auto guesses per line)')
+@click.option('--workers', type=int, help='Number of ingest processes (default: CPU count)')
+@click.option('--batch-size', type=int, default=500, help='Lines per pipeline batch')
+@click.option('--start-engine/--no-start-engine', default=True,
+              help='Start indexing, storage and notifications in each worker (off: detection only)')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON')
+def ingest(files, config, log_type, workers, batch_size, start_engine, as_json):
+    """Backfill plain, gzip, bz2, xz or zstd log files, one process per file"""
+    import json
+    from .ingest.archive import ingest_archives
+
+    def report(state):
+        click.echo(f"[{state['files_done']}/{state['files_total']}] {state['path']}: "
+                   f"{state['lines']} lines, {state['alerts']} alerts in {state['seconds']}s", err=True)
+
+    try:
+        result = ingest_archives(files, config, log_type=log_type, workers=workers, batch_size=batch_size,
+                                 start_engine=start_engine, progress=report)
+    except ValueError as e:
+        click.echo(f"✗ {e}", err=True)
+        raise SystemExit(1)
+    if as_json:
+        click.echo(json.dumps(result, indent=2))
+        return
+    click.echo(f"Ingested {result['lines']} lines from {len(result['files'])} file(s) with "
+               f"{result['workers']} worker(s) in {result['elapsed_seconds']}s "
+               f"({result['lines_per_second']} lines/s, {result['file_mb_per_second']} MB/s on disk); "
+               f"{result['alerts']} alerts")
+
+@cli.command()
+@click.argument('expression')
+@click.option('--config', default='config/siem_config.yaml', help='Configuration file path')
+@click.option('--data-dir', help='Event store directory (defaults to storage.directory)')
+@click.option('--spool-dir', help='Also scan spooled events in this directory')
+@click.option('--since', help="Start of the time range: ISO time, epoch or age like '24h'")
+@click.option('--until', help="End of the time range: ISO time, epoch or age like '1h'")
+@click.option('--limit', type=int, help='Stop after this many matches')
+@click.option('--workers', type=int, help='Number of scan processes (default: CPU count)')
+@click.option('--progress/--no-progress', default=True, help='Report scan progress on stderr')
+def hunt(expression, config, data_dir, spool_dir, since, until, limit, workers, progress):
+    """Hunt archived events matching EXPRESSION, e.g. 'source_ip in 10.0.0.0/8 and user == root'"""
+    import json
+    from .storage.hunt import hunt as run_hunt, parse_time, HuntSyntaxError
+
+    config_manager = ConfigManager(config_path=config)
+    data_dir = data_dir or config_manager.get('storage.directory', 'data/events')
+
+    def report(state):
+        click.echo(f"[{state['files_done']}/{state['files_total']} files] "
+                   f"{state['events_scanned']} scanned, {state['matches']} matched "
+                   f"in {state['elapsed_seconds']}s", err=True)
+
+    times = {}
+    for name, value in (('since', since), ('until', until)):
+        try:
+            times[name] = parse_time(value)
+        except ValueError:
+            raise click.BadParameter(f"'{value}' is not an ISO time, epoch seconds or an age like '24h'",
+                                     param_hint=f'--{name}')
+
+    try:
+        results = run_hunt(expression, directory=data_dir, spool_directory=spool_dir,
+                           start=times['since'], end=times['until'], limit=limit,
+                           workers=workers, progress=report if progress else None)
+        for event in results:
+            click.echo(json.dumps(event, default=str))
+    except HuntSyntaxError as e:
+        raise click.BadParameter(str(e), param_hint='EXPRESSION')
+
+@cli.command()
+@click.option('--url', default='http://localhost:8080', help='Dashboard server of the running SIEM')
+@click.option('--file', 'log_file', type=click.Path(exists=True, dir_okay=False),
+              help='Trace every line of this log file locally instead')
+@click.option('--config', default='config/siem_config.yaml', help='Configuration file path (with --file)')
+@click.option('--log-type', type=click.Choice(['auto', 'syslog', 'json', 'default']), default='default',
+              help='Parser for --file lines')
+@click.option('--limit', type=int, default=20, help='Number of spans to show')
+@click.option('--slowest', is_flag=True, help='Order by total time instead of newest first')
+@click.option('--json', 'as_json', is_flag=True, help='Print spans as JSON lines')
+def traces(url, log_file, config, log_type, limit, slowest, as_json):
+    """Show per-stage timings of traced events"""
+    import json
+    from .core.tracing import STAGES
+
+    if log_file:
+        import logging
+        logging.disable(logging.ERROR)
+        siem = SIEMCore(ConfigManager(config_path=config))
+        # Every line is kept; a hook collects them all rather than just the ring buffer's worth
+        spans = []
+        siem.tracer.configure(sample_every=1)
+        siem.tracer.add_hook(spans.append)
+        with open(log_file, 'r', errors='replace') as f:
+            for line in f:
+                if line.strip():
+                    siem.process_log(line.rstrip('\n'), log_type)
+        spans.sort(key=lambda span: span['total_ms'] if slowest else span['id'], reverse=True)
+        spans = spans[:limit]
+    else:
+        from urllib.request import urlopen
+        order = 'slowest' if slowest else 'newest'
+        try:
+            with urlopen(f"{url.rstrip('/')}/api/traces?limit={limit}&order={order}", timeout=10) as response:
+                spans = json.loads(response.read())['spans']
+        except OSError as e:
+            click.echo(f"✗ Could not fetch traces from {url}: {e}", err=True)
+            raise SystemExit(1)
+
+    if as_json:
+        for span in spans:
+            click.echo(json.dumps(span))
+        return
+    click.echo(f"{'total ms':>9} " + ' '.join(f'{name:>8}' for name in STAGES) + f" {'reason':<8} line")
+    for span in spans:
+        stages = span.get('stages_ms', {})
+        click.echo(f"{span['total_ms']:>9.3f} " + ' '.join(f"{stages.get(name, 0):>8.3f}" for name in STAGES)
+                   + f" {span['reason']:<8} {span['line'][:80]}")
 
 if __name__ == "__main__":
     cli()
\ No newline at end of file
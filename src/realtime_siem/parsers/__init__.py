@@ -1,3 +1,5 @@
 from .log_parser import LogParser
+from .router import ParserRouter, sniff
+from .templates import TemplateMiner
 
-__all__ = ["LogParser"]
\ No newline at end of file
+__all__ = ["LogParser", "ParserRouter", "sniff", "TemplateMiner"]
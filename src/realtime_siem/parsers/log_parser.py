@@ -3,6 +3,9 @@ import re
 from typing import Dict, Any
 from datetime import datetime
 
+from ..utils import json_codec
+from .templates import TemplateMiner
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,18 +33,38 @@ class SyslogParser(LogParser):
             r'(?P<hostname>\S+)\s+(?P<appname>\S+)\s+(?P<procid>\S+)\s+'
             r'(?P<msgid>\S+)\s+(?P<structured_data>\S+)\s*(?P<message>.*)$'
         )
+        enabled = config.get('parsers.templates.enabled', True) if config else True
+        self.templates = TemplateMiner(config) if enabled else None
     
     def parse(self, log_line: str) -> Dict[str, Any]:
         log_line = log_line.strip()
-        
-        rfc5424_match = self.rfc5424_pattern.match(log_line)
-        if rfc5424_match:
-            return self._parse_rfc5424(rfc5424_match, log_line)
-        
-        rfc3164_match = self.rfc3164_pattern.match(log_line)
-        if rfc3164_match:
-            return self._parse_rfc3164(rfc3164_match, log_line)
-        
+        # RFC 5424 has a version digit right after the PRI; try the likely pattern first
+        close = log_line.find('>', 2, 6)
+        if close != -1 and log_line[close + 1:close + 2].isdigit():
+            return self.parse_rfc5424(log_line)
+        return self.parse_rfc3164(log_line)
+
+    def parse_rfc5424(self, log_line: str) -> Dict[str, Any]:
+        log_line = log_line.strip()
+        match = self.rfc5424_pattern.match(log_line)
+        if match:
+            return self._parse_rfc5424(match, log_line)
+        match = self.rfc3164_pattern.match(log_line)
+        if match:
+            return self._parse_rfc3164(match, log_line)
+        return self._unknown_format(log_line)
+
+    def parse_rfc3164(self, log_line: str) -> Dict[str, Any]:
+        log_line = log_line.strip()
+        match = self.rfc3164_pattern.match(log_line)
+        if match:
+            return self._parse_rfc3164(match, log_line)
+        match = self.rfc5424_pattern.match(log_line)
+        if match:
+            return self._parse_rfc5424(match, log_line)
+        return self._unknown_format(log_line)
+
+    def _unknown_format(self, log_line: str) -> Dict[str, Any]:
         return {
             'message': log_line,
             'raw_message': log_line,
@@ -50,6 +73,13 @@ class SyslogParser(LogParser):
             'parse_status': 'unknown_format'
         }
     
+    def _add_template(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Template id and the fields the message template names; parsed fields win"""
+        if self.templates is not None and event['message']:
+            for key, value in self.templates.extract(event['message']).items():
+                event.setdefault(key, value)
+        return event
+
     def _parse_rfc3164(self, match: re.Match, raw_line: str) -> Dict[str, Any]:
         priority = int(match.group('priority'))
         facility = priority >> 3
@@ -68,7 +98,7 @@ class SyslogParser(LogParser):
             'message': match.group('message'),
             'raw_message': raw_line
         }
-        return event
+        return self._add_template(event)
     
     def _parse_rfc5424(self, match: re.Match, raw_line: str) -> Dict[str, Any]:
         priority = int(match.group('priority'))
@@ -91,7 +121,7 @@ class SyslogParser(LogParser):
             'message': match.group('message'),
             'raw_message': raw_line
         }
-        return event
+        return self._add_template(event)
 
 
 class JSONParser(LogParser):
@@ -99,16 +129,15 @@ class JSONParser(LogParser):
         super().__init__(config)
     
     def parse(self, log_line: str) -> Dict[str, Any]:
-        import json
         try:
-            parsed = json.loads(log_line)
+            parsed = json_codec.loads(log_line)
             if not isinstance(parsed, dict):
                 parsed = {'value': parsed}
             parsed['type'] = 'json'
             if 'timestamp' not in parsed:
                 parsed['timestamp'] = datetime.utcnow().isoformat()
             return parsed
-        except json.JSONDecodeError as e:
+        except json_codec.JSONDecodeError as e:
             logger.warning(f"Failed to parse JSON log: {e}")
             return {
                 'message': log_line.strip(),
@@ -0,0 +1,108 @@
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from .log_parser import LogParser, SyslogParser, JSONParser
+
+logger = logging.getLogger(__name__)
+
+# Formats the router tells apart -> the log_type whose parser reads them
+FORMATS = {
+    'json': 'json',
+    'rfc5424': 'syslog',
+    'rfc3164': 'syslog',
+    'default': 'default',
+}
+
+# One anchored match: group 1 is a JSON brace, group 2 the RFC 5424 version digit
+_SNIFF = re.compile(r'[ \t\r\n]*(?:(\{)|<\d{1,3}>(\d)?)')
+_SNIFFED = {1: 'json', 2: 'rfc5424', None: 'rfc3164'}
+# First character of a line -> the parser family it belongs to
+_FAMILIES = {'{': 'json', '<': 'syslog'}
+
+
+def sniff(line: str) -> str:
+    """Guess a line's format from its first bytes.
+
+    ``{`` starts JSON; ``<PRI>`` starts syslog, RFC 5424 when a version
+    digit follows the PRI and RFC 3164 otherwise; anything else is plain
+    text for the default parser.
+    """
+    first = line[:1]
+    if first == '{':
+        return 'json'
+    if first != '<' and not first.isspace():
+        return 'default'
+    match = _SNIFF.match(line)
+    if match is None:
+        return 'default'
+    return _SNIFFED[match.lastindex]
+
+
+class ParserRouter:
+    """Picks the parser for each line and remembers the format per source.
+
+    A source (a file path, a peer address) usually sends one format, so
+    once a source's format is known the router only checks that the first
+    character still fits it instead of sniffing again. Syslog lines go
+    straight to the RFC 5424 or RFC 3164 pattern rather than trying both.
+    """
+
+    def __init__(self, config=None):
+        get = (config or {}).get
+        self.parsers: Dict[str, LogParser] = {
+            'syslog': SyslogParser(config),
+            'json': JSONParser(config),
+            'default': LogParser(config),
+        }
+        self._dispatch = {
+            'json': self.parsers['json'].parse,
+            'rfc5424': self.parsers['syslog'].parse_rfc5424,
+            'rfc3164': self.parsers['syslog'].parse_rfc3164,
+            'default': self.parsers['default'].parse,
+        }
+        self.cache_size = get('parsers.source_cache_size', 10000)
+        self._sources: 'OrderedDict[str, str]' = OrderedDict()
+        # Ingest workers share the router
+        self._lock = threading.Lock()
+        self.detected = {name: 0 for name in FORMATS}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def detect(self, line: str, source: Optional[str] = None) -> str:
+        """Format of a line, using and updating the per-source cache"""
+        if source is not None:
+            with self._lock:
+                cached = self._sources.get(source)
+                # A cached format holds while the first character still fits its family;
+                # a syslog source that switches RFC still parses, each pattern falls back to the other
+                if cached is not None and _FAMILIES.get(line[:1], 'default') == FORMATS[cached]:
+                    # Least recently used sources are evicted first
+                    self._sources.move_to_end(source)
+                    self.cache_hits += 1
+                    self.detected[cached] += 1
+                    return cached
+                self.cache_misses += 1
+        detected = sniff(line)
+        self.detected[detected] += 1
+        if source is not None:
+            with self._lock:
+                self._sources[source] = detected
+                self._sources.move_to_end(source)
+                if len(self._sources) > self.cache_size:
+                    self._sources.popitem(last=False)
+        return detected
+
+    def parse(self, line: str, source: Optional[str] = None) -> Dict[str, Any]:
+        return self._dispatch[self.detect(line, source)](line)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'detected': dict(self.detected),
+            'sources': len(self._sources),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+        }
+
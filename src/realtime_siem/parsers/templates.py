@@ -0,0 +1,261 @@
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+WILDCARD = '<*>'
+
+# Whole tokens that are always variables, masked with their kind before clustering.
+# KEY=value tokens keep the key as constant text and mask the value.
+_MASKS = re.compile(
+    r'(?<!\S)(?:'
+    r'(?P<kv>[A-Za-z_][\w.-]*=)\S*'
+    r'|(?P<ip>\d{1,3}(?:\.\d{1,3}){3})(?=[,;:]?(?!\S))'
+    r'|(?P<num>-?\d+(?:\.\d+)?|0x[0-9a-fA-F]+)(?=[,;:]?(?!\S))'
+    r')'
+)
+_MASKED = {'ip': '<IP>', 'num': '<NUM>'}
+_DIGITS = b'0123456789'
+
+# Field names for a variable, from the constant token just before it
+NAME_AFTER = {
+    'user': 'user',
+    'for': 'user',
+    'by': 'user',
+    'port': 'port',
+}
+IP_AFTER = {
+    'from': 'source_ip',
+    'by': 'source_ip',
+    'to': 'destination_ip',
+}
+# Tokens after these are user names even the first time a template is seen,
+# unless they are one of the HINT_EXCEPTIONS (e.g. 'for invalid user bob')
+HINTS = {'user', 'for', 'by'}
+HINT_EXCEPTIONS = {'invalid', 'illegal', 'user'}
+# Field names for KEY=value tokens, by key as written, then lower-cased. Other
+# keys come from the message text, so they go under kv_<key> and can never
+# overwrite pipeline fields such as epoch or threats
+KEY_FIELDS = {
+    'USER': 'run_as',
+    'COMMAND': 'command',
+    'TTY': 'tty',
+    'src': 'source_ip',
+    'dst': 'destination_ip',
+    'spt': 'source_port',
+    'dpt': 'destination_port',
+    'proto': 'protocol',
+    'in': 'interface',
+    'rhost': 'remote_host',
+    'ruser': 'remote_user',
+    'pwd': 'cwd',
+}
+# event_type for templates whose constant text matches; first match wins
+EVENT_TYPES = [
+    (re.compile(r'failed password|authentication failure|invalid user|failed publickey|'
+                r'maximum authentication attempts', re.I), 'failed_login'),
+    (re.compile(r'accepted (?:password|publickey|keyboard-interactive)', re.I), 'successful_login'),
+    (re.compile(r'session opened', re.I), 'session_opened'),
+    (re.compile(r'session closed', re.I), 'session_closed'),
+    (re.compile(r'COMMAND='), 'privileged_command'),
+    (re.compile(r'UFW BLOCK|iptables.*DROP', re.I), 'connection_blocked'),
+]
+
+
+class Template:
+    """One cluster of messages: the shared token sequence with variables as wildcards"""
+
+    __slots__ = ('id', 'tokens', 'size', 'fields', 'event_type', 'leaf')
+
+    def __init__(self, template_id: int, tokens: List[str]):
+        self.id = template_id
+        self.tokens = tokens
+        self.size = 1
+        self._describe()
+
+    @property
+    def text(self) -> str:
+        return ' '.join(self.tokens)
+
+    def _describe(self):
+        """Name the variable positions and classify the constant text"""
+        fields: List[Tuple[int, str, bool]] = []
+        used: Dict[str, int] = {}
+        for position, token in enumerate(self.tokens):
+            if token.endswith('=<*>'):
+                key = token[:-4]
+                name = KEY_FIELDS.get(key) or KEY_FIELDS.get(key.lower()) or f'kv_{key.lower()}'
+                after_equals = True
+            elif token in (WILDCARD, '<IP>', '<NUM>'):
+                previous = self.tokens[position - 1].lower().rstrip(':,') if position else ''
+                if token == '<IP>':
+                    name = IP_AFTER.get(previous) or ('ip' if 'source_ip' in used else 'source_ip')
+                else:
+                    name = NAME_AFTER.get(previous) or ('num' if token == '<NUM>' else 'var')
+                after_equals = False
+            else:
+                continue
+            used[name] = used.get(name, 0) + 1
+            if used[name] > 1:
+                name = f'{name}_{used[name]}'
+            fields.append((position, name, after_equals))
+        self.fields = fields
+        constant = ' '.join(t for t in self.tokens if t not in (WILDCARD, '<IP>', '<NUM>'))
+        self.event_type = next((kind for pattern, kind in EVENT_TYPES if pattern.search(constant)), None)
+
+    def merge(self, tokens: List[str]) -> bool:
+        """Widen the template to cover tokens; returns True if it changed"""
+        changed = False
+        for position, token in enumerate(tokens):
+            if self.tokens[position] != token and self.tokens[position] != WILDCARD:
+                self.tokens[position] = WILDCARD
+                changed = True
+        if changed:
+            self._describe()
+        return changed
+
+
+class TemplateMiner:
+    """Online Drain-style clustering of free-text messages into templates.
+
+    Messages are masked (IPs, numbers, KEY=value values), then routed down a
+    fixed-depth tree by token count and their first few tokens to a small
+    list of templates; the most similar one above ``similarity`` absorbs the
+    message, otherwise it starts a new template. Each node has at most
+    ``max_children`` children (extra tokens share a wildcard child) and the
+    least recently used template is dropped past ``max_templates``.
+
+    Messages that differ only in their digits have the same shape; shapes
+    seen before resolve to their template with one dict lookup, skipping
+    the masking and the tree. One miner is shared by every ingest thread, so
+    the cache, tree and template table are only touched under a lock.
+    """
+
+    def __init__(self, config=None):
+        get = (config or {}).get
+        self.depth = max(get('parsers.templates.depth', 4), 3)
+        self.similarity = get('parsers.templates.similarity', 0.4)
+        self.max_children = get('parsers.templates.max_children', 100)
+        self.max_templates = get('parsers.templates.max_templates', 2000)
+        self.cache_size = get('parsers.templates.cache_size', 50000)
+        self._tree: Dict[Any, Any] = {}
+        self.templates: 'OrderedDict[int, Template]' = OrderedDict()
+        self._shapes: Dict[bytes, Template] = {}
+        self._next_id = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+
+    def match(self, message: str) -> Tuple[Template, List[str]]:
+        """The message's template and its raw tokens"""
+        with self._lock:
+            return self._match(message)
+
+    def _match(self, message: str) -> Tuple[Template, List[str]]:
+        # Masking takes a regex pass; deleting the digits is far cheaper and
+        # almost as selective, so that is the cache key
+        key = message.encode('utf-8', 'surrogatepass').translate(None, _DIGITS)
+        tokens = message.split()
+        template = self._shapes.get(key)
+        if template is not None and len(template.tokens) == len(tokens) and template.id in self.templates:
+            self.cache_hits += 1
+            self.templates.move_to_end(template.id)
+            return template, tokens
+        self.cache_misses += 1
+        template = self._add(_MASKS.sub(_mask, message).split())
+        if len(self._shapes) >= self.cache_size:
+            self._shapes.clear()
+        self._shapes[key] = template
+        return template, tokens
+
+    def extract(self, message: str) -> Dict[str, Any]:
+        """Template id and text, event_type when known, and the named variables"""
+        with self._lock:
+            # Read the template before another thread can widen it
+            template, tokens = self._match(message)
+            result = {'template_id': template.id, 'template': template.text}
+            if template.event_type:
+                result['event_type'] = template.event_type
+            fields = template.fields
+        for position, name, after_equals in fields:
+            value = tokens[position]
+            value = value.partition('=')[2] if after_equals else value.rstrip(',;:')
+            if value:
+                result[name] = value
+        return result
+
+    def _add(self, tokens: List[str]) -> Template:
+        for position in range(1, len(tokens)):
+            token = tokens[position]
+            if tokens[position - 1].lower() in HINTS and token not in HINT_EXCEPTIONS and token[:1].isalpha():
+                tokens[position] = WILDCARD
+        leaf = self._leaf(tokens)
+        best, best_score = None, -1.0
+        for template in leaf:
+            score = _similarity(template.tokens, tokens)
+            if score > best_score:
+                best, best_score = template, score
+        if best is not None and best_score >= self.similarity:
+            # Shapes cached for it stay valid: a wider template has the same positions
+            best.size += 1
+            best.merge(tokens)
+            self.templates.move_to_end(best.id)
+            return best
+
+        self._next_id += 1
+        template = Template(self._next_id, list(tokens))
+        template.leaf = leaf
+        leaf.append(template)
+        self.templates[template.id] = template
+        if len(self.templates) > self.max_templates:
+            _, oldest = self.templates.popitem(last=False)
+            oldest.leaf.remove(oldest)
+            self.evicted += 1
+        return template
+
+    def _leaf(self, tokens: List[str]) -> List[Template]:
+        node = self._tree.setdefault(len(tokens), {})
+        for token in tokens[:self.depth - 2]:
+            if any(c.isdigit() for c in token):
+                token = WILDCARD
+            child = node.get(token)
+            if child is None:
+                if token != WILDCARD and len(node) >= self.max_children:
+                    token = WILDCARD
+                    child = node.get(token)
+                if child is None:
+                    child = node[token] = {}
+            node = child
+        leaf = node.get(None)
+        if leaf is None:
+            leaf = node[None] = []
+        return leaf
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'templates': len(self.templates),
+                'cached_shapes': len(self._shapes),
+                'cache_hits': self.cache_hits,
+                'cache_misses': self.cache_misses,
+                'evicted': self.evicted,
+            }
+
+
+def _mask(match: 're.Match') -> str:
+    kind = match.lastgroup
+    if kind == 'kv':
+        return match.group('kv') + WILDCARD
+    value = match.group(0)
+    masked = _MASKED[kind]
+    # Keep trailing punctuation out of the variable
+    return masked + value[len(match.group(kind)):]
+
+
+def _similarity(template: List[str], tokens: List[str]) -> float:
+    same = sum(1 for a, b in zip(template, tokens) if a == b and a != WILDCARD)
+    return same / len(tokens) if tokens else 1.0
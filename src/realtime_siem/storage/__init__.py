@@ -0,0 +1,4 @@
+from .event_store import EventStore
+from .hunt import HuntQuery, hunt
+
+__all__ = ["EventStore", "HuntQuery", "hunt"]
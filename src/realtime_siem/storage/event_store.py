@@ -0,0 +1,383 @@
+import json
+import logging
+import shutil
+import struct
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+
+from .bloom import BloomFilter
+from ..core.bulk_indexer import storable_event
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_MAGIC = b'SIEMSEG1'
+TIMESTAMP_COLUMN = '_ts'
+PARTITION_SECONDS = {'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_epoch(timestamp: Any) -> Optional[float]:
+    """Epoch seconds from a numeric or ISO 8601 timestamp, or None"""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    try:
+        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+
+def event_epoch(event: Dict[str, Any]) -> float:
+    # Processed events carry the epoch EventProcessor normalized; parse only older or raw ones
+    epoch = event.get('epoch')
+    if epoch is None:
+        epoch = parse_epoch(event.get('timestamp'))
+    return time.time() if epoch is None else epoch
+
+
+def write_segment(path: Path, rows: List[Tuple[float, Dict[str, Any]]], bloom_fields: List[str]) -> Dict[str, Any]:
+    """Write rows as a columnar segment and return its metadata.
+
+    Layout: magic, header length, JSON header, then one zlib-compressed JSON
+    array per column. The header records each column's offset and length so
+    readers only decompress the columns they need.
+    """
+    fields: Dict[str, None] = {}
+    for _, row in rows:
+        for field in row:
+            fields[field] = None
+
+    blocks = [(TIMESTAMP_COLUMN, zlib.compress(json.dumps([ts for ts, _ in rows]).encode()))]
+    for field in fields:
+        values = [row.get(field) for _, row in rows]
+        blocks.append((field, zlib.compress(json.dumps(values, default=str).encode())))
+
+    columns = {}
+    offset = 0
+    for field, block in blocks:
+        columns[field] = [offset, len(block)]
+        offset += len(block)
+    header = json.dumps({'count': len(rows), 'columns': columns}).encode()
+
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(SEGMENT_MAGIC)
+        f.write(struct.pack('<I', len(header)))
+        f.write(header)
+        for _, block in blocks:
+            f.write(block)
+    tmp_path.rename(path)
+
+    blooms = {}
+    for field in bloom_fields:
+        bloom = BloomFilter.for_capacity(len(rows))
+        for _, row in rows:
+            if row.get(field) is not None:
+                bloom.add(row[field])
+        blooms[field] = bloom
+
+    return {
+        'file': path.name,
+        'count': len(rows),
+        'min_ts': min(ts for ts, _ in rows),
+        'max_ts': max(ts for ts, _ in rows),
+        'bloom': blooms,
+    }
+
+
+def load_segment_metadata(directory: Path) -> List[Dict[str, Any]]:
+    """Load the sidecar metadata of every segment under an event store directory"""
+    segments = []
+    for meta_path in Path(directory).glob('*/*.meta'):
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            meta['bloom'] = {k: BloomFilter.from_dict(v) for k, v in meta['bloom'].items()}
+            meta['path'] = meta_path.with_suffix('.seg')
+            segments.append(meta)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Skipping unreadable segment metadata {meta_path}: {e}")
+    segments.sort(key=lambda m: m['min_ts'])
+    return segments
+
+
+def prune_segments(segments: List[Dict[str, Any]], start: Optional[float] = None, end: Optional[float] = None,
+                   filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Drop segments outside [start, end] or whose bloom filters rule out a filter value"""
+    selected = []
+    for meta in segments:
+        if start is not None and meta['max_ts'] < start:
+            continue
+        if end is not None and meta['min_ts'] > end:
+            continue
+        if any(field in meta['bloom'] and value not in meta['bloom'][field]
+               for field, value in (filters or {}).items()):
+            continue
+        selected.append(meta)
+    return selected
+
+
+class SegmentReader:
+    """Reads individual columns out of a segment file"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            if f.read(len(SEGMENT_MAGIC)) != SEGMENT_MAGIC:
+                raise ValueError(f"{self.path} is not an event segment")
+            header_length = struct.unpack('<I', f.read(4))[0]
+            header = json.loads(f.read(header_length))
+        self.data_offset = len(SEGMENT_MAGIC) + 4 + header_length
+        self.count = header['count']
+        self.columns: Dict[str, List[int]] = header['columns']
+        self._cache: Dict[str, List[Any]] = {}
+
+    def column(self, name: str) -> List[Any]:
+        values = self._cache.get(name)
+        if values is None:
+            if name not in self.columns:
+                values = [None] * self.count
+            else:
+                offset, length = self.columns[name]
+                with open(self.path, 'rb') as f:
+                    f.seek(self.data_offset + offset)
+                    values = json.loads(zlib.decompress(f.read(length)))
+            self._cache[name] = values
+        return values
+
+    def rows(self, indices: List[int], fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        names = fields or [name for name in self.columns if name != TIMESTAMP_COLUMN]
+        columns = [(name, self.column(name)) for name in names]
+        rows = []
+        for i in indices:
+            rows.append({name: values[i] for name, values in columns if values[i] is not None})
+        return rows
+
+    def match(self, start: Optional[float] = None, end: Optional[float] = None,
+              filters: Optional[Dict[str, Any]] = None) -> List[int]:
+        """Row indices within [start, end] whose columns equal every filter value"""
+        timestamps = self.column(TIMESTAMP_COLUMN)
+        candidates = [
+            i for i, ts in enumerate(timestamps)
+            if (start is None or ts >= start) and (end is None or ts <= end)
+        ]
+        for field, value in (filters or {}).items():
+            values = self.column(field)
+            candidates = [i for i in candidates if values[i] == value]
+        return candidates
+
+
+class EventStore:
+    """Embedded, time-partitioned event history for search without Elasticsearch.
+
+    Events are buffered per time partition (minute, hour or day) and written
+    as compressed columnar segments. Each segment has a sidecar with its
+    min/max timestamp and bloom filters on selected fields, so queries can
+    skip segments without opening them.
+    """
+
+    def __init__(self, config=None):
+        self.config = config or {}
+        get = self.config.get
+        self.directory = Path(get('storage.directory', 'data/events'))
+        self.partition_seconds = PARTITION_SECONDS[get('storage.partition', 'hour')]
+        self.segment_max_events = get('storage.segment_max_events', 50000)
+        self.flush_interval = get('storage.flush_interval_seconds', 300)
+        self.retention_days = get('storage.retention_days', 7)
+        self.bloom_fields = get('storage.bloom_fields', ['source_ip', 'user'])
+
+        self._lock = threading.Lock()
+        # Held while segments are written, so flushes from different threads do not interleave
+        self._write_lock = threading.Lock()
+        self._buffers: Dict[int, List[Tuple[float, Dict[str, Any]]]] = {}
+        # Full buffers waiting for the background thread to write them
+        self._pending: List[Tuple[int, List[Tuple[float, Dict[str, Any]]]]] = []
+        self._segments: List[Dict[str, Any]] = []
+        self._sequence = 0
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.appended = 0
+        self.segments_written = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load_segments()
+
+    def _load_segments(self):
+        self._segments = load_segment_metadata(self.directory)
+        self._sequence = max((m.get('sequence', 0) for m in self._segments), default=0)
+        if self._segments:
+            logger.info(f"Event store opened with {len(self._segments)} segment(s)")
+
+    def append(self, event: Dict[str, Any]):
+        epoch = event_epoch(event)
+        partition = int(epoch // self.partition_seconds)
+        row = storable_event(event)
+        with self._lock:
+            buffer = self._buffers.setdefault(partition, [])
+            buffer.append((epoch, row))
+            self.appended += 1
+            if len(buffer) < self.segment_max_events:
+                return
+            # Compressing and writing a segment is slow: swap the buffer out and leave that to the flusher
+            self._pending.append((partition, self._buffers.pop(partition)))
+        if self._thread is not None:
+            self._wakeup.set()
+        else:
+            self._write_pending()
+
+    def flush(self):
+        with self._lock:
+            self._pending.extend(self._buffers.items())
+            self._buffers = {}
+        self._write_pending()
+
+    def _write_pending(self):
+        with self._write_lock:
+            while True:
+                with self._lock:
+                    if not self._pending:
+                        return
+                    partition, rows = self._pending[0]
+                    self._sequence += 1
+                    sequence = self._sequence
+                meta = self._write_segment(partition, rows, sequence)
+                with self._lock:
+                    # The rows leave memory and show up as a segment in one step
+                    self._pending.pop(0)
+                    self._segments.append(meta)
+                    self._segments.sort(key=lambda m: m['min_ts'])
+                    self.segments_written += 1
+
+    def _write_segment(self, partition: int, rows: List[Tuple[float, Dict[str, Any]]],
+                       sequence: int) -> Dict[str, Any]:
+        day_dir = self.directory / datetime.utcfromtimestamp(partition * self.partition_seconds).strftime('%Y-%m-%d')
+        day_dir.mkdir(exist_ok=True)
+        path = day_dir / f"seg-{partition * self.partition_seconds:010d}-{sequence:08d}.seg"
+
+        meta = write_segment(path, rows, self.bloom_fields)
+        meta['sequence'] = sequence
+        with open(path.with_suffix('.meta'), 'w') as f:
+            json.dump(dict(meta, bloom={k: v.to_dict() for k, v in meta['bloom'].items()}), f)
+
+        meta['path'] = path
+        logger.debug(f"Wrote segment {path.name} with {len(rows)} events")
+        return meta
+
+    def segments(self, start: Optional[float] = None, end: Optional[float] = None,
+                 filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Segments that may hold matching events, after time and bloom pruning"""
+        with self._lock:
+            segments = list(self._segments)
+        return prune_segments(segments, start, end, filters)
+
+    def query(self, start: Optional[float] = None, end: Optional[float] = None,
+              filters: Optional[Dict[str, Any]] = None,
+              predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+              limit: Optional[int] = None, fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield stored events in [start, end] (epoch seconds) matching the filters.
+
+        filters are equality matches and are used for bloom pruning; predicate
+        is applied to each remaining event.
+        """
+        returned = 0
+        # Segments and unwritten rows are read together so a flush in between cannot hide rows
+        with self._lock:
+            segments = list(self._segments)
+            buffered = [item for rows in self._buffers.values() for item in rows]
+            buffered.extend(item for _, rows in self._pending for item in rows)
+        for meta in prune_segments(segments, start, end, filters):
+            reader = SegmentReader(meta['path'])
+            indices = reader.match(start, end, filters)
+            if not indices:
+                continue
+            # The predicate may look at any field, so project only after applying it
+            for event in reader.rows(indices, None if predicate else fields):
+                if predicate is not None:
+                    if not predicate(event):
+                        continue
+                    if fields:
+                        event = {k: event[k] for k in fields if k in event}
+                yield event
+                returned += 1
+                if limit is not None and returned >= limit:
+                    return
+
+        # Events that have not been written yet are searched from memory
+        for epoch, event in sorted(buffered, key=lambda item: item[0]):
+            if (start is not None and epoch < start) or (end is not None and epoch > end):
+                continue
+            if any(event.get(field) != value for field, value in (filters or {}).items()):
+                continue
+            if predicate is not None and not predicate(event):
+                continue
+            yield {k: event[k] for k in fields if k in event} if fields else event
+            returned += 1
+            if limit is not None and returned >= limit:
+                return
+
+    def apply_retention(self, now: Optional[float] = None) -> int:
+        """Drop whole days of segments older than retention_days"""
+        if not self.retention_days:
+            return 0
+        cutoff = datetime.utcfromtimestamp((now or time.time()) - self.retention_days * 86400).strftime('%Y-%m-%d')
+        removed = 0
+        for day_dir in sorted(self.directory.iterdir()):
+            if day_dir.is_dir() and day_dir.name < cutoff:
+                with self._lock:
+                    self._segments = [m for m in self._segments if m['path'].parent != day_dir]
+                shutil.rmtree(day_dir)
+                removed += 1
+                logger.info(f"Removed event store partition {day_dir.name}")
+        return removed
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='event-store', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        next_maintenance = time.monotonic() + self.flush_interval
+        while not self._stop.is_set():
+            self._wakeup.wait(max(next_maintenance - time.monotonic(), 0))
+            self._wakeup.clear()
+            try:
+                # Woken for full buffers: write them; on the interval, flush everything
+                if time.monotonic() >= next_maintenance:
+                    next_maintenance = time.monotonic() + self.flush_interval
+                    self.flush()
+                    self.apply_retention()
+                else:
+                    self._write_pending()
+            except Exception as e:
+                logger.error(f"Event store maintenance failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            buffered = sum(len(rows) for rows in self._buffers.values())
+            buffered += sum(len(rows) for _, rows in self._pending)
+            segments = list(self._segments)
+        return {
+            'directory': str(self.directory),
+            'segments': len(segments),
+            'stored_events': sum(m['count'] for m in segments),
+            'buffered_events': buffered,
+            'appended': self.appended,
+            'oldest_event': min((m['min_ts'] for m in segments), default=None),
+            'newest_event': max((m['max_ts'] for m in segments), default=None),
+        }
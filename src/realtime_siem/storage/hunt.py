@@ -0,0 +1,294 @@
+import gzip
+import ipaddress
+import json
+import logging
+import multiprocessing
+import os
+import re
+import time
+import zlib
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .event_store import SegmentReader, event_epoch, load_segment_metadata, prune_segments
+from ..detection.rules_engine import evaluate_condition
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<lparen>\() |
+        (?P<rparen>\)) |
+        (?P<list>\[[^\]]*\]) |
+        (?P<op>>=|<=|==|!=|>|<|~) |
+        (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*') |
+        (?P<word>[^\s()\[\]"'<>=!~]+)
+    )''', re.VERBOSE)
+
+RELATIVE_TIME = re.compile(r'^(\d+(?:\.\d+)?)([smhd])$')
+UNIT_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+class HuntSyntaxError(ValueError):
+    pass
+
+
+def _literal(token: str, kind: str) -> Any:
+    if kind == 'string':
+        # Only quotes are unescaped so regex escapes like \d survive
+        quote = token[0]
+        return token[1:-1].replace('\\' + quote, quote)
+    try:
+        return int(token)
+    except ValueError:
+        try:
+            return float(token)
+        except ValueError:
+            return token
+
+
+class HuntQuery:
+    """A filter expression compiled into RulesEngine conditions.
+
+    Grammar: clauses combined with and/or/not and parentheses. A clause is
+    ``field OP value`` where OP is one of > < >= <= == != (numeric and
+    equality comparisons), ``~`` (regex, matched like rule patterns),
+    ``in [a, b]`` (membership) or ``in 10.0.0.0/8`` (IP/CIDR).
+    Example: ``source_ip in 203.0.113.0/24 and (user == root or message ~ ".*Failed")``
+    """
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.fields: List[str] = []
+        self._tokens = self._tokenize(expression)
+        self._pos = 0
+        self.tree = self._parse_or()
+        if self._pos != len(self._tokens):
+            raise HuntSyntaxError(f"Unexpected '{self._tokens[self._pos][1]}' in hunt expression")
+
+    def _tokenize(self, expression: str) -> List[Tuple[str, str]]:
+        tokens = []
+        pos = 0
+        expression = expression.strip()
+        while pos < len(expression):
+            match = TOKEN_PATTERN.match(expression, pos)
+            if not match or match.end() == pos:
+                raise HuntSyntaxError(f"Cannot parse hunt expression near '{expression[pos:]}'")
+            tokens.append((match.lastgroup, match.group(match.lastgroup)))
+            pos = match.end()
+        return tokens
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self._tokens[self._pos] if self._pos < len(self._tokens) else None
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise HuntSyntaxError("Hunt expression ended unexpectedly")
+        self._pos += 1
+        return token
+
+    def _keyword(self, word: str) -> bool:
+        token = self._peek()
+        if token and token[0] == 'word' and token[1].lower() == word:
+            self._pos += 1
+            return True
+        return False
+
+    def _parse_or(self):
+        children = [self._parse_and()]
+        while self._keyword('or'):
+            children.append(self._parse_and())
+        return children[0] if len(children) == 1 else ('or', children)
+
+    def _parse_and(self):
+        children = [self._parse_not()]
+        while self._keyword('and'):
+            children.append(self._parse_not())
+        return children[0] if len(children) == 1 else ('and', children)
+
+    def _parse_not(self):
+        if self._keyword('not'):
+            return ('not', self._parse_not())
+        if self._peek() and self._peek()[0] == 'lparen':
+            self._next()
+            node = self._parse_or()
+            if self._next()[0] != 'rparen':
+                raise HuntSyntaxError("Missing ')' in hunt expression")
+            return node
+        return self._parse_clause()
+
+    def _parse_clause(self):
+        kind, field = self._next()
+        if kind != 'word':
+            raise HuntSyntaxError(f"Expected a field name, got '{field}'")
+        if field not in self.fields:
+            self.fields.append(field)
+
+        if self._keyword('in'):
+            kind, value = self._next()
+            if kind == 'list':
+                items = [item.strip() for item in value[1:-1].split(',') if item.strip()]
+                values = [_literal(item, 'string' if item[0] in '"\'' else 'word') for item in items]
+                return ('cond', {'field': field, 'operator': 'in', 'values': values,
+                                 'text_values': frozenset(str(item) for item in values)})
+            try:
+                ipaddress.ip_network(value, strict=False)
+            except ValueError:
+                raise HuntSyntaxError(f"'{value}' is not an IP address or CIDR range")
+            return ('cond', {'field': field, 'operator': 'cidr', 'network': value})
+
+        kind, op = self._next()
+        if kind != 'op':
+            raise HuntSyntaxError(f"Expected an operator after '{field}', got '{op}'")
+        kind, raw = self._next()
+        if kind not in ('word', 'string'):
+            raise HuntSyntaxError(f"Expected a value after '{field} {op}'")
+        value = _literal(raw, kind)
+
+        if op == '~':
+            re.compile(str(value))
+            return ('cond', {'field': field, 'operator': 'regex', 'pattern': str(value)})
+        if op in ('==', '!='):
+            return ('cond', {'field': field, 'operator': op, 'value': value})
+        return ('cond', {'field': field, 'operator': op, 'threshold': value})
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        return self._evaluate(self.tree, event)
+
+    def _evaluate(self, node, event: Dict[str, Any]) -> bool:
+        kind, payload = node
+        if kind == 'cond':
+            return evaluate_condition(payload, event)
+        if kind == 'and':
+            return all(self._evaluate(child, event) for child in payload)
+        if kind == 'or':
+            return any(self._evaluate(child, event) for child in payload)
+        return not self._evaluate(payload, event)
+
+    def equality_filters(self) -> Dict[str, Any]:
+        """Top-level equality clauses, usable for bloom filter pruning"""
+        nodes = self.tree[1] if self.tree[0] == 'and' else [self.tree]
+        return {
+            node[1]['field']: str(node[1]['value'])
+            for node in nodes
+            if node[0] == 'cond' and node[1]['operator'] == '=='
+        }
+
+
+def parse_time(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Parse epoch seconds, an ISO timestamp or a relative age like '24h' / '7d'"""
+    if value is None or value == '':
+        return None
+    value = str(value).strip()
+    relative = RELATIVE_TIME.match(value)
+    if relative:
+        return (now or time.time()) - float(relative.group(1)) * UNIT_SECONDS[relative.group(2)]
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+@lru_cache(maxsize=16)
+def _compiled(expression: str) -> HuntQuery:
+    return HuntQuery(expression)
+
+
+def _iter_segment(path: Path, query: HuntQuery, start, end) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    reader = SegmentReader(path)
+    indices = reader.match(start, end)
+    # Evaluate against just the referenced columns, then fetch full rows for hits
+    partial = reader.rows(indices, query.fields)
+    hits = [i for i, row in zip(indices, partial) if query.matches(row)]
+    yield len(indices), None
+    for row in reader.rows(hits):
+        yield 0, row
+
+
+def _iter_spool(path: Path, query: HuntQuery, start, end) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    try:
+        with gzip.open(path, 'rt') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                epoch = event_epoch(event)
+                if (start is not None and epoch < start) or (end is not None and epoch > end):
+                    continue
+                yield 1, event if query.matches(event) else None
+    except (EOFError, zlib.error, OSError) as e:
+        logger.warning(f"Stopped reading truncated spool segment {path}: {e}")
+
+
+def scan_file(args: Tuple[str, str, Optional[float], Optional[float], Optional[int]]) -> Tuple[str, int, List[Dict[str, Any]]]:
+    """Scan one segment or spool file; runs inside worker processes"""
+    path, expression, start, end, limit = args
+    query = _compiled(expression)
+    path = Path(path)
+    iterator = _iter_segment if path.suffix == '.seg' else _iter_spool
+
+    scanned = 0
+    matches = []
+    for count, event in iterator(path, query, start, end):
+        scanned += count
+        if event is not None:
+            matches.append(event)
+            if limit is not None and len(matches) >= limit:
+                break
+    return str(path), scanned, matches
+
+
+def hunt(expression: str, directory: Optional[str] = None, spool_directory: Optional[str] = None,
+         paths: Iterable[str] = (), start: Optional[float] = None, end: Optional[float] = None,
+         limit: Optional[int] = None, workers: Optional[int] = None,
+         progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Iterator[Dict[str, Any]]:
+    """Scan archived events in parallel and yield matches as they are found.
+
+    Event store segments are pruned by time range and bloom filters before
+    being scanned; spool segments are always scanned. Scanning stops as soon
+    as ``limit`` matches have been yielded.
+    """
+    query = HuntQuery(expression)
+
+    files: List[str] = [str(p) for p in paths]
+    if directory:
+        segments = prune_segments(load_segment_metadata(Path(directory)), start, end, query.equality_filters())
+        files.extend(str(meta['path']) for meta in segments)
+    if spool_directory:
+        files.extend(str(p) for p in sorted(Path(spool_directory).glob('spool-*.ndjson.gz')))
+
+    state = {'files_total': len(files), 'files_done': 0, 'events_scanned': 0, 'matches': 0,
+             'started_at': time.time()}
+    if not files:
+        return
+
+    tasks = [(path, expression, start, end, limit) for path in files]
+    workers = min(workers or os.cpu_count() or 1, len(files))
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    results = pool.imap_unordered(scan_file, tasks) if pool else map(scan_file, tasks)
+
+    try:
+        for _, scanned, matches in results:
+            state['files_done'] += 1
+            state['events_scanned'] += scanned
+            for event in matches:
+                state['matches'] += 1
+                yield event
+                if limit is not None and state['matches'] >= limit:
+                    return
+            if progress:
+                state['elapsed_seconds'] = round(time.time() - state['started_at'], 3)
+                progress(dict(state))
+    finally:
+        if pool:
+            # Early exit (limit reached or consumer stopped) kills outstanding scans
+            pool.terminate()
+            pool.join()
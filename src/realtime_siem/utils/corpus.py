@@ -0,0 +1,190 @@
+"""Deterministic synthetic log corpora for benchmarks and load tests"""
+
+import json
+import random
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+
+# Output format -> the SIEMCore parser (log_type) that reads it
+FORMATS = {
+    'rfc3164': 'syslog',
+    'rfc5424': 'syslog',
+    'json': 'json',
+    'generic': 'default',
+}
+
+# Approximate share of events produced by each scenario
+DEFAULT_MIX = {
+    'normal': 0.90,
+    'brute_force': 0.04,
+    'port_scan': 0.03,
+    'exfiltration': 0.01,
+    'privilege_escalation': 0.02,
+}
+
+NORMAL_MESSAGES = [
+    ('sshd', 'info', 'Accepted password for {user} from {ip} port {port} ssh2'),
+    ('sshd', 'info', 'pam_unix(sshd:session): session opened for user {user}'),
+    ('nginx', 'info', 'GET /app/dashboard HTTP/1.1 200 from {ip}'),
+    ('nginx', 'info', 'POST /api/orders HTTP/1.1 201 from {ip}'),
+    ('CRON', 'info', '({user}) CMD (/usr/local/bin/backup.sh)'),
+    ('systemd', 'info', 'Started Session {port} of user {user}.'),
+]
+
+# Syslog severities (RFC 5424 section 6.2.1); facility 4 (auth)
+SEVERITY_CODES = {'info': 6, 'notice': 5, 'warning': 4, 'error': 3}
+FACILITY = 4
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse 'normal=0.8,brute_force=0.2' into a scenario mix"""
+    mix = {}
+    for part in text.split(','):
+        name, _, share = part.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown scenario '{name}'; expected {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(share)
+    return mix
+
+
+class CorpusGenerator:
+    """Produces the same log lines for the same seed and settings.
+
+    Each step picks a scenario: normal traffic yields one line, while attacks
+    come in episodes - a burst of failed logins against one account, a sweep
+    of ports from one address, a large upload or a privilege escalation.
+    Scenario weights are scaled by episode length so ``mix`` is roughly the
+    share of lines. ``users``, ``hosts`` and ``sources`` set the number of
+    distinct entities; attackers use their own, smaller address pool.
+    """
+
+    def __init__(self, seed: int = 0, formats: Optional[Sequence[str]] = None,
+                 mix: Optional[Dict[str, float]] = None, users: int = 50, hosts: int = 10,
+                 sources: int = 500, burst: int = 20, start: float = 1700000000.0,
+                 events_per_second: float = 100.0):
+        self.formats = list(formats or FORMATS)
+        unknown = [f for f in self.formats if f not in FORMATS]
+        if unknown:
+            raise ValueError(f"Unknown format(s) {', '.join(unknown)}; expected {', '.join(FORMATS)}")
+        self.mix = dict(mix or DEFAULT_MIX)
+        unknown = [s for s in self.mix if s not in DEFAULT_MIX]
+        if unknown:
+            raise ValueError(f"Unknown scenario(s) {', '.join(unknown)}; expected {', '.join(DEFAULT_MIX)}")
+        self.burst = max(burst, 1)
+        self.events_per_second = events_per_second
+        self.clock = start
+        self.random = random.Random(seed)
+
+        self.users = [f'user{n:03d}' for n in range(max(users, 1))]
+        self.hosts = [f'host-{n:02d}' for n in range(max(hosts, 1))]
+        self.sources = [f'10.{n // 65536 % 256}.{n // 256 % 256}.{n % 256 + 1}' for n in range(max(sources, 1))]
+        self.attackers = [f'203.0.113.{n % 254 + 1}' if n < 254 else f'198.51.100.{n % 254 + 1}'
+                          for n in range(max(sources // 10, 1))]
+
+        lengths = {'normal': 1, 'brute_force': self.burst, 'port_scan': self.burst,
+                   'exfiltration': 1, 'privilege_escalation': 1}
+        self._scenarios = [s for s, share in self.mix.items() if share > 0]
+        self._weights = [self.mix[s] / lengths[s] for s in self._scenarios]
+        self.scenario_counts = {s: 0 for s in DEFAULT_MIX}
+
+    def records(self, count: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Structured events before formatting; endless when count is None"""
+        produced = 0
+        while count is None or produced < count:
+            scenario = self.random.choices(self._scenarios, self._weights)[0]
+            for record in getattr(self, f'_{scenario}')():
+                if count is not None and produced >= count:
+                    return
+                self.clock += self.random.expovariate(self.events_per_second)
+                record['time'] = self.clock
+                record['scenario'] = scenario
+                self.scenario_counts[scenario] += 1
+                produced += 1
+                yield record
+
+    def lines(self, count: Optional[int] = None) -> Iterator[Tuple[str, str]]:
+        """(log line, log_type) pairs in the configured formats"""
+        for record in self.records(count):
+            fmt = self.formats[self.random.randrange(len(self.formats))]
+            yield getattr(self, f'_format_{fmt}')(record), FORMATS[fmt]
+
+    def corpus(self, count: int) -> List[Tuple[str, str]]:
+        return list(self.lines(count))
+
+    def events(self, count: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Events as the json format carries them, for SIEMCore.process_event"""
+        for record in self.records(count):
+            yield self._event(record)
+
+    # Scenarios
+
+    def _normal(self):
+        program, level, template = self.random.choice(NORMAL_MESSAGES)
+        user = self.random.choice(self.users)
+        ip = self.random.choice(self.sources)
+        yield {'program': program, 'level': level, 'host': self.random.choice(self.hosts),
+               'user': user, 'source_ip': ip, 'action': 'login' if program == 'sshd' else 'request',
+               'status': 'success',
+               'message': template.format(user=user, ip=ip, port=self.random.randint(1024, 65535))}
+
+    def _brute_force(self):
+        ip = self.random.choice(self.attackers)
+        user = self.random.choice(['root', 'admin'] + self.users[:3])
+        host = self.random.choice(self.hosts)
+        for attempt in range(1, self.burst + 1):
+            port = self.random.randint(1024, 65535)
+            yield {'program': 'sshd', 'level': 'warning', 'host': host, 'user': user, 'source_ip': ip,
+                   'action': 'login', 'status': 'failed', 'failed_logins': attempt,
+                   'message': f'Failed password for {user} from {ip} port {port} ssh2'}
+
+    def _port_scan(self):
+        ip = self.random.choice(self.attackers)
+        host = self.random.choice(self.hosts)
+        first = self.random.randint(1, 60000)
+        for port in range(first, first + self.burst):
+            yield {'program': 'kernel', 'level': 'notice', 'host': host, 'source_ip': ip,
+                   'action': 'connection', 'status': 'blocked', 'destination_port': port,
+                   'message': f'[UFW BLOCK] IN=eth0 SRC={ip} PROTO=TCP DPT={port}'}
+
+    def _exfiltration(self):
+        user = self.random.choice(self.users)
+        size = self.random.choice([5, 50, 250]) * 1000000
+        yield {'program': 'proxy', 'level': 'warning', 'host': self.random.choice(self.hosts),
+               'user': user, 'source_ip': self.random.choice(self.sources), 'action': 'upload',
+               'status': 'success', 'bytes_sent': size, 'destination': 'files.example.net',
+               'message': f'Upload of {size} bytes by {user} to files.example.net'}
+
+    def _privilege_escalation(self):
+        user = self.random.choice(self.users)
+        yield {'program': 'sudo', 'level': 'notice', 'host': self.random.choice(self.hosts),
+               'user': user, 'action': 'sudo', 'status': 'success',
+               'message': f'{user} : TTY=pts/0 ; PWD=/home/{user} ; USER=root ; COMMAND=/bin/su root'}
+
+    # Formats
+
+    def _priority(self, record: Dict[str, Any]) -> int:
+        return FACILITY * 8 + SEVERITY_CODES[record['level']]
+
+    def _format_rfc3164(self, record: Dict[str, Any]) -> str:
+        t = datetime.fromtimestamp(record['time'], timezone.utc)
+        return (f"<{self._priority(record)}>{t:%b} {t.day:>2} {t:%H:%M:%S} {record['host']} "
+                f"{record['program']}[{int(record['time']) % 30000 + 1000}]: {record['message']}")
+
+    def _format_rfc5424(self, record: Dict[str, Any]) -> str:
+        t = datetime.fromtimestamp(record['time'], timezone.utc)
+        return (f"<{self._priority(record)}>1 {t:%Y-%m-%dT%H:%M:%S}.{t.microsecond // 1000:03d}Z "
+                f"{record['host']} {record['program']} - {record['action']} - {record['message']}")
+
+    def _format_json(self, record: Dict[str, Any]) -> str:
+        return json.dumps(self._event(record))
+
+    def _event(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        event = {k: v for k, v in record.items() if k not in ('time', 'scenario', 'program', 'level')}
+        event['timestamp'] = datetime.fromtimestamp(record['time'], timezone.utc).isoformat()
+        event['hostname'] = event.pop('host')
+        return event
+
+    def _format_generic(self, record: Dict[str, Any]) -> str:
+        t = datetime.fromtimestamp(record['time'], timezone.utc)
+        return f"{t:%Y-%m-%d %H:%M:%S} {record['level'].upper()} {record['host']} {record['message']}"
@@ -3,6 +3,16 @@ from datetime import datetime
 from typing import Any, Dict
 
 
+class StubConfig:
+    """Flat dotted-key config, standing in for ConfigManager in benchmarks and tests"""
+
+    def __init__(self, values: Dict[str, Any]):
+        self.values = values
+
+    def get(self, key: str, default=None):
+        return self.values.get(key, default)
+
+
 def get_timestamp() -> str:
     return datetime.utcnow().isoformat()
 
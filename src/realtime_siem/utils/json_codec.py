@@ -0,0 +1,91 @@
+import json
+import logging
+from typing import Dict, Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Raised by loads() for both backends; orjson's error subclasses it
+JSONDecodeError = json.JSONDecodeError
+
+# Keys shared between decoded events. Bounded so that senders inventing keys
+# cannot grow it forever; keys past the limit are simply not shared.
+MAX_SHARED_KEYS = 4096
+_shared_keys: Dict[str, str] = {}
+
+if orjson is not None:
+    # datetimes go through default=str like the stdlib path, so both backends emit the same text
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def share_keys(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild a dict so its keys are the shared copies of those strings"""
+    shared = _shared_keys
+    if not event.keys() <= shared.keys():
+        for key in event.keys() - shared.keys():
+            if len(shared) >= MAX_SHARED_KEYS:
+                break
+            if isinstance(key, str):
+                shared[key] = key
+    # Keys past the limit fall back to the event's own string
+    return {shared.get(key, key): value for key, value in event.items()}
+
+
+def _stdlib_loads(data: Union[str, bytes]) -> Any:
+    # json.loads only shares repeated keys within one document
+    value = json.loads(data)
+    return share_keys(value) if type(value) is dict else value
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, default=str)
+
+
+def _stdlib_dumps_bytes(obj: Any) -> bytes:
+    return json.dumps(obj, default=str).encode()
+
+
+def _orjson_loads(data: Union[str, bytes]) -> Any:
+    # orjson keeps its own cache of short keys, so decoded events already share them
+    return orjson.loads(data)
+
+
+def _orjson_dumps_bytes(obj: Any) -> bytes:
+    try:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS)
+    except TypeError:
+        # Integers past 64 bits, circular data and the like: let the stdlib decide
+        return _stdlib_dumps_bytes(obj)
+
+
+def _orjson_dumps(obj: Any) -> str:
+    return _orjson_dumps_bytes(obj).decode()
+
+
+BACKENDS = {
+    'json': (_stdlib_loads, _stdlib_dumps, _stdlib_dumps_bytes),
+}
+if orjson is not None:
+    BACKENDS['orjson'] = (_orjson_loads, _orjson_dumps, _orjson_dumps_bytes)
+
+backend = ''
+loads = dumps = dumps_bytes = None
+
+
+def use_backend(name: str = 'auto') -> str:
+    """Select the JSON backend: orjson, json (stdlib), or auto for the fastest installed"""
+    global backend, loads, dumps, dumps_bytes
+    if name == 'auto':
+        name = 'orjson' if 'orjson' in BACKENDS else 'json'
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend {name!r} is not available; choose from {sorted(BACKENDS)}")
+    backend = name
+    loads, dumps, dumps_bytes = BACKENDS[name]
+    return name
+
+
+use_backend()
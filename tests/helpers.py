@@ -0,0 +1,15 @@
+"""Shared test helpers"""
+
+import time
+
+from realtime_siem.utils.helpers import StubConfig  # noqa: F401 (re-exported for tests)
+
+
+def wait_for(condition, timeout=10.0):
+    """Poll condition until it is true or timeout passes; returns its last value"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
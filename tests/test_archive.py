@@ -0,0 +1,107 @@
+import unittest
+import sys
+import os
+import bz2
+import gzip
+import lzma
+import shutil
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from realtime_siem.ingest.archive import (detect_compression, iter_batches, iter_lines, ingest_archives,
+                                          open_archive, zstandard)
+from realtime_siem.core.spool import DiskSpool
+from realtime_siem.storage import EventStore
+from helpers import StubConfig
+
+LINES = [f'<38>Oct 11 22:{n // 60:02d}:{n % 60:02d} web01 sshd[42]: Failed password for root from 203.0.113.9'
+         for n in range(1000)]
+
+
+class TestArchiveReader(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.data = ('\n'.join(LINES) + '\n').encode()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, opener):
+        path = os.path.join(self.temp_dir, name)
+        with opener(path, 'wb') as f:
+            f.write(self.data)
+        return path
+
+    def test_formats_by_content(self):
+        paths = {
+            None: self.write('plain.log', open),
+            'gzip': self.write('auth.log.2', gzip.open),
+            'bz2': self.write('auth.log.bz2', bz2.open),
+            'xz': self.write('auth.log.xz', lzma.open),
+        }
+        for compression, path in paths.items():
+            self.assertEqual(detect_compression(path), compression)
+            batches = list(iter_batches(path, batch_size=300, chunk_bytes=4096))
+            self.assertEqual([len(b) for b in batches], [300, 300, 300, 100])
+            self.assertEqual([line for batch in batches for line in batch], LINES)
+
+    @unittest.skipIf(zstandard is None, 'zstandard is not installed')
+    def test_zstd(self):
+        path = os.path.join(self.temp_dir, 'auth.log.zst')
+        with open(path, 'wb') as f:
+            f.write(zstandard.ZstdCompressor().compress(self.data))
+        self.assertEqual([line for batch in iter_batches(path) for line in batch], LINES)
+
+    def test_lines_split_across_chunks(self):
+        path = self.write('split.log', open)
+        with open(path, 'ab') as f:
+            f.write(b'no trailing newline')
+        with open_archive(path) as stream:
+            lines = [line for chunk in iter_lines(stream, chunk_bytes=7) for line in chunk]
+        self.assertEqual(lines, [line.encode() for line in LINES] + [b'no trailing newline'])
+
+    def test_parallel_ingest(self):
+        config_path = os.path.join(self.temp_dir, 'siem.yaml')
+        with open(config_path, 'w') as f:
+            f.write('log_level: INFO\n')
+        paths = [self.write('a.log.gz', gzip.open), self.write('b.log.xz', lzma.open), self.write('c.log', open)]
+        progress = []
+
+        result = ingest_archives(paths, config_path, log_type='syslog', workers=2, batch_size=128,
+                                 start_engine=False, progress=progress.append)
+        self.assertEqual(result['lines'], 3000)
+        self.assertEqual(result['workers'], 2)
+        self.assertEqual(len(progress), 3)
+        for report in result['files']:
+            self.assertEqual((report['lines'], report['processed']), (1000, 1000))
+        self.assertEqual(sorted(f['compression'] for f in result['files']), ['gzip', 'none', 'xz'])
+
+    def test_parallel_workers_keep_separate_stores(self):
+        config_path = os.path.join(self.temp_dir, 'siem.yaml')
+        live = os.path.join(self.temp_dir, 'live')
+        with open(config_path, 'w') as f:
+            f.write(f'storage:\n  enabled: true\n  directory: {live}/events\n'
+                    f'spool:\n  enabled: true\n  directory: {live}/spool\n'
+                    f'ingest:\n  backfill:\n    directory: {self.temp_dir}/backfill\n')
+        # Same hour, same partition: shared directories would reuse segment names
+        paths = [self.write('a.log', open), self.write('b.log.gz', gzip.open), self.write('c.log.xz', lzma.open)]
+
+        result = ingest_archives(paths, config_path, log_type='syslog', workers=3, batch_size=128,
+                                 start_engine=False)
+        directories = {report['directory'] for report in result['files']}
+        self.assertEqual(len(directories), 3)
+        for directory in directories:
+            self.assertTrue(directory.startswith(os.path.join(self.temp_dir, 'backfill')))
+            store = EventStore(StubConfig({'storage.directory': os.path.join(directory, 'events')}))
+            self.assertEqual(store.get_stats()['stored_events'], 1000)
+            spool = DiskSpool(StubConfig({'spool.directory': os.path.join(directory, 'spool')}))
+            self.assertEqual(spool.get_stats()['pending_events'], 1000)
+        self.assertEqual(EventStore(StubConfig({'storage.directory': f'{live}/events'})).get_stats()['stored_events'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+import gzip
+import json
+import tempfile
+
+from click.testing import CliRunner
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from realtime_siem.detection.backtest import backtest, plan_chunks, iter_chunk_lines
+from realtime_siem.detection.rules_engine import RulesEngine
+from realtime_siem.main import cli
+
+BASE = 1733961600  # 2024-12-12T00:00:00Z
+
+
+def rule(name, threshold):
+    return {'name': name, 'field': 'failed_logins', 'operator': '>', 'threshold': threshold}
+
+
+class TestBacktest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'auth.log')
+        with open(self.path, 'w') as f:
+            for i in range(1000):
+                f.write(json.dumps({'timestamp': BASE + i * 36, 'failed_logins': i % 20}) + '\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunks_cover_every_line_once(self):
+        chunks = plan_chunks([self.path], chunk_bytes=997)
+        self.assertGreater(len(chunks), 10)
+        lines = [line for chunk in chunks for line in iter_chunk_lines(*chunk)]
+        with open(self.path, 'rb') as f:
+            self.assertEqual(lines, f.readlines())
+
+    def test_candidate_compared_with_baseline(self):
+        candidate = [rule('brute_force', 15), rule('new_rule', 18)]
+        baseline = [rule('brute_force', 10), rule('old_rule', 0)]
+        report = backtest([self.path], candidate, baseline, bucket_seconds=3600,
+                          workers=2, chunk_bytes=4096)
+
+        self.assertEqual(report['lines'], 1000)
+        self.assertEqual(report['rules']['brute_force'], {'candidate': 200, 'baseline': 450, 'delta': -250})
+        self.assertEqual(report['rules']['new_rule']['candidate'], 50)
+        self.assertEqual(report['rules']['old_rule']['baseline'], 950)
+        self.assertEqual(len(report['timeline']), 10)
+        self.assertEqual(sum(row['candidate'] for row in report['timeline']), 250)
+        self.assertEqual(report['events'], {'only_candidate': 0, 'only_baseline': 750, 'both': 200})
+        self.assertEqual(report['rule_changes'], {'added': ['new_rule'], 'removed': ['old_rule'],
+                                                  'changed': ['brute_force']})
+
+    def test_compressed_logs_are_streamed(self):
+        gz_path = self.path + '.gz'
+        with open(self.path, 'rb') as src, gzip.open(gz_path, 'wb') as dst:
+            dst.write(src.read())
+        report = backtest([gz_path], [rule('brute_force', 15)], [], workers=1)
+        self.assertEqual(report['chunks'], 1)
+        self.assertEqual(report['rules']['brute_force']['candidate'], 200)
+
+    def test_rotated_archive_without_suffix_is_not_split(self):
+        rotated = self.path + '.1'
+        with open(self.path, 'rb') as src, gzip.open(rotated, 'wb') as dst:
+            dst.write(src.read())
+        self.assertEqual(plan_chunks([rotated], chunk_bytes=997), [(rotated, 0, None)])
+        report = backtest([rotated], [rule('brute_force', 15)], [], workers=1, chunk_bytes=997)
+        self.assertEqual(report['rules']['brute_force']['candidate'], 200)
+
+    def test_missing_baseline_is_an_error(self):
+        rules = os.path.join(self.tmp.name, 'rules.yaml')
+        with open(rules, 'w') as f:
+            f.write('rules:\n  - name: brute_force\n    condition: failed_logins > 15\n')
+        result = CliRunner().invoke(cli, ['validate-rules', '--rule-file', rules, '--backtest', self.path,
+                                          '--baseline', os.path.join(self.tmp.name, 'missing.yaml')])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('missing.yaml does not exist', result.output)
+
+    def test_rule_lists_match_exact_values(self):
+        # Unlike hunt queries, detection rules keep exact (typed) list membership
+        engine = RulesEngine()
+        engine.rules = [{'name': 'ports', 'field': 'port', 'operator': 'in', 'values': [22, 23]}]
+        self.assertEqual(len(engine.match_rules({'port': 22})), 1)
+        self.assertEqual(engine.match_rules({'port': '22'}), [])
+
+    def test_strict_rule_loading(self):
+        bad = os.path.join(self.tmp.name, 'rules.yaml')
+        with open(bad, 'w') as f:
+            f.write('rules:\n  - field: user\n')
+        with self.assertRaises(ValueError):
+            RulesEngine().load_rules(bad)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+import json
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from realtime_siem.parsers.log_parser import SyslogParser, JSONParser
+from realtime_siem.utils.corpus import CorpusGenerator
+
+
+class TestCorpusGenerator(unittest.TestCase):
+
+    def test_same_seed_same_corpus(self):
+        self.assertEqual(CorpusGenerator(seed=7).corpus(500), CorpusGenerator(seed=7).corpus(500))
+        self.assertNotEqual(CorpusGenerator(seed=7).corpus(500), CorpusGenerator(seed=8).corpus(500))
+
+    def test_formats_parse_and_mix(self):
+        generator = CorpusGenerator(seed=1, mix={'normal': 0.5, 'brute_force': 0.5}, burst=10)
+        corpus = generator.corpus(4000)
+        syslog, json_parser = SyslogParser(), JSONParser()
+        for line, log_type in corpus:
+            if log_type == 'syslog':
+                self.assertNotIn('parse_status', syslog.parse(line), line)
+            elif log_type == 'json':
+                self.assertNotIn('parse_status', json_parser.parse(line), line)
+        self.assertAlmostEqual(generator.scenario_counts['brute_force'] / len(corpus), 0.5, delta=0.1)
+        self.assertEqual(generator.scenario_counts['port_scan'], 0)
+
+    def test_events_carry_json_fields(self):
+        events = list(CorpusGenerator(seed=5).events(200))
+        lines = CorpusGenerator(seed=5, formats=['json']).corpus(200)
+        self.assertEqual({key for event in events for key in event},
+                         {key for line, _ in lines for key in json.loads(line)})
+
+    def test_entity_cardinality(self):
+        generator = CorpusGenerator(seed=3, users=5, sources=20, mix={'normal': 1.0})
+        records = list(generator.records(2000))
+        self.assertLessEqual(len({r['user'] for r in records}), 5)
+        self.assertLessEqual(len({r['source_ip'] for r in records}), 20)
+        with self.assertRaises(ValueError):
+            CorpusGenerator(formats=['cef'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,280 @@
+import unittest
+import sys
+import os
+import gzip
+import json
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from unittest import mock
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from realtime_siem.alerts.alert_manager import AlertManager
+from realtime_siem.core.rollups import TimeSeriesRollups
+from realtime_siem.dashboard import AlertStream, DashboardServer, DashboardHandler, SnapshotPublisher, alert_view
+from helpers import StubConfig
+
+
+class ViewerConnection:
+    """Collects the SSE messages written to one viewer"""
+
+    def __init__(self):
+        self.messages = []
+        self.connected = threading.Event()
+
+    def write(self, data):
+        for message in data.decode().strip().split('\n\n'):
+            fields = dict(line.split(': ', 1) for line in message.split('\n') if not line.startswith(':'))
+            self.messages.append(fields)
+        self.connected.set()
+
+    def flush(self):
+        pass
+
+
+def threat(n):
+    return {'type': 'test', 'severity': 'high', 'description': f'threat {n}'}
+
+
+class TestAlertStream(unittest.TestCase):
+
+    def setUp(self):
+        self.alerts = AlertManager()
+        for n in range(30):
+            self.alerts.create_alert(threat(n), {'user': f'user{n}'})
+        self.stats = {'events_processed': 30, 'is_running': True}
+        config = StubConfig({'dashboard.stream.stats_interval_seconds': 0.05,
+                             'dashboard.snapshot_interval_seconds': 0.05})
+        self.publisher = SnapshotPublisher(self.alerts, lambda: dict(self.stats), config)
+        self.publisher.start()
+        self.stream = AlertStream(self.publisher, config)
+
+    def tearDown(self):
+        self.publisher.stop()
+
+    def wait_for_messages(self, viewer, count):
+        deadline = time.time() + 5
+        while len(viewer.messages) < count and time.time() < deadline:
+            time.sleep(0.01)
+
+    def test_alerts_since_sequence(self):
+        self.assertEqual([a['seq'] for a in self.alerts.get_alerts_since(27)], [28, 29, 30])
+        self.assertEqual(len(self.alerts.get_alerts_since(0, limit=5)), 5)
+        self.alerts.clear()
+        self.alerts.create_alert(threat(31), {})
+        self.assertEqual([a['seq'] for a in self.alerts.get_alerts_since(0)], [31])
+
+    def test_new_viewer_gets_recent_alerts_then_pushes(self):
+        viewer = ViewerConnection()
+        thread = threading.Thread(target=self.stream.serve, args=(viewer,))
+        thread.start()
+        viewer.connected.wait(5)
+        self.alerts.create_alert(threat(30), {'user': 'late'})
+        self.wait_for_messages(viewer, 3)
+        self.stream.close()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+        alerts = [m for m in viewer.messages if m['event'] == 'alerts']
+        first = json.loads(alerts[0]['data'])
+        self.assertEqual([a['seq'] for a in first], list(range(11, 31)))
+        self.assertEqual(json.loads(alerts[1]['data'])[0]['user'], 'late')
+        self.assertEqual(alerts[1]['id'], '31')
+        self.assertEqual(self.stream.viewers, 0)
+
+    def test_resume_and_stat_deltas(self):
+        viewer = ViewerConnection()
+        thread = threading.Thread(target=self.stream.serve, args=(viewer, 29))
+        thread.start()
+        viewer.connected.wait(5)
+        self.stats['events_processed'] = 31
+        self.wait_for_messages(viewer, 3)
+        self.stream.close()
+        thread.join(5)
+
+        self.assertEqual(json.loads(viewer.messages[0]['data'])[0]['seq'], 30)
+        stats = [json.loads(m['data']) for m in viewer.messages if m['event'] == 'stats']
+        self.assertEqual(stats[0], {'total_alerts': 30, 'open_alerts': None, 'events_processed': 30,
+                                    'is_running': True})
+        self.assertEqual(stats[1], {'events_processed': 31})
+
+    def test_published_snapshots_are_not_modified(self):
+        publisher = SnapshotPublisher(self.alerts, dict)
+        before = publisher.publish()
+        self.alerts.create_alert(threat(30), {})
+        self.alerts.close_alert(before.recent(1)[0]['alert_id'])
+        after = publisher.publish()
+
+        self.assertEqual(before.alert_count, 30)
+        self.assertEqual(before.recent(1)[0]['status'], 'open')
+        self.assertEqual([a['seq'] for a in after.alerts_since(29)], [30, 31])
+        self.assertEqual(after.alerts_since(29)[0]['status'], 'closed')
+
+        self.alerts.clear()
+        self.assertEqual(publisher.publish().alert_count, 0)
+        self.assertEqual(len(after.encoded_since(0)), 31)
+
+    def test_status_change_reencodes_only_the_changed_alert(self):
+        publisher = SnapshotPublisher(self.alerts, dict)
+        before = publisher.publish()
+        closed = before.recent(3)[0]
+        self.alerts.close_alert(closed['alert_id'])
+        self.alerts.create_alert(threat(30), {})
+        with mock.patch('realtime_siem.dashboard.snapshot.alert_view', side_effect=alert_view) as views:
+            after = publisher.publish()
+        self.assertEqual([call.args[0]['seq'] for call in views.call_args_list], [closed['seq'], 31])
+        self.assertEqual(json.loads(after.encoded_since(closed['seq'] - 1, 1)[0])['status'], 'closed')
+        self.assertEqual(before.alerts_since(closed['seq'] - 1, 1)[0]['status'], 'open')
+        self.assertNotEqual(after.generation, before.generation)
+
+        # Falling further behind than the change log reaches rebuilds the lists
+        self.alerts.max_changes_kept = 4
+        for alert in self.alerts.get_alerts_since(0, limit=10):
+            self.alerts.close_alert(alert['alert_id'])
+        rebuilt = publisher.publish()
+        self.assertEqual([a['status'] for a in rebuilt.alerts_since(0, 10)], ['closed'] * 10)
+        self.assertEqual(rebuilt.alert_count, 31)
+
+    def test_full_stats_refresh_on_their_own_timer(self):
+        calls = []
+        full = lambda: calls.append(1) or {'indexer': {'indexed': len(calls)}, 'events_processed': -1}
+        publisher = SnapshotPublisher(self.alerts, lambda: dict(self.stats), full_stats_source=full,
+                                      config=StubConfig({'dashboard.full_stats_interval_seconds': 60}))
+        for n in range(5):
+            self.stats['events_processed'] = n
+            stats = publisher.publish().stats
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(stats['events_processed'], 4)
+        self.assertEqual(stats['indexer'], {'indexed': 1})
+
+        publisher.full_stats_interval = 0
+        self.assertEqual(publisher.publish().stats['indexer'], {'indexed': 2})
+
+
+class TestDashboardServer(unittest.TestCase):
+
+    def setUp(self):
+        self.alerts = AlertManager()
+        self.alerts.create_alert(threat(0), {'user': 'alice'})
+        for n in range(1, 250):
+            self.alerts.create_alert(threat(n), {'user': f'user{n}'})
+        self.rollups = TimeSeriesRollups()
+        self.publisher = SnapshotPublisher(self.alerts, lambda: {'is_running': True}, rollups=self.rollups)
+        self.publisher.start()
+        self.server = DashboardServer(('127.0.0.1', 0), DashboardHandler, self.publisher,
+                                      StubConfig({'dashboard.api.max_limit': 200}))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.close()
+        self.publisher.stop()
+
+    def test_stalled_client_does_not_block_requests(self):
+        stalled = socket.create_connection(self.server.server_address)
+        stalled.sendall(b'GET /api/alerts HTT')
+        try:
+            with urllib.request.urlopen(self.base + '/api/alerts', timeout=2) as response:
+                self.assertEqual(json.loads(response.read())['alerts'][0]['user'], 'alice')
+            with urllib.request.urlopen(self.base + '/api/stats', timeout=2) as response:
+                self.assertEqual(json.loads(response.read())['total_alerts'], 250)
+        finally:
+            stalled.close()
+
+    def get(self, path, headers=None):
+        request = urllib.request.Request(self.base + path, headers=headers or {})
+        try:
+            response = urllib.request.urlopen(request, timeout=2)
+        except urllib.error.HTTPError as e:
+            return e, b''
+        with response:
+            return response, response.read()
+
+    def test_cursor_pagination_and_projection(self):
+        response, body = self.get('/api/alerts?limit=1000&fields=seq,user')
+        page = json.loads(body)
+        self.assertEqual(len(page['alerts']), 200)
+        self.assertEqual(page['alerts'][0], {'seq': 1, 'user': 'alice'})
+        self.assertTrue(page['has_more'])
+
+        response, body = self.get(f"/api/alerts?since={page['next_since']}")
+        page = json.loads(body)
+        self.assertEqual([a['seq'] for a in page['alerts']], list(range(201, 251)))
+        self.assertEqual(page['next_since'], 250)
+        self.assertFalse(page['has_more'])
+
+        response, body = self.get('/api/alerts?since=abc')
+        self.assertEqual(response.code, 400)
+
+    def test_gzip_and_conditional_get(self):
+        response, body = self.get('/api/alerts?since=100', {'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(len(json.loads(gzip.decompress(body))['alerts']), 100)
+
+        etag = response.headers['ETag']
+        response, body = self.get('/api/alerts?since=100', {'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        self.assertEqual(response.code, 304)
+
+        version = self.publisher.current.version
+        self.alerts.create_alert(threat(250), {})
+        self.publisher.wait_for_update(version, 2)
+        response, body = self.get('/api/alerts?since=100', {'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        self.assertEqual(response.code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_timeseries_endpoint(self):
+        self.rollups.record({'source_ip': '203.0.113.7'}, [threat(0)])
+        response, body = self.get('/api/timeseries?resolution=second&points=10')
+        series = json.loads(body)
+        self.assertEqual(len(series['events']), 10)
+        self.assertEqual(sum(series['events']), 1)
+        self.assertEqual(sum(series['alerts_by_severity']['high']), 1)
+        self.assertEqual(series['top_sources'], [{'source_ip': '203.0.113.7', 'events': 1}])
+
+        response, body = self.get('/api/timeseries?resolution=week')
+        self.assertEqual(response.code, 400)
+
+
+class TestTimeSeriesRollups(unittest.TestCase):
+
+    def setUp(self):
+        self.rollups = TimeSeriesRollups(StubConfig({'rollups.seconds': 60, 'rollups.max_sources_per_bucket': 2,
+                                                     'rollups.top_sources': 3}))
+        self.start = 1700000000.0
+
+    def test_buckets_per_resolution(self):
+        for n in range(120):
+            threats = [{'rule_name': 'SSH Brute Force', 'severity': 'high'}] if n % 10 == 0 else []
+            self.rollups.record({'source_ip': f'10.0.0.{n % 3}'}, threats, now=self.start + n)
+
+        now = self.start + 119
+        seconds = self.rollups.series('second', 60, now=now)
+        self.assertEqual(seconds['events'], [1] * 60)
+        self.assertEqual(sum(seconds['alerts_by_rule']['SSH Brute Force']), 6)
+        self.assertEqual(seconds['start'], now - 59)
+
+        minutes = self.rollups.series('minute', 5, now=now)
+        self.assertEqual(sum(minutes['events']), 120)
+        self.assertEqual(sum(minutes['alerts_by_severity']['high']), 12)
+        hours = self.rollups.series('hour', 1, now=now)
+        self.assertEqual(hours['events'], [120])
+
+        # Only two distinct sources are tracked per bucket; the rest are lumped together
+        self.assertEqual({s['source_ip']: s['events'] for s in hours['top_sources']},
+                         {'10.0.0.0': 40, '10.0.0.1': 40, '(other)': 40})
+
+    def test_stale_slots_are_reset(self):
+        self.rollups.record({}, now=self.start)
+        self.rollups.record({}, now=self.start + 60)
+        series = self.rollups.series('second', 60, now=self.start + 60)
+        self.assertEqual(sum(series['events']), 1)
+        self.assertEqual(self.rollups.series('second', 60, now=self.start + 200)['events'], [0] * 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import unittest
+import sys
+import os
+import tempfile
+import gzip
+import json
+import threading
+import time
+from unittest import mock
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from realtime_siem.storage import EventStore
+from realtime_siem.storage.bloom import BloomFilter
+from realtime_siem.storage.event_store import write_segment
+from realtime_siem.storage.hunt import HuntQuery, HuntSyntaxError, hunt, parse_time
+from helpers import StubConfig
+
+BASE = 1733961600  # 2024-12-12T00:00:00Z
+
+
+def make_events(hours=6, per_hour=50):
+    events = []
+    for h in range(hours):
+        for i in range(per_hour):
+            events.append({
+                'timestamp': BASE + h * 3600 + i * 60,
+                'source_ip': f'10.0.{h}.{i % 5}',
+                'user': 'admin' if i % 10 == 0 else f'user{i}',
+                'message': f'event {h}:{i}',
+            })
+    return events
+
+
+class TestEventStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = StubConfig({'storage.directory': self.tmp.name, 'storage.retention_days': 0})
+        self.store = EventStore(self.config)
+        for event in make_events():
+            self.store.append(event)
+        self.store.flush()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_time_range_prunes_segments(self):
+        start, end = BASE + 3600, BASE + 2 * 3600 - 1
+        self.assertEqual(len(self.store.segments(start, end)), 1)
+        results = list(self.store.query(start, end))
+        self.assertEqual(len(results), 50)
+        self.assertTrue(all(r['source_ip'].startswith('10.0.1.') for r in results))
+
+    def test_bloom_filters_prune_segments(self):
+        self.assertEqual(len(self.store.segments(filters={'source_ip': '10.0.4.3'})), 1)
+        results = list(self.store.query(filters={'source_ip': '10.0.4.3'}))
+        self.assertEqual(len(results), 10)
+
+    def test_predicate_projection_and_limit(self):
+        results = list(self.store.query(predicate=lambda e: e['user'] == 'admin',
+                                        fields=['message'], limit=7))
+        self.assertEqual(len(results), 7)
+        self.assertEqual(set(results[0]), {'message'})
+
+    def test_reopened_store_and_unflushed_events_are_searchable(self):
+        reopened = EventStore(self.config)
+        reopened.append({'timestamp': BASE + 10 * 3600, 'user': 'late'})
+        self.assertEqual(reopened.get_stats()['stored_events'], 300)
+        self.assertEqual([e['user'] for e in reopened.query(filters={'user': 'late'})], ['late'])
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter.for_capacity(1000)
+        for i in range(1000):
+            bloom.add(f'192.168.{i // 256}.{i % 256}')
+        self.assertTrue(all(f'192.168.{i // 256}.{i % 256}' in bloom for i in range(1000)))
+        restored = BloomFilter.from_dict(bloom.to_dict())
+        self.assertIn('192.168.0.1', restored)
+
+    def test_append_does_not_wait_for_segment_writes(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        store = EventStore(StubConfig({'storage.directory': tmp.name, 'storage.segment_max_events': 10,
+                                       'storage.retention_days': 0}))
+        writing, release = threading.Event(), threading.Event()
+
+        def slow_write(*args):
+            writing.set()
+            release.wait(10)
+            return write_segment(*args)
+
+        with mock.patch('realtime_siem.storage.event_store.write_segment', side_effect=slow_write):
+            store.start()
+            started = time.monotonic()
+            for i in range(10):
+                store.append({'timestamp': BASE + i, 'user': f'u{i}'})
+            self.assertLess(time.monotonic() - started, 1)
+            self.assertTrue(writing.wait(5))
+            started = time.monotonic()
+            for i in range(10, 25):
+                store.append({'timestamp': BASE + i, 'user': f'u{i}'})
+            self.assertLess(time.monotonic() - started, 1)
+            # Rows being written are still searchable
+            self.assertEqual(len(list(store.query())), 25)
+            release.set()
+            store.stop()
+        self.assertEqual(store.get_stats()['stored_events'], 25)
+        self.assertEqual(len(list(store.query())), 25)
+
+
+
+class TestHunt(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        store = EventStore(StubConfig({'storage.directory': self.tmp.name}))
+        for event in make_events():
+            store.append(event)
+        store.flush()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_query_grammar(self):
+        query = HuntQuery('source_ip in 10.0.2.0/24 and (user == admin or message ~ ".*:4$")')
+        self.assertEqual(query.fields, ['source_ip', 'user', 'message'])
+        self.assertTrue(query.matches({'source_ip': '10.0.2.1', 'user': 'admin'}))
+        self.assertTrue(query.matches({'source_ip': '10.0.2.1', 'user': 'bob', 'message': 'event 2:4'}))
+        self.assertFalse(query.matches({'source_ip': '10.0.3.1', 'user': 'admin'}))
+        self.assertTrue(HuntQuery('not user in [admin, "root"]').matches({'user': 'bob'}))
+        # List members compare like ==, whatever the type on either side
+        self.assertTrue(HuntQuery('port in [22, 23]').matches({'port': '22'}))
+        self.assertTrue(HuntQuery('port in ["22", 23]').matches({'port': 22}))
+        self.assertFalse(HuntQuery('port in [22, 23]').matches({'port': '2222'}))
+        for bad in ('user ==', 'user == admin and', '(user == admin', 'source_ip in 10.0.0.999'):
+            with self.assertRaises(HuntSyntaxError):
+                HuntQuery(bad)
+
+    def test_hunt_prunes_and_matches_segments(self):
+        results = list(hunt('source_ip == 10.0.4.3 and user != admin', directory=self.tmp.name, workers=2))
+        self.assertEqual(len(results), 10)
+        self.assertTrue(all('message' in event for event in results))
+
+    def test_hunt_time_range_limit_and_progress(self):
+        reports = []
+        results = list(hunt('user == admin', directory=self.tmp.name, start=BASE + 3600,
+                            end=BASE + 3 * 3600 - 1, workers=1, progress=reports.append))
+        self.assertEqual(len(results), 10)
+        self.assertEqual(reports[-1]['files_done'], 2)
+        self.assertEqual(reports[-1]['events_scanned'], 100)
+
+        self.assertEqual(len(list(hunt('user == admin', directory=self.tmp.name, limit=3))), 3)
+
+    def test_hunt_scans_spool_segments(self):
+        spool_dir = os.path.join(self.tmp.name, 'spool')
+        os.mkdir(spool_dir)
+        with gzip.open(os.path.join(spool_dir, 'spool-000000000001.ndjson.gz'), 'wt') as f:
+            for i in range(5):
+                f.write(json.dumps({'timestamp': BASE + i, 'user': 'spooled', 'failed_logins': i}) + '\n')
+        results = list(hunt('failed_logins >= 3', spool_directory=spool_dir))
+        self.assertEqual([event['failed_logins'] for event in results], [3, 4])
+
+    def test_hunt_survives_corrupt_spool_segment(self):
+        spool_dir = os.path.join(self.tmp.name, 'spool')
+        os.mkdir(spool_dir)
+        data = gzip.compress(''.join(json.dumps({'timestamp': BASE + i, 'n': i, 'pad': 'x' * i}) + '\n'
+                                     for i in range(200)).encode())
+        corrupt = data[:20] + bytes(b ^ 0xff for b in data[20:60]) + data[60:]
+        with open(os.path.join(spool_dir, 'spool-000000000001.ndjson.gz'), 'wb') as f:
+            f.write(corrupt)
+        with gzip.open(os.path.join(spool_dir, 'spool-000000000002.ndjson.gz'), 'wt') as f:
+            f.write(json.dumps({'timestamp': BASE, 'n': 'intact'}) + '\n')
+        results = list(hunt('n == intact', spool_directory=spool_dir, workers=1))
+        self.assertEqual([event['n'] for event in results], ['intact'])
+
+    def test_parse_time(self):
+        self.assertEqual(parse_time('2024-12-12T00:00:00Z'), BASE)
+        self.assertEqual(parse_time('24h', now=BASE), BASE - 86400)
+        self.assertEqual(parse_time(str(BASE)), BASE)
+
+
+if __name__ == '__main__':
+    unittest.main()
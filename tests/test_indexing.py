@@ -0,0 +1,347 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from elasticsearch import Elasticsearch
+from realtime_siem.core.bulk_indexer import BulkIndexer
+from realtime_siem.core.spool import DiskSpool, SpoolReplayer, SEGMENT_SUFFIX
+from realtime_siem.core.index_manager import IndexManager
+from helpers import StubConfig, wait_for
+
+
+class StubElasticsearchHandler(BaseHTTPRequestHandler):
+    """Just enough of the Elasticsearch REST API for the client and _bulk"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('X-Elastic-Product', 'Elasticsearch')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def do_HEAD(self):
+        path = self.path.split('?')[0]
+        if path.startswith('/_alias/'):
+            found = path[len('/_alias/'):] in self.server.aliases
+        else:
+            found = path == '/' or path.strip('/') in self.server.indices
+        self.send_response(200 if found else 404)
+        self.send_header('X-Elastic-Product', 'Elasticsearch')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path.endswith('/_settings/index.creation_date'):
+            self._reply(200, {name: {'settings': {'index': {'creation_date': str(created)}}}
+                              for name, created in self.server.indices.items()})
+        else:
+            self._reply(200, {'version': {'number': '7.17.0', 'build_flavor': 'default'},
+                              'tagline': 'You Know, for Search'})
+
+    def do_POST(self):
+        body = self._body()
+        if self.path.split('?')[0].endswith('/_bulk'):
+            self._reply(200, self.server.handle_bulk(body))
+        else:
+            self._reply(200, {'acknowledged': True})
+
+    def do_PUT(self):
+        path = self.path.split('?')[0]
+        body = json.loads(self._body() or b'{}')
+        if path.startswith('/_template/'):
+            self.server.templates[path[len('/_template/'):]] = body
+        else:
+            self.server.indices[path.strip('/')] = 0
+            self.server.aliases.update(body.get('aliases', {}))
+        self._reply(200, {'acknowledged': True})
+
+    def do_DELETE(self):
+        self.server.deleted.append(self.path.split('?')[0].strip('/'))
+        self._reply(200, {'acknowledged': True})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubElasticsearch(ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubElasticsearchHandler)
+        self.documents = []
+        self.bulk_requests = 0
+        self.reject_once = set()
+        self.bad_documents = set()
+        self.templates = {}
+        self.indices = {}
+        self.aliases = {}
+        self.deleted = []
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def handle_bulk(self, body):
+        self.bulk_requests += 1
+        lines = body.decode().splitlines()
+        items = []
+        errors = False
+        for action, source in zip(lines[::2], lines[1::2]):
+            doc = json.loads(source)
+            index = json.loads(action)['index']['_index']
+            key = doc.get('event_id')
+            if key in self.reject_once:
+                self.reject_once.discard(key)
+                status = 429
+            elif key in self.bad_documents:
+                status = 400
+            else:
+                status = 201
+                self.documents.append((index, doc))
+            errors = errors or status >= 300
+            items.append({'index': {'_index': index, 'status': status}})
+        return {'took': 1, 'errors': errors, 'items': items}
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}'
+
+    def close(self):
+        self.shutdown()
+        self.server_close()
+
+
+class TestBulkIndexer(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubElasticsearch()
+        self.es = Elasticsearch(hosts=[self.server.url])
+        self.config = StubConfig({
+            'processing.batch_size': 10,
+            'processing.flush_interval_seconds': 0.1,
+            'elasticsearch.bulk.retry_backoff_seconds': 0.01,
+        })
+
+    def tearDown(self):
+        self.es.close()
+        self.server.close()
+
+    def test_flushes_in_batches(self):
+        indexer = BulkIndexer(self.es, self.config, 'siem-test')
+        for i in range(25):
+            self.assertTrue(indexer.add({'event_id': f'e{i}'}))
+        self.assertEqual(indexer.flush(), 25)
+        self.assertEqual(self.server.bulk_requests, 3)
+        self.assertEqual({index for index, _ in self.server.documents}, {'siem-test'})
+
+    def test_retries_only_rejected_documents(self):
+        self.server.reject_once = {'e1', 'e3'}
+        self.server.bad_documents = {'e4'}
+        indexer = BulkIndexer(self.es, self.config)
+        for i in range(5):
+            indexer.add({'event_id': f'e{i}'})
+        indexer.flush()
+
+        ids = [doc['event_id'] for _, doc in self.server.documents]
+        self.assertEqual(sorted(ids), ['e0', 'e1', 'e2', 'e3'])
+        self.assertEqual(ids.count('e0'), 1)
+        stats = indexer.get_stats()
+        self.assertEqual(stats['retried'], 2)
+        self.assertEqual(stats['failed'], 1)
+
+    def test_bounded_buffer_and_background_flush(self):
+        config = StubConfig({'processing.batch_size': 5,
+                             'processing.flush_interval_seconds': 60,
+                             'elasticsearch.bulk.max_buffer_size': 8})
+        indexer = BulkIndexer(self.es, config)
+        accepted = [indexer.add({'event_id': f'e{i}'}) for i in range(10)]
+        self.assertEqual(accepted.count(False), 2)
+        indexer.start()
+        indexer.stop()
+        self.assertEqual(len(self.server.documents), 8)
+        self.assertEqual(indexer.get_stats()['rejected'], 2)
+
+    def test_stop_cuts_retry_backoff_short(self):
+        spooled = []
+        config = StubConfig({'processing.batch_size': 10, 'processing.flush_interval_seconds': 0.05,
+                             'elasticsearch.bulk.retry_backoff_seconds': 30})
+        indexer = BulkIndexer(self.es, config, on_failure=spooled.extend)
+        self.server.reject_once = {'e0'}
+        indexer.start()
+        indexer.add({'event_id': 'e0'})
+        self.assertTrue(wait_for(lambda: indexer.retried == 1))
+        started = time.time()
+        indexer.stop()
+        self.assertLess(time.time() - started, 5)
+        self.assertEqual(len(spooled), 1)
+        stats = indexer.get_stats()
+        self.assertEqual((stats['spooled'], stats['failed']), (1, 0))
+
+    def test_threats_are_indexed_without_back_reference(self):
+        event = {'event_id': 'e1'}
+        event['threats'] = [{'rule_name': 'r', 'event': event}]
+        indexer = BulkIndexer(self.es, self.config)
+        indexer.add(event)
+        indexer.flush()
+        self.assertEqual(self.server.documents[0][1]['threats'], [{'rule_name': 'r'}])
+
+
+class TestIndexManager(unittest.TestCase):
+
+    def setUp(self):
+        self.server = StubElasticsearch()
+        self.es = Elasticsearch(hosts=[self.server.url])
+
+    def tearDown(self):
+        self.es.close()
+        self.server.close()
+
+    def test_daily_indices_and_template(self):
+        manager = IndexManager(self.es, StubConfig({'elasticsearch.index': 'siem'}))
+        manager.setup()
+        template = self.server.templates['siem']
+        self.assertIn('siem-*', template['index_patterns'])
+        self.assertFalse(template['mappings']['dynamic'])
+        self.assertFalse(template['mappings']['properties']['raw_message']['index'])
+
+        indexer = BulkIndexer(self.es, StubConfig({}))
+        for ts in ('2024-12-11T23:59:59', '2024-12-12T00:00:01'):
+            event = {'event_id': ts, 'timestamp': ts}
+            indexer.add(event, manager.index_for(event))
+        indexer.flush()
+        self.assertEqual([index for index, _ in self.server.documents], ['siem-2024.12.11', 'siem-2024.12.12'])
+
+    def test_retention_drops_expired_daily_indices(self):
+        self.server.indices = {'siem-2024.11.01': 0, 'siem-2024.12.10': 0}
+        config = StubConfig({'elasticsearch.index': 'siem', 'elasticsearch.index_management.retention_days': 30})
+        manager = IndexManager(self.es, config)
+        deleted = manager.apply_retention(now=datetime(2024, 12, 12))
+        self.assertEqual(deleted, ['siem-2024.11.01'])
+        self.assertEqual(self.server.deleted, ['siem-2024.11.01'])
+
+    def test_rollover_bootstraps_write_alias(self):
+        manager = IndexManager(self.es, StubConfig({
+            'elasticsearch.index': 'siem',
+            'elasticsearch.index_management.strategy': 'rollover',
+        }))
+        manager.setup()
+        self.assertIn('siem-000001', self.server.indices)
+        self.assertTrue(self.server.aliases['siem']['is_write_index'])
+        self.assertEqual(manager.index_for({'timestamp': '2024-12-12T00:00:00'}), 'siem')
+
+    def test_rollover_reports_existing_plain_index(self):
+        self.server.indices = {'siem': 0}
+        manager = IndexManager(self.es, StubConfig({
+            'elasticsearch.index': 'siem',
+            'elasticsearch.index_management.strategy': 'rollover',
+        }))
+        manager.setup()
+        self.assertNotIn('siem-000001', self.server.indices)
+        self.assertIn('plain index', manager.get_stats()['setup_error'])
+        self.assertFalse(manager.maybe_rollover())
+
+    def test_maintenance_runs_once_at_start(self):
+        self.server.indices = {'siem-2024.11.01': 0}
+        manager = IndexManager(self.es, StubConfig({'elasticsearch.index': 'siem',
+                                                    'elasticsearch.index_management.retention_days': 30}))
+        manager.start()
+        try:
+            self.assertTrue(wait_for(lambda: self.server.deleted == ['siem-2024.11.01'], timeout=5))
+        finally:
+            manager.stop()
+
+
+class TestDiskSpool(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = StubConfig({
+            'spool.directory': self.tmp.name,
+            'spool.segment_max_bytes': 200,
+            'spool.replay_rate': 1000,
+            'processing.batch_size': 10,
+        })
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_segments_roll_and_replay_in_order(self):
+        spool = DiskSpool(self.config)
+        for i in range(20):
+            spool.append(json.dumps({'event_id': f'e{i}'}))
+        spool.seal(force=True)
+        self.assertGreater(len(spool.sealed_segments()), 1)
+
+        received = []
+        replayer = SpoolReplayer(spool, lambda doc: received.append(json.loads(doc)) or True,
+                                 lambda: True, self.config)
+        self.assertEqual(replayer.replay(), 20)
+        self.assertEqual([d['event_id'] for d in received], [f'e{i}' for i in range(20)])
+        self.assertTrue(spool.is_empty())
+
+    def test_replay_resumes_after_backpressure(self):
+        spool = DiskSpool(self.config)
+        spool.append_many([json.dumps({'n': i}) for i in range(5)])
+        spool.seal(force=True)
+
+        received = []
+        replayer = SpoolReplayer(spool, lambda doc: len(received) < 3 and not received.append(doc),
+                                 lambda: True, self.config)
+        self.assertEqual(replayer.replay(), 3)
+        self.assertEqual(replayer.get_stats()['current_offset'], 3)
+        replayer.sink = lambda doc: not received.append(doc)
+        self.assertEqual(replayer.replay(), 2)
+        self.assertEqual([json.loads(d)['n'] for d in received], [0, 1, 2, 3, 4])
+
+    def test_recovers_unsealed_segment_after_restart(self):
+        spool = DiskSpool(self.config)
+        spool.append('{"n": 1}')
+        spool._active.flush()
+        # Simulate a crash: the open segment is never closed
+        restarted = DiskSpool(self.config)
+        docs = [d for seg in restarted.sealed_segments() for d in restarted.read_segment(seg)]
+        self.assertEqual(docs, ['{"n": 1}'])
+        self.assertEqual(restarted.get_stats()['pending_events'], 1)
+
+    def test_sealed_segments_keep_event_count_across_restart(self):
+        spool = DiskSpool(self.config)
+        spool.append_many([json.dumps({'n': i}) for i in range(7)])
+        spool.close()
+        restarted = DiskSpool(self.config)
+        self.assertEqual(restarted.get_stats()['pending_events'], 7)
+        self.assertTrue(restarted.sealed_segments()[0].name.endswith(f'-7{SEGMENT_SUFFIX}'))
+
+    def test_replays_into_bulk_indexer(self):
+        server = StubElasticsearch()
+        es = Elasticsearch(hosts=[server.url])
+        try:
+            spool = DiskSpool(self.config)
+            spool.append_many([json.dumps({'event_id': f'e{i}'}) for i in range(15)])
+            spool.close()
+            indexer = BulkIndexer(es, self.config)
+            replayer = SpoolReplayer(spool, indexer.add_serialized, lambda: True, self.config)
+            replayer.replay()
+            indexer.flush()
+            self.assertEqual(len(server.documents), 15)
+            self.assertEqual(spool.get_stats()['segments'], 0)
+        finally:
+            es.close()
+            server.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,243 @@
+import unittest
+import sys
+import os
+import gzip
+import http.client
+import json
+import socket
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from realtime_siem.core.siem_engine import SIEMCore
+from realtime_siem.ingest import IngestPipeline, SyslogServer, HTTPIngestServer
+from realtime_siem.ingest.http import READ_SIZE, BodyTooLarge, split_lines, gunzip
+from realtime_siem.ingest.syslog import split_frames
+from helpers import StubConfig, wait_for
+
+
+class Collector:
+    def __init__(self, delay=0.0):
+        self.lines = []
+        self.delay = delay
+        self.lock = threading.Lock()
+
+    def __call__(self, line, log_type):
+        if self.delay:
+            time.sleep(self.delay)
+        with self.lock:
+            self.lines.append(line)
+
+
+class TestSplitFrames(unittest.TestCase):
+
+    def test_newline_and_octet_counted(self):
+        buffer = bytearray(b'<13>plain one\n11 <13>counted<13>plain two\n<13>partial')
+        messages, used = split_frames(buffer, 1024)
+        self.assertEqual(messages, [b'<13>plain one', b'<13>counted', b'<13>plain two'])
+        self.assertEqual(bytes(buffer[used:]), b'<13>partial')
+
+    def test_incomplete_octet_count_waits(self):
+        self.assertEqual(split_frames(bytearray(b'20 <13>short'), 1024), ([], 0))
+        self.assertEqual(split_frames(bytearray(b'123'), 1024), ([], 0))
+
+    def test_oversized_message_is_cut(self):
+        messages, used = split_frames(bytearray(b'x' * 25), 10)
+        self.assertEqual(messages, [b'x' * 10, b'x' * 10])
+        self.assertEqual(used, 20)
+
+
+class TestSyslogServer(unittest.TestCase):
+
+    def make_server(self, process, values=None):
+        config = StubConfig(dict({'ingest.syslog.batch_interval_ms': 5}, **(values or {})))
+        pipeline = IngestPipeline(process, config)
+        server = SyslogServer(pipeline, config, host='127.0.0.1', udp_port=0, tcp_port=0)
+        pipeline.start()
+        server.start()
+        self.addCleanup(pipeline.stop)
+        self.addCleanup(server.stop)
+        return pipeline, server
+
+    def test_udp_and_tcp_framings(self):
+        collector = Collector()
+        pipeline, server = self.make_server(collector)
+
+        udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for n in range(200):
+            udp.sendto(f'<13>udp {n}'.encode(), server.udp_address)
+            if n % 50 == 49:
+                time.sleep(0.01)
+        udp.close()
+
+        tcp = socket.create_connection(server.tcp_address)
+        payload = b''.join(b'%d %s' % (len(m), m) for m in (b'<13>framed a', b'<13>framed\nb'))
+        tcp.sendall(payload + b'<13>newline c\n<13>last d')
+        tcp.close()
+
+        self.assertTrue(wait_for(lambda: len(collector.lines) >= 204))
+        self.assertEqual(server.udp_received + server.udp_dropped, 200)
+        self.assertEqual(server.udp_dropped, 0)
+        self.assertEqual(collector.lines[-4:], ['<13>framed a', '<13>framed\nb', '<13>newline c', '<13>last d'])
+        self.assertEqual(server.tcp_connections, 1)
+
+    def test_tcp_backpressure_loses_nothing(self):
+        collector = Collector(delay=0.0002)
+        pipeline, server = self.make_server(collector, {'ingest.batch_size': 50, 'ingest.queue_batches': 2})
+
+        total = 5000
+        tcp = socket.create_connection(server.tcp_address)
+        tcp.sendall(b''.join(b'<13>msg %d\n' % n for n in range(total)))
+        tcp.close()
+
+        self.assertTrue(wait_for(lambda: len(collector.lines) == total, timeout=30))
+        self.assertEqual(collector.lines, [f'<13>msg {n}' for n in range(total)])
+        self.assertGreater(server.tcp_pauses, 0)
+        self.assertEqual(pipeline.get_stats()['processed'], total)
+
+    def test_udp_overflow_is_counted(self):
+        release = threading.Event()
+        collector = Collector()
+        pipeline, server = self.make_server(
+            lambda line, log_type: release.wait(10) and collector(line, log_type),
+            {'ingest.batch_size': 10, 'ingest.queue_batches': 1})
+        self.addCleanup(release.set)
+
+        udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for n in range(100):
+            udp.sendto(b'<13>burst %d' % n, server.udp_address)
+        udp.close()
+
+        self.assertTrue(wait_for(lambda: server.udp_received == 100))
+        self.assertTrue(wait_for(lambda: server.udp_dropped > 0))
+        release.set()
+        self.assertTrue(wait_for(lambda: len(collector.lines) == 100 - server.udp_dropped))
+
+
+class TestHTTPIngest(unittest.TestCase):
+
+    def make_server(self, process, values=None, start_pipeline=True):
+        config = StubConfig(values or {})
+        pipeline = IngestPipeline(process, config)
+        server = HTTPIngestServer(pipeline, config, host='127.0.0.1', port=0)
+        if start_pipeline:
+            pipeline.start()
+            self.addCleanup(pipeline.stop)
+        server.start()
+        self.addCleanup(server.stop)
+        return pipeline, server
+
+    def post(self, server, body, headers=None):
+        connection = http.client.HTTPConnection(*server.address, timeout=10)
+        connection.request('POST', '/ingest', body=body, headers=headers or {},
+                           encode_chunked='Transfer-Encoding' in (headers or {}))
+        response = connection.getresponse()
+        result = response.status, json.loads(response.read()), response.getheader('Retry-After')
+        connection.close()
+        return result
+
+    def test_split_lines_streams_across_pieces(self):
+        pieces = [b'{"a": 1}\n{"b"', b': 2}\n\n' + b'x' * 30, b'y' * 30 + b'\n{"c": 3}']
+        self.assertEqual(list(split_lines(iter(pieces), 40)), [b'{"a": 1}', b'{"b": 2}', b'', None, b'{"c": 3}'])
+
+    def test_gunzip_concatenated_members(self):
+        data = gzip.compress(b'one\n') + gzip.compress(b'two\n')
+        pieces = [data[i:i + 7] for i in range(0, len(data), 7)]
+        self.assertEqual(b''.join(gunzip(iter(pieces))), b'one\ntwo\n')
+
+    def test_gunzip_output_is_bounded(self):
+        data = gzip.compress(b'\0' * (5 * 1024 * 1024))
+        self.assertLess(len(data), READ_SIZE)
+        sizes = [len(piece) for piece in gunzip(iter([data]))]
+        self.assertEqual(sum(sizes), 5 * 1024 * 1024)
+        self.assertEqual(max(sizes), READ_SIZE)
+        with self.assertRaises(BodyTooLarge):
+            for piece in gunzip(iter([data]), max_bytes=1024 * 1024):
+                self.assertLessEqual(len(piece), READ_SIZE)
+
+    def test_oversized_bodies_get_413(self):
+        collector = Collector()
+        pipeline, server = self.make_server(collector, {'ingest.batch_size': 10,
+                                                        'ingest.http.max_body_bytes': 1000})
+        body = ''.join(json.dumps({'n': n}) + '\n' for n in range(200)).encode()
+        status, result, _ = self.post(server, gzip.compress(body), {'Content-Encoding': 'gzip'})
+        self.assertEqual(status, 413)
+        self.assertIn('1000 bytes', result['error'])
+        self.assertEqual(self.post(server, body)[0], 413)
+        self.assertEqual(self.post(server, iter([body]), {'Transfer-Encoding': 'chunked'})[0], 413)
+
+    def test_gzip_ndjson_batches(self):
+        collector = Collector()
+        pipeline, server = self.make_server(collector, {'ingest.batch_size': 100})
+        events = [json.dumps({'message': f'event {n}', 'source_ip': '10.0.0.1'}) for n in range(250)]
+        body = gzip.compress(('\n'.join(events[:120] + ['not json'] + events[120:]) + '\n').encode())
+
+        status, result, _ = self.post(server, body, {'Content-Encoding': 'gzip'})
+        self.assertEqual(status, 200)
+        self.assertEqual(result['accepted'], 250)
+        self.assertEqual(result['invalid'], 1)
+        self.assertEqual([b['accepted'] for b in result['batches']], [100, 100, 50])
+        self.assertTrue(wait_for(lambda: len(collector.lines) == 250))
+        self.assertEqual(collector.lines, events)
+        self.assertEqual(server.get_stats()['bytes_received'], len(body))
+
+    def test_chunked_plain_body(self):
+        collector = Collector()
+        pipeline, server = self.make_server(collector)
+        chunks = iter([b'{"n": 1}\n{"n"', b': 2}\n'])
+        status, result, _ = self.post(server, chunks, {'Transfer-Encoding': 'chunked'})
+        self.assertEqual((status, result['accepted']), (200, 2))
+        self.assertTrue(wait_for(lambda: collector.lines == ['{"n": 1}', '{"n": 2}']))
+
+    def test_backpressure_returns_429(self):
+        pipeline, server = self.make_server(Collector(), {'ingest.batch_size': 10, 'ingest.queue_batches': 2,
+                                                          'ingest.http.put_timeout_seconds': 0.05},
+                                            start_pipeline=False)
+        body = ''.join(json.dumps({'n': n}) + '\n' for n in range(45)).encode()
+
+        status, result, retry_after = self.post(server, body)
+        self.assertEqual(status, 429)
+        self.assertEqual(retry_after, '1')
+        self.assertEqual((result['accepted'], result['rejected']), (20, 10))
+        self.assertEqual(result['resume_from_line'], 20)
+        self.assertEqual(result['batches'][-1], {'accepted': 0, 'rejected': 10, 'invalid': 0})
+
+        # Refused up front while the queue is still full
+        status, result, _ = self.post(server, body)
+        self.assertEqual((status, result['resume_from_line']), (429, 0))
+        self.assertEqual(server.get_stats()['throttled'], 2)
+
+    def test_bad_requests(self):
+        pipeline, server = self.make_server(Collector())
+        status, result, _ = self.post(server, b'garbage', {'Content-Encoding': 'gzip'})
+        self.assertEqual(status, 400)
+        self.assertIn('gzip', result['error'])
+        self.assertEqual(self.post(server, b'{}', {'Content-Encoding': 'br'})[0], 415)
+
+
+class TestSIEMCoreIngest(unittest.TestCase):
+
+    def test_syslog_lines_reach_engine(self):
+        siem = SIEMCore(StubConfig({'ingest.syslog.enabled': True, 'ingest.syslog.host': '127.0.0.1',
+                                    'ingest.syslog.udp_port': None, 'ingest.syslog.tcp_port': 0}))
+        siem.ingest.start()
+        siem.syslog.start()
+        try:
+            tcp = socket.create_connection(siem.syslog.tcp_address)
+            tcp.sendall(b'<38>Oct 11 22:14:15 web01 sshd[42]: Failed password for root from 203.0.113.9\n' * 3)
+            tcp.close()
+            self.assertTrue(wait_for(lambda: siem.event_processor.processed_count == 3))
+        finally:
+            siem.syslog.stop()
+            siem.ingest.stop()
+        stats = siem.get_stats()['ingest']
+        self.assertEqual(stats['processed'], 3)
+        self.assertEqual(stats['syslog']['tcp_received'], 3)
+        self.assertIsNone(siem.syslog.udp_address)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+import json
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+
+from realtime_siem.parsers.log_parser import JSONParser
+from realtime_siem.utils import json_codec
+
+
+class TestJSONCodec(unittest.TestCase):
+
+    def tearDown(self):
+        json_codec.use_backend('auto')
+
+    def test_backends_agree(self):
+        event = {'timestamp': datetime(2024, 5, 1, 12, 30), 'count': 3, 'tags': ('a', 'b'),
+                 'ports': {22: 'ssh'}, 'nested': {'ok': True, 'score': 0.5}, 'big': 2 ** 70}
+        expected = json.loads(json.dumps(event, default=str))
+        for name in json_codec.BACKENDS:
+            json_codec.use_backend(name)
+            self.assertEqual(json.loads(json_codec.dumps(event)), expected, name)
+            self.assertEqual(json_codec.dumps_bytes(event), json_codec.dumps(event).encode(), name)
+            self.assertEqual(json_codec.loads(b'{"user": "alice"}'), {'user': 'alice'}, name)
+
+    def test_decoded_events_share_keys(self):
+        for name in json_codec.BACKENDS:
+            json_codec.use_backend(name)
+            first = json_codec.loads('{"source_ip": "10.0.0.1", "user": "alice"}')
+            second = json_codec.loads('{"source_ip": "10.0.0.2", "user": "bob"}')
+            for a, b in zip(first, second):
+                self.assertIs(a, b, name)
+
+    def test_shared_keys_are_bounded(self):
+        json_codec.use_backend('json')
+        saved, json_codec._shared_keys = json_codec._shared_keys, {}
+        try:
+            json_codec.MAX_SHARED_KEYS, limit = 3, json_codec.MAX_SHARED_KEYS
+            json_codec.loads(json.dumps({f'key{n}': n for n in range(10)}))
+            self.assertEqual(len(json_codec._shared_keys), 3)
+        finally:
+            json_codec.MAX_SHARED_KEYS = limit
+            json_codec._shared_keys = saved
+
+    def test_parser_errors(self):
+        with self.assertRaises(ValueError):
+            json_codec.use_backend('simdjson')
+        for name in json_codec.BACKENDS:
+            json_codec.use_backend(name)
+            event = JSONParser().parse('{"user": ')
+            self.assertEqual(event['parse_status'], 'failed', name)
+            self.assertEqual(JSONParser().parse('[1, 2]')['value'], [1, 2], name)
+
+
+if __name__ == '__main__':
+    unittest.main()
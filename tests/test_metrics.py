@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+import threading
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from realtime_siem.core.metrics import MetricsRegistry
+from realtime_siem.core.siem_engine import SIEMCore
+from helpers import StubConfig
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def test_counter_from_many_threads(self):
+        registry = MetricsRegistry()
+        counter = registry.counter('test_total', 'Test counter')
+
+        def work():
+            for _ in range(10000):
+                counter.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(counter.value, 40000)
+        self.assertIs(registry.counter('test_total'), counter)
+
+    def test_exposition_format(self):
+        registry = MetricsRegistry(StubConfig({'metrics.latency_buckets': [0.001, 0.01]}))
+        histogram = registry.histogram('test_seconds', 'Latency', stage='parse')
+        for value in (0.0005, 0.005, 0.5):
+            histogram.observe(value)
+        registry.gauge('test_gauge', 'A gauge').set(3)
+        registry.register_callback('test_depth', 'gauge', 'Depths', 'queue', lambda: {'a"b': 2})
+
+        text = registry.render()
+        self.assertIn('# TYPE test_seconds histogram', text)
+        self.assertIn('test_seconds_bucket{stage="parse",le="0.001"} 1', text)
+        self.assertIn('test_seconds_bucket{stage="parse",le="0.01"} 2', text)
+        self.assertIn('test_seconds_bucket{stage="parse",le="+Inf"} 3', text)
+        self.assertIn('test_seconds_count{stage="parse"} 3', text)
+        self.assertIn('test_gauge 3', text)
+        self.assertIn('test_depth{queue="a\\"b"} 2', text)
+        with self.assertRaises(ValueError):
+            registry.counter('test_gauge')
+
+
+class TestPipelineMetrics(unittest.TestCase):
+
+    def test_stages_are_timed(self):
+        siem = SIEMCore(StubConfig({}))
+        siem.process_log('{"message": "Failed password for root", "source_ip": "10.0.0.1"}', 'json')
+        text = siem.metrics.render()
+        for stage in ('parse', 'enrich', 'rules', 'anomaly', 'alert', 'index'):
+            self.assertIn(f'siem_stage_seconds_count{{stage="{stage}"}} 1', text)
+        self.assertIn('siem_events_total 1', text)
+        self.assertIn('siem_alerts_total{severity=', text)
+
+
+if __name__ == '__main__':
+    unittest.main()
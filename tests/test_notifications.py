@@ -0,0 +1,146 @@
+import unittest
+import sys
+import os
+import json
+import socketserver
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from realtime_siem.alerts.notification_dispatcher import NotificationDispatcher, CircuitBreaker, ChannelWorker
+from realtime_siem.alerts.notification_handler import NotificationHandler
+from helpers import StubConfig, wait_for
+
+
+class StubWebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.server.payloads.append(json.loads(body))
+        self.server.connections.add(self.client_address)
+        self.send_response(self.server.status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubSMTPHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.wfile.write(b'220 stub\r\n')
+        in_data = False
+        for line in self.rfile:
+            if in_data:
+                if line == b'.\r\n':
+                    in_data = False
+                    self.server.messages += 1
+                    self.wfile.write(b'250 ok\r\n')
+                continue
+            command = line[:4].upper()
+            if command == b'DATA':
+                in_data = True
+                self.wfile.write(b'354 go\r\n')
+            elif command == b'QUIT':
+                self.wfile.write(b'221 bye\r\n')
+                return
+            else:
+                self.wfile.write(b'250 ok\r\n')
+
+
+def make_alert(i, severity='high'):
+    event = {'source_ip': '203.0.113.5', 'user': 'admin'}
+    threat = {'rule_name': 'brute_force', 'severity': severity, 'event': event}
+    event['threats'] = [threat]
+    return {'alert_id': f'alert_{i}', 'threat': threat, 'event': event, 'severity': severity}
+
+
+class TestNotificationDispatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.http = HTTPServer(('127.0.0.1', 0), StubWebhookHandler)
+        self.http.payloads = []
+        self.http.connections = set()
+        self.http.status = 200
+        threading.Thread(target=self.http.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.http.shutdown()
+        self.http.server_close()
+
+    def _config(self, **overrides):
+        values = {
+            'notifications.webhook.enabled': True,
+            'notifications.webhook.url': f'http://127.0.0.1:{self.http.server_port}/alerts',
+            'notifications.dispatcher.batch_window_seconds': 0.2,
+            'notifications.dispatcher.retry_backoff_seconds': 0.01,
+        }
+        values.update(overrides)
+        return StubConfig(values)
+
+    def test_webhook_digest_batches_alerts(self):
+        dispatcher = NotificationDispatcher(self._config())
+        dispatcher.start()
+        for i in range(5):
+            self.assertTrue(dispatcher.submit(make_alert(i)))
+        dispatcher.stop()
+
+        delivered = [a['alert_id'] for p in self.http.payloads for a in p['alerts']]
+        self.assertEqual(delivered, [f'alert_{i}' for i in range(5)])
+        self.assertLess(len(self.http.payloads), 5)
+        stats = dispatcher.get_stats()['webhook']
+        self.assertEqual(stats['delivered'], 5)
+        self.assertIn('latency_ms', stats)
+
+    def test_failures_open_circuit(self):
+        self.http.status = 500
+        config = self._config(**{
+            'notifications.dispatcher.max_retries': 1,
+            'notifications.dispatcher.circuit_failure_threshold': 2,
+            'notifications.dispatcher.batch_size': 1,
+        })
+        dispatcher = NotificationDispatcher(config)
+        dispatcher.start()
+        dispatcher.submit(make_alert(1))
+        dispatcher.submit(make_alert(2))
+        self.assertTrue(wait_for(lambda: dispatcher.get_stats()['webhook']['failed'] == 2))
+        dispatcher.stop()
+
+        stats = dispatcher.get_stats()['webhook']
+        self.assertEqual(stats['circuit_state'], CircuitBreaker.OPEN)
+        # Second batch is rejected by the open circuit without hitting the endpoint
+        self.assertEqual(len(self.http.payloads), 2)
+
+    def test_bounded_queue_counts_drops(self):
+        worker = ChannelWorker('test', lambda alerts: None, queue_size=2)
+        results = [worker.submit(make_alert(i)) for i in range(5)]
+        self.assertEqual(results, [True, True, False, False, False])
+        self.assertEqual(worker.get_stats()['dropped'], 3)
+
+    def test_email_reuses_smtp_connection(self):
+        smtp = socketserver.ThreadingTCPServer(('127.0.0.1', 0), StubSMTPHandler)
+        smtp.messages = 0
+        threading.Thread(target=smtp.serve_forever, daemon=True).start()
+        try:
+            handler = NotificationHandler(StubConfig({
+                'notifications.email.enabled': True,
+                'notifications.email.smtp_server': '127.0.0.1',
+                'notifications.email.smtp_port': smtp.server_address[1],
+            }))
+            handler.send_alert(make_alert(1))
+            first = handler._smtp
+            handler.send_alert(make_alert(2))
+            self.assertIs(handler._smtp, first)
+            handler.close()
+            self.assertEqual(smtp.messages, 2)
+        finally:
+            smtp.shutdown()
+            smtp.server_close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from realtime_siem.core.siem_engine import SIEMCore
+from realtime_siem.parsers import ParserRouter, sniff
+from helpers import StubConfig
+
+
+RFC3164 = '<34>Oct 11 22:14:15 mymachine su[230]: failed for lonvick on /dev/pts/8'
+RFC5424 = '<165>1 2003-10-11T22:14:15.003Z mymachine.example.com evntslog - ID47 - An application event'
+JSON = '{"user": "alice", "action": "login", "status": "failed"}'
+PLAIN = 'ERROR: Unauthorized access attempt from 198.51.100.1'
+
+
+class TestParserRouter(unittest.TestCase):
+
+    def test_sniff(self):
+        self.assertEqual(sniff(RFC3164), 'rfc3164')
+        self.assertEqual(sniff(RFC5424), 'rfc5424')
+        self.assertEqual(sniff('  ' + JSON), 'json')
+        self.assertEqual(sniff(PLAIN), 'default')
+        self.assertEqual(sniff('<not a pri> text'), 'default')
+        self.assertEqual(sniff(''), 'default')
+
+    def test_dispatch_matches_parsers(self):
+        router = ParserRouter()
+        syslog = router.parsers['syslog']
+        self.assertEqual(router.parse(RFC3164)['format'], 'RFC3164')
+        self.assertEqual(router.parse(RFC5424)['hostname'], 'mymachine.example.com')
+        self.assertEqual(router.parse(JSON)['user'], 'alice')
+        self.assertEqual(router.parse(PLAIN)['type'], 'unknown')
+        for line in (RFC3164, RFC5424):
+            expected, actual = syslog.parse(line), router.parse(line)
+            expected.pop('timestamp', None), actual.pop('timestamp', None)
+            self.assertEqual(actual, expected)
+
+    def test_source_cache(self):
+        router = ParserRouter()
+        for _ in range(3):
+            router.parse(RFC3164, source='10.0.0.5')
+        self.assertEqual((router.cache_misses, router.cache_hits), (1, 2))
+
+        # The source switches format: detected again, and a syslog RFC change still parses
+        self.assertEqual(router.parse(JSON, source='10.0.0.5')['user'], 'alice')
+        self.assertEqual(router.parse(RFC3164, source='10.0.0.5')['format'], 'RFC3164')
+        self.assertEqual(router.parse(RFC5424, source='10.0.0.5')['format'], 'RFC5424')
+        self.assertEqual(router.get_stats()['detected']['json'], 1)
+
+    def test_cache_is_bounded(self):
+        router = ParserRouter(StubConfig({'parsers.source_cache_size': 2}))
+        for n in range(5):
+            router.parse(JSON, source=f'host-{n}')
+        self.assertEqual(router.get_stats()['sources'], 2)
+
+        # A source seen again is kept over ones that went quiet
+        router.parse(JSON, source='host-3')
+        router.parse(JSON, source='host-5')
+        router.parse(JSON, source='host-3')
+        self.assertEqual(list(router._sources), ['host-5', 'host-3'])
+        self.assertEqual(router.cache_hits, 2)
+
+    def test_siem_core_auto(self):
+        siem = SIEMCore(StubConfig({}))
+        self.assertEqual(siem.process_log(RFC5424, 'auto')['format'], 'RFC5424')
+        self.assertEqual(siem.process_log(JSON, 'auto', source='agent-1')['type'], 'json')
+        self.assertEqual(siem.get_stats()['parser_router']['detected']['json'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import sys
+import os
+import json
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from realtime_siem.core.siem_engine import SIEMCore
+from realtime_siem.utils.corpus import CorpusGenerator
+from helpers import StubConfig
+
+
+class TestStructuredEvents(unittest.TestCase):
+
+    def test_same_detections_as_json_lines(self):
+        corpus = list(CorpusGenerator(seed=9, mix={'normal': 0.5, 'exfiltration': 0.5}).events(300))
+        from_lines, from_events = SIEMCore(StubConfig({})), SIEMCore(StubConfig({}))
+        for event in corpus:
+            from_lines.process_log(json.dumps(event), 'json')
+        self.assertEqual(from_events.process_events(dict(event, type='json') for event in corpus), 300)
+
+        self.assertGreater(len(from_lines.alert_manager.alerts), 0)
+        def threats(siem):
+            return [a['threat'].get('rule_name') or a['threat'].get('type') for a in siem.alert_manager.alerts]
+        self.assertEqual(threats(from_events), threats(from_lines))
+
+    def test_type_and_errors(self):
+        siem = SIEMCore(StubConfig({'tracing.sample_every': 1}))
+        self.assertEqual(siem.process_event({'message': 'hello'})['type'], 'event')
+        self.assertEqual(siem.process_event({'message': 'hi', 'type': 'web_traffic'}, 'collector')['type'],
+                         'web_traffic')
+
+        siem.event_processor.process = None  # every event fails from here on
+        self.assertEqual(siem.process_events([{'message': 'a'}, {'message': 'b'}]), 0)
+        span = siem.tracer.dump(limit=1)[0]
+        self.assertEqual((span['reason'], span['log_type']), ('error', 'event'))
+        self.assertIn("'message': 'b'", span['line'])
+
+
+if __name__ == '__main__':
+    unittest.main()
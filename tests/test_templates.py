@@ -0,0 +1,144 @@
+import unittest
+import sys
+import os
+import threading
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from realtime_siem.core.siem_engine import SIEMCore
+from realtime_siem.parsers.log_parser import SyslogParser
+from realtime_siem.parsers.templates import TemplateMiner
+from helpers import StubConfig
+
+
+class TestTemplateMiner(unittest.TestCase):
+
+    def test_clusters_messages(self):
+        miner = TemplateMiner()
+        first = miner.extract('Failed password for root from 10.0.0.1 port 2222 ssh2')
+        second = miner.extract('Failed password for admin from 192.168.7.20 port 51000 ssh2')
+        other = miner.extract('Accepted password for alice from 10.0.0.2 port 40000 ssh2')
+        self.assertEqual(first['template_id'], second['template_id'])
+        self.assertNotEqual(first['template_id'], other['template_id'])
+        self.assertEqual(second['template'], 'Failed password for <*> from <IP> port <NUM> ssh2')
+        self.assertEqual(miner.get_stats()['templates'], 2)
+
+    def test_extracts_fields(self):
+        miner = TemplateMiner()
+        event = miner.extract('Failed password for invalid user bob from 203.0.113.9 port 50312 ssh2')
+        self.assertEqual(event['event_type'], 'failed_login')
+        self.assertEqual(event['user'], 'bob')
+        self.assertEqual(event['source_ip'], '203.0.113.9')
+        self.assertEqual(event['port'], '50312')
+
+        event = miner.extract('pam_unix(sshd:session): session opened for user alice by (uid=0)')
+        self.assertEqual((event['event_type'], event['user']), ('session_opened', 'alice'))
+
+        event = miner.extract('[UFW BLOCK] IN=eth0 OUT= SRC=198.51.100.4 DST=10.0.0.5 PROTO=TCP SPT=4444 DPT=22')
+        self.assertEqual(event['event_type'], 'connection_blocked')
+        self.assertEqual(event['source_ip'], '198.51.100.4')
+        self.assertEqual(event['destination_port'], '22')
+        self.assertNotIn('out', event)
+
+    def test_repeated_shapes_hit_cache(self):
+        miner = TemplateMiner()
+        for port in range(1000, 1100):
+            event = miner.extract(f'Invalid user test from 10.0.0.1 port {port}')
+        self.assertEqual(event['port'], '1099')
+        stats = miner.get_stats()
+        self.assertEqual((stats['cache_misses'], stats['cache_hits']), (1, 99))
+
+    def test_templates_are_bounded(self):
+        miner = TemplateMiner(StubConfig({'parsers.templates.max_templates': 5}))
+        for n in range(20):
+            miner.extract(f'service{"abcdefghijklmnopqrst"[n]} started ok')
+            miner.extract(f'unit {"abcdefghijklmnopqrst"[n]}x is ready now')
+        stats = miner.get_stats()
+        self.assertEqual(stats['templates'], 5)
+        self.assertEqual(stats['evicted'], 35)
+        # An evicted template's cached shape is not reused
+        event = miner.extract('servicea started ok')
+        self.assertIn(event['template_id'], miner.templates)
+
+    def test_shared_across_threads(self):
+        # Ingest workers share one parser; eviction and the shape cache must not race
+        miner = TemplateMiner(StubConfig({'parsers.templates.max_templates': 8,
+                                          'parsers.templates.cache_size': 16}))
+        errors = []
+
+        def work(worker):
+            try:
+                for n in range(3000):
+                    word = 'abcdefghijklmnopqrstuvwxyz'[(n * 7 + worker) % 26]
+                    event = miner.extract(f'job{word} worker {worker} finished step {n}')
+                    if event['template'].split()[0] != f'job{word}':
+                        errors.append(event)
+            except Exception as e:
+                errors.append(e)
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=work, args=(worker,)) for worker in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
+        stats = miner.get_stats()
+        self.assertEqual(stats['cache_hits'] + stats['cache_misses'], 12000)
+        self.assertLessEqual(stats['templates'], 8)
+
+
+class TestSyslogTemplates(unittest.TestCase):
+
+    def test_syslog_parser_adds_fields(self):
+        parser = SyslogParser()
+        event = parser.parse('<38>Oct 11 22:14:15 bastion sshd[4242]: '
+                             'Failed password for root from 203.0.113.9 port 2222 ssh2')
+        self.assertEqual(event['process'], 'sshd')
+        self.assertEqual(event['event_type'], 'failed_login')
+        self.assertEqual(event['user'], 'root')
+        self.assertEqual(event['source_ip'], '203.0.113.9')
+        self.assertIn('template_id', event)
+
+    def test_parsed_fields_win(self):
+        parser = SyslogParser()
+        event = parser.parse('<38>Oct 11 22:14:15 bastion sshd[4242]: child hostname=web-01 pid=99 exited')
+        self.assertEqual((event['hostname'], event['pid']), ('bastion', '4242'))
+
+    def test_message_keys_cannot_set_pipeline_fields(self):
+        siem = SIEMCore(StubConfig({}))
+        event = siem.process_log('<34>Oct 11 22:14:15 host app: job done epoch=yesterday threats=none '
+                                 'timestamp_status=ok COMMAND=/bin/ls', 'syslog')
+        self.assertIsNotNone(event)
+        self.assertIsInstance(event['epoch'], float)
+        self.assertNotIn('timestamp_status', event)
+        self.assertEqual((event['kv_epoch'], event['kv_threats'], event['kv_timestamp_status']),
+                         ('yesterday', 'none', 'ok'))
+        self.assertEqual(event['command'], '/bin/ls')
+
+    def test_disabled(self):
+        parser = SyslogParser(StubConfig({'parsers.templates.enabled': False}))
+        event = parser.parse('<38>Oct 11 22:14:15 bastion sshd[4242]: Invalid user bob from 10.0.0.1 port 22')
+        self.assertIsNone(parser.templates)
+        self.assertNotIn('user', event)
+
+    def test_failed_logins_correlate(self):
+        siem = SIEMCore(StubConfig({}))
+        events = [siem.parsers['syslog'].parse(f'<38>Oct 11 22:14:{port:02d} bastion sshd[4242]: '
+                                               f'Failed password for root from 203.0.113.9 port {4000 + port} ssh2')
+                  for port in range(10)]
+        correlations = siem.correlation_engine.correlate(events)
+        self.assertIn('brute_force_pattern', [c['type'] for c in correlations])
+        stats = siem.get_stats()['templates']
+        self.assertEqual(stats['templates'], 1)
+        self.assertEqual(stats['cache_hits'], 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import sys
+import os
+from datetime import datetime, timezone
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from realtime_siem.core.siem_engine import SIEMCore
+from realtime_siem.core.timestamps import TimestampNormalizer
+from realtime_siem.detection.anomaly_detector import AnomalyDetector
+from helpers import StubConfig
+
+
+def epoch(*args):
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+NEW_YEAR = epoch(2025, 1, 1, 0, 10)
+UTC = StubConfig({'timestamps.timezone': 'UTC'})
+
+
+class TestTimestampNormalizer(unittest.TestCase):
+
+    def test_formats(self):
+        normalizer = TimestampNormalizer()
+        cases = {
+            '2003-10-11T22:14:15.003Z': (epoch(2003, 10, 11, 22, 14, 15) + 0.003, '2003-10-11T22:14:15.003000+00:00'),
+            '2003-10-11T22:14:15+02:00': (epoch(2003, 10, 11, 20, 14, 15), '2003-10-11T20:14:15+00:00'),
+            '2003-10-11 22:14:15': (epoch(2003, 10, 11, 22, 14, 15), '2003-10-11T22:14:15+00:00'),
+            '2003-10-11': (epoch(2003, 10, 11), '2003-10-11T00:00:00+00:00'),
+            1700000000: (1700000000.0, '2023-11-14T22:13:20+00:00'),
+            1700000000500: (1700000000.5, '2023-11-14T22:13:20.500000+00:00'),
+        }
+        for value, expected in cases.items():
+            self.assertEqual(normalizer.parse(value, NEW_YEAR), expected, value)
+        self.assertIsNone(normalizer.parse('not a time', NEW_YEAR))
+        self.assertIsNone(normalizer.parse('2003-13-45T00:00:00', NEW_YEAR))
+
+    def test_rfc3164_year_inference(self):
+        normalizer = TimestampNormalizer(UTC)
+        # Read just after new year, December lines belong to the year before
+        self.assertEqual(normalizer.parse('Dec 31 23:59:58', NEW_YEAR)[1], '2024-12-31T23:59:58+00:00')
+        self.assertEqual(normalizer.parse('Jan  1 00:05:00', NEW_YEAR)[1], '2025-01-01T00:05:00+00:00')
+        self.assertEqual(normalizer.parse('Feb 29 12:00:00', NEW_YEAR)[1], '2024-02-29T12:00:00+00:00')
+        self.assertIsNone(normalizer.parse('Feb 30 12:00:00', NEW_YEAR))
+
+    def test_rfc3164_day_padding_and_timezone(self):
+        normalizer = TimestampNormalizer(UTC)
+        for text in ('Oct  1 22:14:15', 'Oct 1 22:14:15', 'Oct 01 22:14:15 host'):
+            self.assertEqual(normalizer.parse(text, NEW_YEAR)[1], '2024-10-01T22:14:15+00:00', text)
+        self.assertIsNone(normalizer.parse('Oct 1 2:14', NEW_YEAR))
+        self.assertIsNone(normalizer.parse('Oct 1 25:14:15', NEW_YEAR))
+
+        berlin = TimestampNormalizer(StubConfig({'timestamps.timezone': '+02:00'}))
+        self.assertEqual(berlin.parse('Oct 1 22:14:15', NEW_YEAR)[1], '2024-10-01T20:14:15+00:00')
+        local = TimestampNormalizer()
+        self.assertEqual(local.parse('Oct 1 22:14:15', NEW_YEAR)[0],
+                         datetime(2024, 10, 1, 22, 14, 15).timestamp())
+        with self.assertRaises(ValueError):
+            TimestampNormalizer(StubConfig({'timestamps.timezone': 'Mars/Olympus'}))
+
+    def test_second_cache(self):
+        normalizer = TimestampNormalizer(UTC)
+        for micros in range(5):
+            normalizer.parse(f'2024-06-01T10:00:00.{micros:06d}Z', NEW_YEAR)
+            normalizer.parse('Jun  1 10:00:00', NEW_YEAR)
+        self.assertEqual((normalizer.misses, normalizer.hits), (2, 8))
+        # A new day starts the cache over, since RFC 3164 years depend on it
+        normalizer.parse('Jun  1 10:00:00', NEW_YEAR + 86400)
+        self.assertEqual(normalizer.misses, 3)
+
+    def test_normalize_event(self):
+        normalizer = TimestampNormalizer(UTC)
+        event = normalizer.normalize({'timestamp': 'Dec 31 23:59:58'}, NEW_YEAR)
+        self.assertEqual(event, {'timestamp': '2024-12-31T23:59:58+00:00', 'timestamp_raw': 'Dec 31 23:59:58',
+                                 'epoch': epoch(2024, 12, 31, 23, 59, 58)})
+        event = normalizer.normalize({'timestamp': 'soon'}, NEW_YEAR)
+        self.assertEqual((event['epoch'], event['timestamp_status']), (NEW_YEAR, 'unparsed'))
+        self.assertEqual(normalizer.normalize({}, NEW_YEAR)['epoch'], NEW_YEAR)
+
+
+class TestPipelineTimestamps(unittest.TestCase):
+
+    def test_syslog_events_get_epoch(self):
+        siem = SIEMCore(UTC)
+        event = siem.process_log('<34>Oct 11 22:14:15 mymachine su[230]: failed for lonvick', 'syslog')
+        self.assertEqual(event['timestamp'][4:], '-10-11T22:14:15+00:00')
+        self.assertEqual(event['timestamp_raw'], 'Oct 11 22:14:15')
+        self.assertEqual(datetime.fromtimestamp(event['epoch'], timezone.utc).hour, 22)
+
+        # Off-hours logins are flagged from the epoch alone
+        late = siem.process_event({'type': 'login', 'timestamp': '2024-03-02T02:30:00+01:00', 'user': 'bob'})
+        self.assertTrue(siem.threat_detector.anomaly_detector._check_unusual_time(late))
+        self.assertEqual(siem.get_stats()['timestamps']['unparsed'], 0)
+
+    def test_unusual_hours_use_the_configured_zone(self):
+        # 21:30 UTC is 03:30 the next morning at +06:00
+        event = {'type': 'login', 'epoch': epoch(2024, 3, 2, 21, 30)}
+        self.assertFalse(AnomalyDetector(UTC)._check_unusual_time(event))
+        self.assertTrue(AnomalyDetector(StubConfig({'timestamps.timezone': '+06:00'}))._check_unusual_time(event))
+
+
+if __name__ == '__main__':
+    unittest.main()
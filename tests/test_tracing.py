@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+import json
+import threading
+import urllib.request
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from realtime_siem.core.siem_engine import SIEMCore
+from realtime_siem.core.tracing import Tracer, STAGES
+from realtime_siem.dashboard import DashboardServer, DashboardHandler
+from helpers import StubConfig
+
+
+LINE = '{"message": "user login ok", "source_ip": "10.0.0.1"}'
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_head_and_tail_sampling(self):
+        tracer = Tracer(StubConfig({'tracing.sample_every': 10, 'tracing.slow_ms': 50}))
+        fast = (0.0, 0.001, 0.002, 0.003, 0.004, 0.005)
+        slow = (0.0, 0.001, 0.002, 0.080, 0.081, 0.082)
+        for n in range(1, 31):
+            tracer.record(f'line {n}', 'json', slow if n == 15 else fast)
+
+        spans = tracer.dump()
+        self.assertEqual([span['line'] for span in spans], ['line 30', 'line 20', 'line 15', 'line 10'])
+        slowest = tracer.dump(limit=1, slowest=True)[0]
+        self.assertEqual(slowest['reason'], 'slow')
+        self.assertEqual(slowest['stages_ms']['detect'], 78.0)
+        self.assertEqual(list(slowest['stages_ms']), list(STAGES))
+
+    def test_ring_buffer_and_hooks(self):
+        tracer = Tracer(StubConfig({'tracing.sample_every': 1, 'tracing.buffer_size': 5}))
+        seen = []
+        tracer.add_hook(seen.append)
+        for n in range(20):
+            tracer.record(str(n), 'json', (0.0, 0.0, 0.0, 0.0, 0.0, 0.001))
+        self.assertEqual(len(tracer.spans), 5)
+        self.assertEqual(len(seen), 20)
+
+
+class TestPipelineTracing(unittest.TestCase):
+
+    def test_disabled_tracer_is_not_called(self):
+        siem = SIEMCore(StubConfig({}))
+        self.assertFalse(siem.tracer.enabled)
+        siem.tracer.record = None  # would raise if process_log called it
+        self.assertIsNotNone(siem.process_log(LINE, 'json'))
+
+    def test_spans_served_over_api(self):
+        siem = SIEMCore(StubConfig({'tracing.sample_every': 2}))
+        for _ in range(6):
+            siem.process_log(LINE, 'json')
+        siem.event_processor.process = None  # make the next line fail
+        siem.process_log(LINE, 'json')
+
+        server = DashboardServer(('127.0.0.1', 0), DashboardHandler, siem.dashboard)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/api/traces?limit=10"
+            with urllib.request.urlopen(url, timeout=2) as response:
+                body = json.loads(response.read())
+        finally:
+            server.close()
+        self.assertEqual([span['reason'] for span in body['spans']], ['error', 'sampled', 'sampled', 'sampled'])
+        self.assertIn('error', body['spans'][0])
+        self.assertEqual(body['stats']['seen'], 7)
+
+
+if __name__ == '__main__':
+    unittest.main()